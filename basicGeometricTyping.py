@@ -10,13 +10,13 @@ from typing import Annotated, Literal
 import numpy as npt
 from numpy.typing import ArrayLike, NDArray
 
-Vector = Annotated[NDArray[npt.float_], Literal[3,]]
+Vector = Annotated[NDArray[npt.floating], Literal[3,]]
 """
 向量
 通常描述为 [x,y,z],
 齐次空间描述为 [x,y,z,w], 其中 w 为向量的长度
 """
-Point = Annotated[NDArray[npt.float_], Literal[3,]]
+Point = Annotated[NDArray[npt.floating], Literal[3,]]
 """
 点
 通常描述为 [x,y,z],
@@ -28,7 +28,7 @@ Point = Annotated[NDArray[npt.float_], Literal[3,]]
 T=[x,y,z]
 """
 # 旋转采用四元数描述
-Quaternion = Annotated[NDArray[npt.float_], Literal[4,]]
+Quaternion = Annotated[NDArray[npt.floating], Literal[4,]]
 """
 旋转\n
 |x y z|\n
@@ -43,7 +43,7 @@ Quaternion = Annotated[NDArray[npt.float_], Literal[4,]]
 规定外旋表示为：sxyz
 """
 # 齐次变换采用 4*4 的齐次变换矩阵描述
-TransformMatrix_4x4 = Annotated[NDArray[npt.float_], Literal[4, 4]]
+TransformMatrix_4x4 = Annotated[NDArray[npt.floating], Literal[4, 4]]
 """
 齐次变换\n
 |R T|\n
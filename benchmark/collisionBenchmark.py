@@ -0,0 +1,247 @@
+"""
+干涉检测性能基准
+分别统计网格生成、粗检测 (包围盒树) 和精检测的耗时，结果写入 JSON 文件
+Author: ICO
+Date: 2026-10-18"""
+
+import argparse
+import json
+import math
+import platform
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+# 直接运行脚本 (python benchmark/collisionBenchmark.py) 时，把仓库根目录加入 sys.path 以便导入本地包
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# logger
+from loguru import logger
+
+# pyOCC
+from OCC import VERSION as OCC_VERSION
+from OCC.Core.AIS import AIS_Shape
+from OCC.Core.Bnd import Bnd_Box
+from OCC.Core.BRepBndLib import brepbndlib
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Copy
+from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCylinder
+from OCC.Core.gp import gp_Ax1, gp_Dir, gp_Pnt, gp_Trsf, gp_Vec
+from OCC.Core.TopoDS import TopoDS_Shape
+
+# local
+from dataExchange.readStep import read_step
+from pyOCCTools.collision import CollisionScene, ais_collision_calculator
+from pyOCCTools.meshCache import MeshCache
+
+
+def make_grid_scene(
+    shape: TopoDS_Shape, count: int, spacing: float, jitter=0.2, seed=0, shared=False
+) -> list[AIS_Shape]:
+    """把同一个形状按立方网格摆放 count 次，位置和姿态带有随机扰动 (同一 seed 结果相同)
+
+    Parameters
+    ----------
+    `shape` : TopoDS_Shape
+        摆放的形状
+    `count` : int
+        实例数量
+    `spacing` : float
+        网格间距
+    `jitter` : float, 可选
+        位置扰动相对间距的比例，比例越大相交的实例越多，默认值：0.2
+    `seed` : int, 可选
+        随机种子，默认值：0
+    `shared` : bool, 可选
+        所有实例是否共享同一个 TShape (共享时网格只生成一次)，默认值：False (每个实例使用独立的副本)
+
+    Returns
+    -------
+    list[AIS_Shape]
+    """
+    rng = random.Random(seed)
+    side = math.ceil(count ** (1 / 3))
+    scene = []
+    for index in range(count):
+        i, j, k = index % side, (index // side) % side, index // (side * side)
+        trsf = gp_Trsf()
+        axis = gp_Ax1(gp_Pnt(), gp_Dir(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(0.1, 1)))
+        trsf.SetRotation(axis, rng.uniform(0, 2 * math.pi))
+        offset = [(n + rng.uniform(-jitter, jitter)) * spacing for n in (i, j, k)]
+        trsf.SetTranslationPart(gp_Vec(*offset))
+        ais = AIS_Shape(shape if shared else BRepBuilderAPI_Copy(shape).Shape())
+        ais.SetLocalTransformation(trsf)
+        scene.append(ais)
+    # end for
+    return scene
+
+
+# end def
+def make_box_scene(count: int, size=10.0, seed=0, shared=False) -> list[AIS_Shape]:
+    """长方体网格场景"""
+    return make_grid_scene(BRepPrimAPI_MakeBox(size, size, size).Shape(), count, size * 1.5, seed=seed, shared=shared)
+
+
+# end def
+def make_cylinder_scene(count: int, radius=5.0, height=10.0, seed=0, shared=False) -> list[AIS_Shape]:
+    """圆柱网格场景"""
+    return make_grid_scene(
+        BRepPrimAPI_MakeCylinder(radius, height).Shape(), count, height * 1.5, seed=seed, shared=shared
+    )
+
+
+# end def
+def make_step_scene(step_path: str, count: int, seed=0, shared=False) -> list[AIS_Shape]:
+    """STEP 夹具网格场景，间距按模型包围盒的尺寸确定"""
+    shape = read_step(step_path)
+    box = Bnd_Box()
+    brepbndlib.Add(shape, box, False)
+    x_min, y_min, z_min, x_max, y_max, z_max = box.Get()
+    size = max(x_max - x_min, y_max - y_min, z_max - z_min)
+    return make_grid_scene(shape, count, size * 1.2, seed=seed, shared=shared)
+
+
+# end def
+def benchmark_scene(scene: list[AIS_Shape], linear_deflection=1.0, angular_deflection=0.5) -> dict:
+    """分阶段统计一个场景的干涉检测耗时
+
+    Parameters
+    ----------
+    `scene` : list[AIS_Shape]
+    `linear_deflection` : float, 可选
+        网格的线性偏差，默认值：1.0
+    `angular_deflection` : float, 可选
+        网格的角度偏差，默认值：0.5
+
+    Returns
+    -------
+    dict
+        各阶段的耗时 (秒)、不同 TShape 的数量 (即实际生成网格的次数)、候选对和干涉对的数量
+    """
+    # 网格生成 (使用新的缓存，保证每次都重新生成；共享 TShape 的实例只生成一次)
+    mesh_cache = MeshCache()
+    start = time.perf_counter()
+    for ais in scene:
+        mesh_cache.mesh(ais.Shape(), linear_deflection, angular_deflection, copy=True)
+    mesh_seconds = time.perf_counter() - start
+    unique_shapes = mesh_cache.misses
+    # 粗检测
+    start = time.perf_counter()
+    collision_scene = CollisionScene(scene)
+    candidate_pairs = collision_scene.candidate_pairs()
+    broad_seconds = time.perf_counter() - start
+    # 精检测 (网格已在缓存中)
+    start = time.perf_counter()
+    colliding_pairs = 0
+    for i, j in candidate_pairs:
+        faces = ais_collision_calculator(
+            scene[i],
+            scene[j],
+            mesh_cache=mesh_cache,
+            linear_deflection=linear_deflection,
+            angular_deflection=angular_deflection,
+        )
+        if faces:
+            colliding_pairs += 1
+    narrow_seconds = time.perf_counter() - start
+    return {
+        "count": len(scene),
+        "unique_shapes": unique_shapes,
+        "mesh_seconds_per_shape": mesh_seconds / max(unique_shapes, 1),
+        "candidate_pairs": len(candidate_pairs),
+        "colliding_pairs": colliding_pairs,
+        "mesh_seconds": mesh_seconds,
+        "broad_seconds": broad_seconds,
+        "narrow_seconds": narrow_seconds,
+    }
+
+
+# end def
+def run_collision_benchmark(
+    sizes=(10, 50, 100, 300),
+    scenes=("box", "cylinder"),
+    step_path: str | None = None,
+    repeat=3,
+    seed=0,
+    output_path: str | None = None,
+    shared=False,
+) -> dict:
+    """在不同规模的合成场景上运行干涉检测基准
+
+    Parameters
+    ----------
+    `sizes` : tuple[int, ...], 可选
+        场景中的物体数量，默认值：(10, 50, 100, 300)
+    `scenes` : tuple[str, ...], 可选
+        场景类型，可选 "box"、"cylinder"、"step"，默认值：("box", "cylinder")
+    `step_path` : str | None, 可选
+        "step" 场景使用的 STEP 文件，默认值：None
+    `repeat` : int, 可选
+        重复次数，每个阶段取最短耗时，默认值：3
+    `seed` : int, 可选
+        随机种子，默认值：0
+    `output_path` : str | None, 可选
+        JSON 结果的输出路径，默认值：None (不写文件)
+    `shared` : bool, 可选
+        场景中的实例是否共享同一个 TShape，默认值：False (每个实例独立生成网格)
+
+    Returns
+    -------
+    dict
+        基准结果
+    """
+    makers = {
+        "box": lambda count: make_box_scene(count, seed=seed, shared=shared),
+        "cylinder": lambda count: make_cylinder_scene(count, seed=seed, shared=shared),
+        "step": lambda count: make_step_scene(step_path, count, seed=seed, shared=shared),
+    }
+    results = []
+    for scene_name in scenes:
+        if scene_name == "step" and step_path is None:
+            logger.warning("未指定 STEP 文件，跳过 step 场景")
+            continue
+        for count in sizes:
+            scene = makers[scene_name](count)
+            runs = [benchmark_scene(scene) for _ in range(max(repeat, 1))]
+            best = dict(runs[0])
+            for key in ("mesh_seconds", "broad_seconds", "narrow_seconds"):
+                best[key] = min(run[key] for run in runs)
+            best["mesh_seconds_per_shape"] = best["mesh_seconds"] / max(best["unique_shapes"], 1)
+            best["scene"] = scene_name
+            results.append(best)
+            logger.info(
+                f"{scene_name} x {count}：网格 {best['mesh_seconds']:.4f}s ({best['unique_shapes']} 个形状)，"
+                f"粗检测 {best['broad_seconds']:.4f}s，精检测 {best['narrow_seconds']:.4f}s"
+            )
+    # end for
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pythonocc": OCC_VERSION,
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "shared": shared,
+        "results": results,
+    }
+    if output_path is not None:
+        with open(output_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return report
+
+
+# end def
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="干涉检测性能基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 300])
+    parser.add_argument("--scenes", nargs="+", default=["box", "cylinder"], choices=["box", "cylinder", "step"])
+    parser.add_argument("--step", default=None, help="step 场景使用的 STEP 文件")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="collision_benchmark.json")
+    parser.add_argument("--shared", action="store_true", help="所有实例共享同一个 TShape (网格只生成一次)")
+    args = parser.parse_args()
+    run_collision_benchmark(args.sizes, args.scenes, args.step, args.repeat, args.seed, args.output, args.shared)
+# end main
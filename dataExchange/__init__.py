@@ -1 +1,25 @@
-from .toQuantityColor import to_Quantity_Color
+from .brepBinary import read_brep_binary, shape_from_bytes, shape_to_bytes, write_brep_binary
+from .colorPalette import (
+    colormap,
+    colormap_indices,
+    colormap_Quantity_ColorRGBAs,
+    colormap_Quantity_Colors,
+    palette_lut,
+    palettes,
+    register_color,
+    register_palette,
+)
+from .poseStream import PoseStreamWriter, iter_pose_stream, read_pose_stream, trsf_from_bytes, trsf_to_bytes
+from .processPool import WorkerCrashed, map_isolated
+from .readStep import StepReadResult, iter_step_roots, read_step, read_step_many, read_step_with_report
+from .readStepAssembly import AssemblyNode, StepAssembly
+from .stepCache import StepCache
+from .stepImportOptions import StepCheckMessage, StepCheckReport, StepImportOptions
+from .toQuantityColor import (
+    clear_color_cache,
+    interned_Quantity_Color,
+    interned_Quantity_ColorRGBA,
+    to_Quantity_Color,
+)
+from .triangulation import shape_to_mesh_arrays
+from .writeShapes import ShapeWriteResult, write_shape, write_shapes
@@ -0,0 +1,85 @@
+"""
+TopoDS_Shape 与 OCC 二进制 BRep 格式之间的数据交换
+Author: ICO
+Date: 2026-10-18"""
+
+import os
+import tempfile
+
+# pyOCC
+from OCC.Core.BinTools import bintools
+from OCC.Core.TopoDS import TopoDS_Shape
+
+
+def write_brep_binary(shape: TopoDS_Shape, file_path: str):
+    """把形状写入二进制 BRep 文件
+
+    Parameters
+    ----------
+    `shape` : TopoDS_Shape
+    `file_path` : str
+        文件路径
+    """
+    if not bintools.Write(shape, file_path):
+        raise RuntimeError(f"二进制 BRep 写入失败：{file_path}")
+
+
+# end def
+def read_brep_binary(file_path: str) -> TopoDS_Shape:
+    """读取二进制 BRep 文件
+
+    Parameters
+    ----------
+    `file_path` : str
+        文件路径
+
+    Returns
+    -------
+    TopoDS_Shape
+    """
+    shape = TopoDS_Shape()
+    if not bintools.Read(shape, file_path):
+        raise RuntimeError(f"二进制 BRep 读取失败：{file_path}")
+    return shape
+
+
+# end def
+def shape_to_bytes(shape: TopoDS_Shape) -> bytes:
+    """把形状序列化为二进制 BRep 数据 (用于在进程之间传递形状)
+
+    Parameters
+    ----------
+    `shape` : TopoDS_Shape
+
+    Returns
+    -------
+    bytes
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "shape.brep")
+        write_brep_binary(shape, file_path)
+        with open(file_path, "rb") as file:
+            return file.read()
+
+
+# end def
+def shape_from_bytes(data: bytes) -> TopoDS_Shape:
+    """从二进制 BRep 数据反序列化形状
+
+    Parameters
+    ----------
+    `data` : bytes
+        shape_to_bytes 得到的数据
+
+    Returns
+    -------
+    TopoDS_Shape
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "shape.brep")
+        with open(file_path, "wb") as file:
+            file.write(data)
+        return read_brep_binary(file_path)
+
+
+# end def
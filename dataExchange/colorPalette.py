@@ -0,0 +1,179 @@
+"""
+颜色表：命名调色板的注册和由数值数组批量映射颜色 (例如距离热力图)
+Author: ICO
+Date: 2026-10-18"""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# pyOCC
+from OCC.Core.Quantity import Quantity_Color, Quantity_ColorRGBA
+
+# local
+from .toQuantityColor import color_map, interned_Quantity_Color, interned_Quantity_ColorRGBA
+
+palettes: dict[str, NDArray[np.uint8]] = {}
+"""已注册的调色板：名称 -> (K,3) 的 RGB (0~255) 颜色节点，节点之间线性插值"""
+
+
+def register_palette(name: str, colors: ArrayLike | list[str]):
+    """注册 (或覆盖) 一个调色板
+
+    Parameters
+    ----------
+    `name` : str
+        调色板名称
+    `colors` : ArrayLike | list[str]
+        (K,3) 的 RGB (0~255) 颜色节点，或 color_map 中的颜色名称列表 (K >= 1)
+    """
+    nodes = np.array([color_map[color] if isinstance(color, str) else color for color in colors], dtype=np.uint8)
+    if nodes.ndim != 2 or nodes.shape[1] != 3 or len(nodes) == 0:
+        raise ValueError(f"调色板 {name} 的颜色应为 (K,3) 的 RGB 数组")
+    palettes[name] = nodes
+
+
+# end def
+def register_color(name: str, rgb: tuple[int, int, int]):
+    """在 color_map 中注册 (或覆盖) 一个命名颜色，之后可用于 to_Quantity_Color 和 register_palette"""
+    color_map[name] = tuple(int(value) for value in rgb)
+
+
+# end def
+def _palette_nodes(palette: str | ArrayLike) -> NDArray[np.uint8]:
+    if isinstance(palette, str):
+        try:
+            return palettes[palette]
+        except KeyError:
+            raise ValueError(f"未注册的调色板：{palette}") from None
+    return np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+
+
+# end def
+def palette_lut(palette: str | ArrayLike = "heat", levels=256) -> NDArray[np.uint8]:
+    """把调色板插值为 `levels` 级的颜色查找表
+
+    Parameters
+    ----------
+    `palette` : str | ArrayLike, 可选
+        调色板名称或 (K,3) 的 RGB 颜色节点，默认值："heat"
+    `levels` : int, 可选
+        颜色级数，默认值：256
+
+    Returns
+    -------
+    NDArray[np.uint8]
+        (levels,3) 的 RGB 颜色
+    """
+    nodes = _palette_nodes(palette).astype(np.float64)
+    positions = np.linspace(0.0, 1.0, len(nodes))
+    samples = np.linspace(0.0, 1.0, levels)
+    lut = np.stack([np.interp(samples, positions, nodes[:, channel]) for channel in range(3)], axis=1)
+    return np.rint(lut).astype(np.uint8)
+
+
+# end def
+def colormap_indices(values: ArrayLike, vmin: float | None = None, vmax: float | None = None, levels=256) -> NDArray[np.intp]:
+    """把数值线性映射到 [0, levels) 的颜色级别 (超出范围的值截断，NaN 映射为 0)
+
+    Parameters
+    ----------
+    `values` : ArrayLike
+        (N,) 的数值
+    `vmin`, `vmax` : float | None, 可选
+        对应第一级和最后一级颜色的数值，默认值：None (取 `values` 的最小值和最大值)
+    `levels` : int, 可选
+        颜色级数，默认值：256
+
+    Returns
+    -------
+    NDArray[np.intp]
+        (N,) 的颜色级别
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if len(values) == 0:
+        return np.empty(0, dtype=np.intp)
+    if vmin is None:
+        vmin = float(np.nanmin(values))
+    if vmax is None:
+        vmax = float(np.nanmax(values))
+    scale = (levels - 1) / (vmax - vmin) if vmax > vmin else 0.0
+    scaled = np.nan_to_num((values - vmin) * scale, nan=0.0)
+    return np.clip(np.rint(scaled), 0, levels - 1).astype(np.intp)
+
+
+# end def
+def colormap(
+    values: ArrayLike,
+    palette: str | ArrayLike = "heat",
+    vmin: float | None = None,
+    vmax: float | None = None,
+    levels=256,
+) -> NDArray[np.uint8]:
+    """由数值批量得到 RGB 颜色
+
+    Parameters
+    ----------
+    `values` : ArrayLike
+        (N,) 的数值
+    `palette` : str | ArrayLike, 可选
+        调色板名称或 (K,3) 的 RGB 颜色节点，默认值："heat"
+    `vmin`, `vmax` : float | None, 可选
+        对应调色板两端的数值，默认值：None (取 `values` 的最小值和最大值)
+    `levels` : int, 可选
+        颜色级数，默认值：256
+
+    Returns
+    -------
+    NDArray[np.uint8]
+        (N,3) 的 RGB (0~255) 颜色
+    """
+    return palette_lut(palette, levels)[colormap_indices(values, vmin, vmax, levels)]
+
+
+# end def
+def colormap_Quantity_Colors(
+    values: ArrayLike,
+    palette: str | ArrayLike = "heat",
+    vmin: float | None = None,
+    vmax: float | None = None,
+    levels=256,
+) -> list[Quantity_Color]:
+    """由数值批量得到 Quantity_Color (每一级颜色只创建一次，结果中的对象是共享的，不要修改)
+
+    参数与 colormap 相同
+
+    Returns
+    -------
+    list[Quantity_Color]
+        与 `values` 一一对应的颜色
+    """
+    lut = [interned_Quantity_Color(*rgb) for rgb in palette_lut(palette, levels).tolist()]
+    return [lut[index] for index in colormap_indices(values, vmin, vmax, levels).tolist()]
+
+
+# end def
+def colormap_Quantity_ColorRGBAs(
+    values: ArrayLike,
+    palette: str | ArrayLike = "heat",
+    vmin: float | None = None,
+    vmax: float | None = None,
+    levels=256,
+    alpha=1.0,
+) -> list[Quantity_ColorRGBA]:
+    """由数值批量得到 Quantity_ColorRGBA (结果中的对象是共享的，不要修改)
+
+    参数与 colormap 相同，`alpha` 为统一的不透明度 (0~1)，默认值：1.0
+
+    Returns
+    -------
+    list[Quantity_ColorRGBA]
+        与 `values` 一一对应的颜色
+    """
+    lut = [interned_Quantity_ColorRGBA(*rgb, alpha) for rgb in palette_lut(palette, levels).tolist()]
+    return [lut[index] for index in colormap_indices(values, vmin, vmax, levels).tolist()]
+
+
+# end def
+register_palette("heat", [(0, 0, 255), (0, 255, 255), (0, 255, 0), (255, 255, 0), (255, 0, 0)])
+register_palette("status", ["green", "yellow", "red"])
+register_palette("gray", ["black", "white"])
@@ -3,30 +3,136 @@ gp_Pnt 的数据交换
 Author: ICO
 Date: 2024-01-21"""
 
+from collections.abc import Sequence
+from itertools import chain
+
 import numpy as np
+from numpy.typing import ArrayLike, DTypeLike, NDArray
 # logger
 from loguru import logger
 # pyOCC
 from OCC.Core.gp import gp_Pnt
+from OCC.Core.TColgp import TColgp_Array1OfPnt
 
 # local
 from basicGeometricTyping import Point
 
 
-def from_point(pnt: gp_Pnt) -> Point:
+def from_point(pnt: gp_Pnt, dtype: DTypeLike = np.float64, out: NDArray | None = None) -> Point:
     """获取 gp_Pnt 的三坐标
 
     Parameters
     ----------
-    pnt : gp_Pnt
-        _description_
+    `pnt` : gp_Pnt
+    `dtype` : DTypeLike, 可选
+        新建数组的类型 (例如 np.float32)，默认值：np.float64
+    `out` : NDArray | None, 可选
+        写入结果的 (3,) 数组 (用于在循环中复用内存)，默认值：None (新建数组)
+
+    Returns
+    -------
+    Point
+        (3,) 的坐标 [x,y,z]
+    """
+    if out is None:
+        out = np.empty(3, dtype=dtype)
+    out[0], out[1], out[2] = pnt.X(), pnt.Y(), pnt.Z()
+    return out
+
+
+# end def
+def points_to_array(points: Sequence[gp_Pnt], out: NDArray[np.float64] | None = None) -> NDArray[np.float64]:
+    """把一组 gp_Pnt 一次性写入 (N,3) 的数组
+
+    Parameters
+    ----------
+    `points` : Sequence[gp_Pnt]
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,3) 数组 (可以是不连续的视图，例如 buf[:, :3])，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3) 的坐标数组
+    """
+    count = len(points)
+    if out is None:
+        out = np.empty((count, 3), dtype=np.float64)
+    elif out.shape != (count, 3):
+        raise ValueError(f"out 的形状应为 ({count}, 3)，当前为：{out.shape}")
+    out[...] = np.fromiter(
+        chain.from_iterable(pnt.Coord() for pnt in points), dtype=np.float64, count=3 * count
+    ).reshape(count, 3)
+    return out
+
+
+# end def
+def array_to_points(array: ArrayLike) -> list[gp_Pnt]:
+    """把 (N,3) 的数组转为 gp_Pnt 列表
+
+    Parameters
+    ----------
+    `array` : ArrayLike
+        (N,3) 的坐标数组
+
+    Returns
+    -------
+    list[gp_Pnt]
+    """
+    return [gp_Pnt(x, y, z) for x, y, z in np.asarray(array, dtype=np.float64).reshape(-1, 3).tolist()]
+
+
+# end def
+def TColgp_Array1OfPnt_as_array(
+    points: TColgp_Array1OfPnt, out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """把 TColgp_Array1OfPnt 一次性写入 (N,3) 的数组
+
+    Parameters
+    ----------
+    `points` : TColgp_Array1OfPnt
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,3) 数组 (可以是不连续的视图，例如 buf[:, :3])，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3) 的坐标数组
+    """
+    count = points.Length()
+    if out is None:
+        out = np.empty((count, 3), dtype=np.float64)
+    elif out.shape != (count, 3):
+        raise ValueError(f"out 的形状应为 ({count}, 3)，当前为：{out.shape}")
+    lower = points.Lower()
+    out[...] = np.fromiter(
+        chain.from_iterable(points.Value(i).Coord() for i in range(lower, lower + count)),
+        dtype=np.float64,
+        count=3 * count,
+    ).reshape(count, 3)
+    return out
+
+
+# end def
+def array_as_TColgp_Array1OfPnt(array: ArrayLike) -> TColgp_Array1OfPnt:
+    """把 (N,3) 的数组转为 TColgp_Array1OfPnt (下标从 1 开始)
+
+    Parameters
+    ----------
+    `array` : ArrayLike
+        (N,3) 的坐标数组
 
     Returns
     -------
-    tuple[float, float, float]
-        返回点的元组
+    TColgp_Array1OfPnt
     """
-    return np.matrix([[pnt.X(), pnt.Y(), pnt.Z()]])
+    coordinates = np.asarray(array, dtype=np.float64).reshape(-1, 3).tolist()
+    if not coordinates:
+        raise ValueError("TColgp_Array1OfPnt 不能为空")
+    points = TColgp_Array1OfPnt(1, len(coordinates))
+    for i, (x, y, z) in enumerate(coordinates, 1):
+        points.SetValue(i, gp_Pnt(x, y, z))
+    return points
 
 
 # end def
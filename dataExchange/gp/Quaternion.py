@@ -4,8 +4,11 @@ Author: ICO
 Date: 2024-02-04"""
 
 import json
+from collections.abc import Sequence
+from itertools import chain
 
 import numpy as np
+from numpy.typing import DTypeLike, NDArray
 # logger
 from loguru import logger
 # pyOCC
@@ -13,68 +16,87 @@ from OCC.Core.gp import gp_Dir, gp_EulerSequence, gp_Quaternion, gp_Trsf
 
 # local
 from basicGeometricTyping import Quaternion
+from mathTools.rotation import EULER_SEQUENCES, quaternions_to_euler
 
+# 序列名称到 gp_EulerSequence 的查找表 (名称与 mathTools.rotation.EULER_SEQUENCES 相同)
+_GP_EULER_SEQUENCES = {
+    "euler": gp_EulerSequence.gp_EulerAngles,
+    "ypr": gp_EulerSequence.gp_YawPitchRoll,
+    "sxyz": gp_EulerSequence.gp_Extrinsic_XYZ,
+    "sxzy": gp_EulerSequence.gp_Extrinsic_XZY,
+    "syzx": gp_EulerSequence.gp_Extrinsic_YZX,
+    "syxz": gp_EulerSequence.gp_Extrinsic_YXZ,
+    "szxy": gp_EulerSequence.gp_Extrinsic_ZXY,
+    "szyx": gp_EulerSequence.gp_Extrinsic_ZYX,
+    "rxyz": gp_EulerSequence.gp_Intrinsic_XYZ,
+    "rxzy": gp_EulerSequence.gp_Intrinsic_XZY,
+    "ryzx": gp_EulerSequence.gp_Intrinsic_YZX,
+    "ryxz": gp_EulerSequence.gp_Intrinsic_YXZ,
+    "rzxy": gp_EulerSequence.gp_Intrinsic_ZXY,
+    "rzyx": gp_EulerSequence.gp_Intrinsic_ZYX,
+    "sxyx": gp_EulerSequence.gp_Extrinsic_XYX,
+    "sxzx": gp_EulerSequence.gp_Extrinsic_XZX,
+    "syzy": gp_EulerSequence.gp_Extrinsic_YZY,
+    "syxy": gp_EulerSequence.gp_Extrinsic_YXY,
+    "szyz": gp_EulerSequence.gp_Extrinsic_ZYZ,
+    "szxz": gp_EulerSequence.gp_Extrinsic_ZXZ,
+    "rxyx": gp_EulerSequence.gp_Intrinsic_XYX,
+    "rxzx": gp_EulerSequence.gp_Intrinsic_XZX,
+    "ryzy": gp_EulerSequence.gp_Intrinsic_YZY,
+    "ryxy": gp_EulerSequence.gp_Intrinsic_YXY,
+    "rzxz": gp_EulerSequence.gp_Intrinsic_ZXZ,
+    "rzyz": gp_EulerSequence.gp_Intrinsic_ZYZ,
+}
 
-def gp_Quaternion_as_quat(quat: gp_Quaternion) -> Quaternion:
-    return np.matrix([[quat.X(), quat.Y(), quat.Z(), quat.W()]])
+
+def gp_Quaternion_as_quat(quat: gp_Quaternion, dtype: DTypeLike = np.float64, out: NDArray | None = None) -> Quaternion:
+    """获取 gp_Quaternion 的四元数
+
+    Parameters
+    ----------
+    `quat` : gp_Quaternion
+    `dtype` : DTypeLike, 可选
+        新建数组的类型 (例如 np.float32)，默认值：np.float64
+    `out` : NDArray | None, 可选
+        写入结果的 (4,) 数组 (用于在循环中复用内存)，默认值：None (新建数组)
+
+    Returns
+    -------
+    Quaternion
+        (4,) 的四元数 [x,y,z,w]
+    """
+    if out is None:
+        out = np.empty(4, dtype=dtype)
+    out[0], out[1], out[2], out[3] = quat.X(), quat.Y(), quat.Z(), quat.W()
+    return out
 
 
 # end def
 def gp_Quaternion_as_euler(quat: gp_Quaternion, sequence="euler"):
-    match sequence:
-        case "euler":
-            gp_sequence = gp_EulerSequence.gp_EulerAngles
-        case "ypr":
-            gp_sequence = gp_EulerSequence.gp_YawPitchRoll
-        case "sxyz":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_XYZ
-        case "sxzy":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_XZY
-        case "syzx":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_YZX
-        case "syxz":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_YXZ
-        case "szxy":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_ZXY
-        case "szyx":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_ZYX
-        case "rxyz":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_XYZ
-        case "rxzy":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_XZY
-        case "ryzx":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_YZX
-        case "ryxz":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_YXZ
-        case "rzxy":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_ZXY
-        case "rzyx":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_ZYX
-        case "sxyx":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_XYX
-        case "sxzx":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_XZX
-        case "syzy":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_YZY
-        case "syxy":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_YXY
-        case "szyz":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_ZYZ
-        case "szxz":
-            gp_sequence = gp_EulerSequence.gp_Extrinsic_ZXZ
-        case "rxyx":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_XYX
-        case "rxzx":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_XZX
-        case "ryzy":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_YZY
-        case "ryxy":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_YXY
-        case "rzxz":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_ZXZ
-        case "rzyz":
-            gp_sequence = gp_EulerSequence.gp_Intrinsic_ZYZ
-        case _:
-            gp_sequence = gp_EulerSequence.gp_EulerAngles
-    # end match
-    return quat.GetEulerAngles(gp_sequence)
+    return quat.GetEulerAngles(_GP_EULER_SEQUENCES.get(sequence, gp_EulerSequence.gp_EulerAngles))
+
+
+# end def
+def gp_Quaternions_as_euler(quats: Sequence[gp_Quaternion], sequence="euler") -> NDArray[np.float64]:
+    """批量把 gp_Quaternion 转为欧拉角 (结果与 gp_Quaternion_as_euler 相同)
+
+    Parameters
+    ----------
+    `quats` : Sequence[gp_Quaternion]
+    `sequence` : str, 可选
+        欧拉角序列，与 gp_Quaternion_as_euler 的名称相同，默认值："euler"
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3) 的欧拉角 [alpha, beta, gamma] (弧度)
+    """
+    quaternions = np.fromiter(
+        chain.from_iterable((quat.X(), quat.Y(), quat.Z(), quat.W()) for quat in quats),
+        dtype=np.float64,
+        count=4 * len(quats),
+    ).reshape(-1, 4)
+    return quaternions_to_euler(quaternions, sequence if sequence in EULER_SEQUENCES else "euler")
+
+
+# end def
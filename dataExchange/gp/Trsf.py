@@ -4,8 +4,11 @@ Author: ICO
 Date: 2024-02-04"""
 
 import json
+from collections.abc import Sequence
+from itertools import chain
 
 import numpy as np
+from numpy.typing import ArrayLike, DTypeLike, NDArray
 
 # logger
 from loguru import logger
@@ -15,45 +18,158 @@ from OCC.Core.gp import gp_Dir, gp_Trsf
 
 # local
 from basicGeometricTyping import Quaternion, TransformMatrix_4x4, Vector
+from mathTools.rotation import quaternions_to_rotation_matrices, rotation_matrices_to_quaternions
 
 from .Quaternion import gp_Quaternion_as_quat
 from .XYZ import from_gp_XYZ
 
 
-def gp_Trsf_as_transform_matrix(trsf: gp_Trsf) -> TransformMatrix_4x4:
-    transform = np.matrix(
-        [
-            [trsf.Value(1, 1), trsf.Value(1, 2), trsf.Value(1, 3), trsf.Value(1, 4)],
-            [trsf.Value(2, 1), trsf.Value(2, 2), trsf.Value(2, 3), trsf.Value(2, 4)],
-            [trsf.Value(3, 1), trsf.Value(3, 2), trsf.Value(3, 3), trsf.Value(3, 4)],
-            [0, 0, 0, 1],
-        ]
-    )
-    return transform
+def gp_Trsf_as_transform_matrix(
+    trsf: gp_Trsf, dtype: DTypeLike = np.float64, out: NDArray | None = None
+) -> TransformMatrix_4x4:
+    """获取 gp_Trsf 的齐次变换矩阵
+
+    Parameters
+    ----------
+    `trsf` : gp_Trsf
+    `dtype` : DTypeLike, 可选
+        新建数组的类型 (例如 np.float32)，默认值：np.float64
+    `out` : NDArray | None, 可选
+        写入结果的 (4,4) 数组 (用于在循环中复用内存)，默认值：None (新建数组)
+
+    Returns
+    -------
+    TransformMatrix_4x4
+        (4,4) 的齐次变换矩阵
+    """
+    if out is None:
+        out = np.empty((4, 4), dtype=dtype)
+    out[:3] = [
+        [trsf.Value(1, 1), trsf.Value(1, 2), trsf.Value(1, 3), trsf.Value(1, 4)],
+        [trsf.Value(2, 1), trsf.Value(2, 2), trsf.Value(2, 3), trsf.Value(2, 4)],
+        [trsf.Value(3, 1), trsf.Value(3, 2), trsf.Value(3, 3), trsf.Value(3, 4)],
+    ]
+    out[3] = (0, 0, 0, 1)
+    return out
+
+
+def gp_Trsfs_as_transform_matrices(
+    trsfs: Sequence[gp_Trsf], out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """把一组 gp_Trsf 一次性写入 (N,4,4) 的齐次变换矩阵数组
+
+    Parameters
+    ----------
+    `trsfs` : Sequence[gp_Trsf]
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,4,4) 浮点数组，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,4,4) 的齐次变换矩阵
+    """
+    count = len(trsfs)
+    if out is None:
+        out = np.empty((count, 4, 4), dtype=np.float64)
+    elif out.shape != (count, 4, 4) or not np.issubdtype(out.dtype, np.floating):
+        raise ValueError(f"out 应为 ({count}, 4, 4) 的浮点数组，当前为：{out.shape} {out.dtype}")
+    out[:, :3, :] = np.fromiter(
+        chain.from_iterable((trsf.Value(row, col) for row in (1, 2, 3) for col in (1, 2, 3, 4)) for trsf in trsfs),
+        dtype=np.float64,
+        count=12 * count,
+    ).reshape(count, 3, 4)
+    out[:, 3, :] = (0.0, 0.0, 0.0, 1.0)
+    return out
+
+
+def transform_matrices_as_gp_Trsfs(matrices: ArrayLike) -> list[gp_Trsf]:
+    """把 (N,4,4) 的齐次变换矩阵转为 gp_Trsf 列表
+
+    Parameters
+    ----------
+    `matrices` : ArrayLike
+        (N,4,4) 或 (N,3,4) 的齐次变换矩阵 (只使用前三行)
+
+    Returns
+    -------
+    list[gp_Trsf]
+    """
+    values = np.asarray(matrices, dtype=np.float64)[..., :3, :].reshape(-1, 12).tolist()
+    trsfs = []
+    for row in values:
+        trsf = gp_Trsf()
+        trsf.SetValues(*row)
+        trsfs.append(trsf)
+    return trsfs
+
+
+def gp_Trsfs_as_vec_quat(trsfs: Sequence[gp_Trsf]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """批量获取平移变换和旋转四元数 (与 gp_Trsf_as_vec_quat 对应)
+
+    与 gp_Trsf.GetRotation() 相同，旋转部分不含缩放因子 (带缩放或镜像的变换先除以 ScaleFactor())
+
+    Parameters
+    ----------
+    `trsfs` : Sequence[gp_Trsf]
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.float64]]
+        (N,3) 的平移变换和 (N,4) 的旋转四元数 [x,y,z,w]
+    """
+    matrices = gp_Trsfs_as_transform_matrices(trsfs)
+    scales = np.fromiter((trsf.ScaleFactor() for trsf in trsfs), dtype=np.float64, count=len(trsfs))
+    rotations = matrices[:, :3, :3] / scales[:, None, None]
+    return matrices[:, :3, 3].copy(), rotation_matrices_to_quaternions(rotations)
+
+
+def vec_quat_as_gp_Trsfs(vectors: ArrayLike, quaternions: ArrayLike) -> list[gp_Trsf]:
+    """由 (N,3) 的平移变换和 (N,4) 的旋转四元数批量生成 gp_Trsf
+
+    Parameters
+    ----------
+    `vectors` : ArrayLike
+        (N,3) 的平移变换
+    `quaternions` : ArrayLike
+        (N,4) 的旋转四元数 [x,y,z,w]
+
+    Returns
+    -------
+    list[gp_Trsf]
+    """
+    rotations = quaternions_to_rotation_matrices(np.asarray(quaternions, dtype=np.float64).reshape(-1, 4))
+    matrices = np.zeros((len(rotations), 4, 4))
+    matrices[:, :3, :3] = rotations
+    matrices[:, :3, 3] = np.asarray(vectors, dtype=np.float64).reshape(-1, 3)
+    return transform_matrices_as_gp_Trsfs(matrices)
 
 
-# end def
-def gp_Trsf_as_vec_quat(trsf: gp_Trsf) -> tuple[Vector, Quaternion]:
+def gp_Trsf_as_vec_quat(trsf: gp_Trsf, dtype: DTypeLike = np.float64) -> tuple[Vector, Quaternion]:
     """从 gp_Trsf 中获取平移变换和旋转四元数
 
     Parameters
     ----------
     `trsf` : gp_Trsf
+    `dtype` : DTypeLike, 可选
+        结果数组的类型，默认值：np.float64
 
     Returns
     -------
     tuple[Vector, Quaternion]
         平移变换和旋转四元数
     """
-    return from_gp_XYZ(trsf.TranslationPart()), gp_Quaternion_as_quat(trsf.GetRotation())
+    return from_gp_XYZ(trsf.TranslationPart(), dtype), gp_Quaternion_as_quat(trsf.GetRotation(), dtype)
 
 
-def gp_Trsf_as_vectors(trsf: gp_Trsf) -> tuple[Vector, Vector, Vector, Vector]:
+def gp_Trsf_as_vectors(trsf: gp_Trsf, dtype: DTypeLike = np.float64) -> tuple[Vector, Vector, Vector, Vector]:
     """从 gp_Trsf 中获取平移变换和三个方向向量
 
     Parameters
     ----------
     `trsf` : gp_Trsf
+    `dtype` : DTypeLike, 可选
+        结果数组的类型，默认值：np.float64
 
     Returns
     -------
@@ -62,10 +178,10 @@ def gp_Trsf_as_vectors(trsf: gp_Trsf) -> tuple[Vector, Vector, Vector, Vector]:
     """
     rotation_matrix = trsf.VectorialPart()
     return (
-        from_gp_XYZ(trsf.TranslationPart()),
-        from_gp_XYZ(rotation_matrix.Column(1)),
-        from_gp_XYZ(rotation_matrix.Column(2)),
-        from_gp_XYZ(rotation_matrix.Column(3)),
+        from_gp_XYZ(trsf.TranslationPart(), dtype),
+        from_gp_XYZ(rotation_matrix.Column(1), dtype),
+        from_gp_XYZ(rotation_matrix.Column(2), dtype),
+        from_gp_XYZ(rotation_matrix.Column(3), dtype),
     )
 
 
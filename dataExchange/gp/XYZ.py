@@ -3,27 +3,68 @@ gp_XYZ 的数据交换
 Author: ICO
 Date: 2024-02-04"""
 
+from collections.abc import Sequence
+from itertools import chain
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
 # logger
 from loguru import logger
 
 # pyOCC
 from OCC.Core.gp import gp_XYZ
 
+# local
+from basicGeometricTyping import Vector
 
-def from_gp_XYZ(xyz: gp_XYZ):
+
+def from_gp_XYZ(xyz: gp_XYZ, dtype: DTypeLike = np.float64, out: NDArray | None = None) -> Vector:
     """获取 gp_XYZ 的取值
 
     Parameters
     ----------
-    pnt : gp_XYZ
-        _description_
+    `xyz` : gp_XYZ
+    `dtype` : DTypeLike, 可选
+        新建数组的类型 (例如 np.float32)，默认值：np.float64
+    `out` : NDArray | None, 可选
+        写入结果的 (3,) 数组 (用于在循环中复用内存)，默认值：None (新建数组)
+
+    Returns
+    -------
+    Vector
+        (3,) 的数组 [x,y,z]
+    """
+    if out is None:
+        out = np.empty(3, dtype=dtype)
+    out[0], out[1], out[2] = xyz.X(), xyz.Y(), xyz.Z()
+    return out
+
+
+# end def
+def xyzs_to_array(xyzs: Sequence[gp_XYZ], out: NDArray[np.float64] | None = None) -> NDArray[np.float64]:
+    """把一组 gp_XYZ 一次性写入 (N,3) 的数组
+
+    Parameters
+    ----------
+    `xyzs` : Sequence[gp_XYZ]
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,3) 数组 (可以是不连续的视图，例如 buf[:, :3])，默认值：None (新建数组)
 
     Returns
     -------
-    tuple[float, float, float]
-        返回点的元组
+    NDArray[np.float64]
+        (N,3) 的数组
     """
-    return (xyz.X(), xyz.Y(), xyz.Z())
+    count = len(xyzs)
+    if out is None:
+        out = np.empty((count, 3), dtype=np.float64)
+    elif out.shape != (count, 3):
+        raise ValueError(f"out 的形状应为 ({count}, 3)，当前为：{out.shape}")
+    out[...] = np.fromiter(
+        chain.from_iterable(xyz.Coord() for xyz in xyzs), dtype=np.float64, count=3 * count
+    ).reshape(count, 3)
+    return out
 
 
 # end def
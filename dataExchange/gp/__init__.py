@@ -1,4 +1,13 @@
-from .Pnt import from_point
-from .Quaternion import gp_Quaternion_as_euler, gp_Quaternion_as_quat
-from .Trsf import gp_Trsf_as_transform_matrix, gp_Trsf_as_vec_quat, gp_Trsf_as_vectors, trsf_as_json
-from .XYZ import from_gp_XYZ
+from .Pnt import TColgp_Array1OfPnt_as_array, array_as_TColgp_Array1OfPnt, array_to_points, from_point, points_to_array
+from .Quaternion import gp_Quaternion_as_euler, gp_Quaternion_as_quat, gp_Quaternions_as_euler
+from .Trsf import (
+    gp_Trsf_as_transform_matrix,
+    gp_Trsf_as_vec_quat,
+    gp_Trsf_as_vectors,
+    gp_Trsfs_as_transform_matrices,
+    gp_Trsfs_as_vec_quat,
+    transform_matrices_as_gp_Trsfs,
+    trsf_as_json,
+    vec_quat_as_gp_Trsfs,
+)
+from .XYZ import from_gp_XYZ, xyzs_to_array
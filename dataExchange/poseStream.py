@@ -0,0 +1,286 @@
+"""
+位姿 (gp_Trsf) 的紧凑二进制编码和流式读写
+
+二进制流：16 字节文件头 + 连续的定长记录，每条记录为 3x4 变换矩阵按行展开的 12 个小端浮点数
+(float64 为 96 字节，float32 为 48 字节)；文件可以直接用 np.memmap 打开。
+JSON Lines 流：每行一个 trsf_as_json 的结果，用于需要文本格式的场合。
+Author: ICO
+Date: 2026-10-18"""
+
+import json
+import struct
+from collections.abc import Iterator, Sequence
+from typing import BinaryIO, Literal
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+
+# logger
+from loguru import logger
+
+# pyOCC
+from OCC.Core.gp import gp_Trsf
+
+# local
+from .gp.Trsf import gp_Trsfs_as_transform_matrices, transform_matrices_as_gp_Trsfs, trsf_as_json
+
+POSE_STREAM_MAGIC = b"OCPS"
+POSE_STREAM_VERSION = 1
+VALUES_PER_POSE = 12
+_HEADER = struct.Struct("<4sBBH8x")
+_DTYPES = {8: np.dtype("<f8"), 4: np.dtype("<f4")}
+_RECORDS = {8: struct.Struct("<12d"), 4: struct.Struct("<12f")}
+
+PoseStreamFormat = Literal["binary", "jsonl"]
+
+
+def _itemsize(dtype: DTypeLike) -> int:
+    itemsize = np.dtype(dtype).itemsize
+    if itemsize not in _DTYPES:
+        raise ValueError(f"位姿只支持 float64 或 float32，当前为：{np.dtype(dtype)}")
+    return itemsize
+
+
+# end def
+def _trsf_values(trsf: gp_Trsf) -> tuple[float, ...]:
+    """3x4 变换矩阵按行展开的 12 个值"""
+    return tuple(trsf.Value(row, col) for row in (1, 2, 3) for col in (1, 2, 3, 4))
+
+
+# end def
+def trsf_to_bytes(trsf: gp_Trsf, dtype: DTypeLike = np.float64) -> bytes:
+    """把单个 gp_Trsf 编码为一条定长记录 (不含文件头)
+
+    Parameters
+    ----------
+    `trsf` : gp_Trsf
+    `dtype` : DTypeLike, 可选
+        np.float64 (96 字节) 或 np.float32 (48 字节)，默认值：np.float64
+
+    Returns
+    -------
+    bytes
+    """
+    return _RECORDS[_itemsize(dtype)].pack(*_trsf_values(trsf))
+
+
+# end def
+def trsf_from_bytes(data: bytes) -> gp_Trsf:
+    """解码 trsf_to_bytes 的结果，精度由数据长度确定
+
+    Parameters
+    ----------
+    `data` : bytes
+
+    Returns
+    -------
+    gp_Trsf
+    """
+    for record in _RECORDS.values():
+        if len(data) == record.size:
+            trsf = gp_Trsf()
+            trsf.SetValues(*record.unpack(data))
+            return trsf
+    raise ValueError(f"位姿记录的长度应为 96 或 48 字节，当前为：{len(data)}")
+
+
+# end def
+def _read_header(header: bytes) -> int:
+    """校验文件头，返回记录中浮点数的字节数"""
+    if len(header) != _HEADER.size:
+        raise ValueError("位姿流的文件头不完整")
+    magic, version, itemsize, values_per_pose = _HEADER.unpack(header)
+    if magic != POSE_STREAM_MAGIC:
+        raise ValueError("不是位姿流数据")
+    if version != POSE_STREAM_VERSION or itemsize not in _DTYPES or values_per_pose != VALUES_PER_POSE:
+        raise ValueError(f"不支持的位姿流：version={version}, itemsize={itemsize}, values={values_per_pose}")
+    return itemsize
+
+
+# end def
+class PoseStreamWriter:
+    """
+    把位姿逐帧写入文件或二进制流 (例如 socket.makefile("wb"))
+
+    Examples
+    --------
+    >>> with PoseStreamWriter("poses.bin", dtype=np.float32) as writer:
+    ...     for trsf in frames:
+    ...         writer.write(trsf)
+    >>> matrices = read_pose_stream("poses.bin")
+    """
+
+    def __init__(
+        self,
+        file: str | BinaryIO,
+        dtype: DTypeLike = np.float64,
+        fmt: PoseStreamFormat = "binary",
+    ):
+        """
+        Parameters
+        ----------
+        `file` : str | BinaryIO
+            文件路径 (覆盖写入) 或已打开的二进制流 (不会被关闭)
+        `dtype` : DTypeLike, 可选
+            二进制记录的精度，np.float64 或 np.float32，默认值：np.float64
+        `fmt` : PoseStreamFormat, 可选
+            "binary" 二进制记录，"jsonl" 每行一个 trsf_as_json，默认值："binary"
+        """
+        if fmt not in ("binary", "jsonl"):
+            raise ValueError(f"不支持的格式：{fmt}")
+        self.fmt = fmt
+        self._itemsize = _itemsize(dtype)
+        self._record = _RECORDS[self._itemsize]
+        self._owns_file = isinstance(file, str)
+        self._file: BinaryIO = open(file, "wb") if isinstance(file, str) else file
+        self.count = 0
+        """已写入的位姿数量"""
+        if fmt == "binary":
+            self._file.write(_HEADER.pack(POSE_STREAM_MAGIC, POSE_STREAM_VERSION, self._itemsize, VALUES_PER_POSE))
+
+    # end alternate constructor
+
+    def __enter__(self) -> "PoseStreamWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, trsf: gp_Trsf):
+        """写入一帧位姿"""
+        if self.fmt == "binary":
+            self._file.write(self._record.pack(*_trsf_values(trsf)))
+        else:
+            self._file.write(trsf_as_json(trsf).encode() + b"\n")
+        self.count += 1
+
+    def write_many(self, trsfs: Sequence[gp_Trsf]):
+        """一次写入多帧位姿"""
+        if self.fmt == "binary":
+            self.write_matrices(gp_Trsfs_as_transform_matrices(trsfs))
+        else:
+            for trsf in trsfs:
+                self.write(trsf)
+
+    def write_matrices(self, matrices: ArrayLike):
+        """一次写入 (N,4,4) 或 (N,3,4) 的变换矩阵 (单个 (4,4) 或 (3,4) 矩阵视为 N=1)"""
+        matrices = np.asarray(matrices)[..., :3, :].reshape(-1, 3, 4)
+        if self.fmt == "binary":
+            records = np.ascontiguousarray(matrices, dtype=_DTYPES[self._itemsize])
+            self._file.write(records.tobytes())
+            self.count += len(records)
+        else:
+            self.write_many(transform_matrices_as_gp_Trsfs(matrices))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        """刷新缓冲区，由路径打开的文件同时关闭"""
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+# end class
+def _read_pose_jsonl(path: str) -> NDArray[np.float64]:
+    rows = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            matrix, location = data["Matrix"], data["Location"]
+            rows.append(matrix[0:3] + [location[0]] + matrix[3:6] + [location[1]] + matrix[6:9] + [location[2]])
+    return np.array(rows, dtype=np.float64).reshape(-1, 3, 4)
+
+
+# end def
+def read_pose_stream(path: str, mmap=True) -> NDArray[np.floating]:
+    """读取 PoseStreamWriter 写入的文件 (二进制或 JSON Lines 自动识别)
+
+    二进制文件末尾不完整的记录 (例如写入时程序中断) 会被忽略。
+
+    Parameters
+    ----------
+    `path` : str
+        文件路径
+    `mmap` : bool, 可选
+        二进制文件是否以只读内存映射打开 (不把整个文件读入内存)，默认值：True
+
+    Returns
+    -------
+    NDArray[np.floating]
+        (N,3,4) 的变换矩阵，精度与写入时一致 (JSON Lines 为 float64)
+    """
+    with open(path, "rb") as file:
+        header = file.read(_HEADER.size)
+        file.seek(0, 2)
+        size = file.tell()
+    if not header.startswith(POSE_STREAM_MAGIC):
+        return _read_pose_jsonl(path)
+    itemsize = _read_header(header)
+    dtype = _DTYPES[itemsize]
+    record_size = itemsize * VALUES_PER_POSE
+    count, remainder = divmod(size - _HEADER.size, record_size)
+    if remainder:
+        logger.warning(f"{path} 末尾有 {remainder} 字节不完整的位姿记录，已忽略")
+    if count == 0:
+        return np.empty((0, 3, 4), dtype=dtype)
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode="r", offset=_HEADER.size, shape=(count, 3, 4))
+    return np.fromfile(path, dtype=dtype, count=count * VALUES_PER_POSE, offset=_HEADER.size).reshape(count, 3, 4)
+
+
+# end def
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    """读取 `size` 字节 (流提前结束时返回已读到的部分)"""
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+# end def
+def iter_pose_stream(stream: BinaryIO, chunk_size=1024) -> Iterator[NDArray[np.floating]]:
+    """从二进制流 (文件或 socket.makefile("rb")) 中分块读取位姿
+
+    流支持 read1 (例如 io.BufferedReader) 时，每次只读取已经到达的数据，位姿随到随产出，
+    不会为了凑满 `chunk_size` 而阻塞。
+
+    Parameters
+    ----------
+    `stream` : BinaryIO
+        以 PoseStreamWriter 的二进制文件头开始的流
+    `chunk_size` : int, 可选
+        每块最多的位姿数量，默认值：1024
+
+    Yields
+    ------
+    NDArray[np.floating]
+        (K,3,4) 的变换矩阵，1 <= K <= chunk_size；流结束时末尾不完整的记录会被丢弃
+    """
+    itemsize = _read_header(_read_exactly(stream, _HEADER.size))
+    dtype = _DTYPES[itemsize]
+    record_size = itemsize * VALUES_PER_POSE
+    read = getattr(stream, "read1", stream.read)
+    pending = b""
+    while True:
+        data = read(chunk_size * record_size - len(pending))
+        if not data:
+            break
+        pending += data
+        count = len(pending) // record_size
+        if count:
+            yield np.frombuffer(pending[: count * record_size], dtype=dtype).reshape(count, 3, 4)
+            pending = pending[count * record_size :]
+    # end while
+    if pending:
+        logger.warning(f"位姿流末尾有 {len(pending)} 字节不完整的记录，已忽略")
+
+
+# end def
@@ -0,0 +1,73 @@
+"""
+能够承受工作进程崩溃的进程池批处理
+OCC 的读写器在遇到损坏的数据时可能直接使进程崩溃 (段错误)，此时 ProcessPoolExecutor 会失效，
+所有未完成的任务都会抛出 BrokenProcessPool；这里只把崩溃的那个任务记为失败，其余任务在新的进程池中重新执行。
+Author: ICO
+Date: 2026-10-18"""
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+# logger
+from loguru import logger
+
+
+class WorkerCrashed(RuntimeError):
+    """执行任务的工作进程异常退出 (例如段错误)"""
+
+
+def map_isolated(
+    function: Callable, arguments: Sequence[tuple], workers: int | None = None
+) -> list[Any | BaseException]:
+    """在进程池中对每组参数调用 `function`，单个任务失败或使工作进程崩溃都不会影响其他任务
+
+    进程池因崩溃失效后，未完成的任务改在单进程的进程池中按顺序重新执行，
+    第一个再次失效的任务即为崩溃的任务 (记为 WorkerCrashed)，之后剩余的任务恢复并行执行。
+
+    Parameters
+    ----------
+    `function` : Callable
+        可以被 pickle 的模块级函数
+    `arguments` : Sequence[tuple]
+        每个任务的位置参数
+    `workers` : int | None, 可选
+        工作进程数，默认值：None (CPU 核数)
+
+    Returns
+    -------
+    list[Any | BaseException]
+        与 `arguments` 顺序一致的返回值；任务抛出异常时为该异常，工作进程崩溃时为 WorkerCrashed
+    """
+    results: list[Any] = [None] * len(arguments)
+    pending = list(range(len(arguments)))
+    isolated = False
+    while pending:
+        broken = []
+        with ProcessPoolExecutor(max_workers=1 if isolated else workers) as executor:
+            futures = [(index, executor.submit(function, *arguments[index])) for index in pending]
+            for index, future in futures:
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool:
+                    broken.append(index)
+                except Exception as error:
+                    results[index] = error
+        # end with
+        if not broken:
+            break
+        if isolated:
+            # 单进程按提交顺序执行，第一个未完成的任务就是使进程崩溃的任务
+            crashed = broken[0]
+            logger.error(f"任务 {crashed} 使工作进程崩溃")
+            results[crashed] = WorkerCrashed("工作进程异常退出")
+            pending, isolated = broken[1:], False
+        else:
+            logger.warning(f"进程池因工作进程崩溃而失效，在单进程中重新执行 {len(broken)} 个未完成的任务")
+            pending, isolated = broken, True
+    # end while
+    return results
+
+
+# end def
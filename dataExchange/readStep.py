@@ -1,27 +1,208 @@
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
 from loguru import logger
 from OCC.Core.IFSelect import IFSelect_ItemsByEntity, IFSelect_RetDone
 from OCC.Core.STEPControl import STEPControl_Reader
+from OCC.Core.TopAbs import TopAbs_SOLID
+from OCC.Core.TopExp import TopExp_Explorer
 from OCC.Core.TopoDS import TopoDS_Shape
 
+from .brepBinary import shape_from_bytes, shape_to_bytes
+from .processPool import map_isolated
+from .stepCache import StepCache
+from .stepImportOptions import StepCheckReport, StepImportOptions
+
+
+def read_step(dir_path: str, cache: StepCache | None = None, options: StepImportOptions | None = None):
+    """read the STEP file and returns a compound
+
+    `cache` 不为 None 时，优先从磁盘缓存读取转换结果，未命中时转换后写入缓存；
+    `options` 为读取参数，默认与原有行为一致 (打印检查信息)
+    """
+    return read_step_with_report(dir_path, cache, options)[0]
+
+
+def read_step_with_report(
+    dir_path: str, cache: StepCache | None = None, options: StepImportOptions | None = None
+) -> tuple[TopoDS_Shape | None, StepCheckReport]:
+    """读取 STEP 文件，同时返回检查报告
+
+    只有 `options.check_mode` 为 "collect" 时报告中才有检查信息 (命中缓存时报告为空)
 
-def read_step(dir_path: str):
-    """read the STEP file and returns a compound"""
+    Returns
+    -------
+    tuple[TopoDS_Shape | None, StepCheckReport]
+        转换后的形状 (失败时为 None) 和检查报告
+    """
+    if options is None:
+        options = StepImportOptions()
+    report = StepCheckReport()
+    if cache is not None:
+        cache_key = cache.key(dir_path, {"root": 1, **options.as_dict()})
+        cached_shape = cache.get(cache_key)
+        if cached_shape is not None:
+            return cached_shape, report
+    aResShape = None
     # 生成一个 step 模型类
     reader = STEPControl_Reader()
-    # 加载一个文件并且返回一个状态枚举值
-    status = reader.ReadFile(dir_path)
-
-    # 如果正常执行且有模型
-    if status == IFSelect_RetDone:  # check status
-        fails_only = False
-        # 如果存在无效或者不完整步骤实体，会显示错误信息
-        reader.PrintCheckLoad(fails_only, IFSelect_ItemsByEntity)
-        reader.PrintCheckTransfer(fails_only, IFSelect_ItemsByEntity)
-
-        # 执行步骤文件转换
-        ok = reader.TransferRoot(1)
-        # 返回转换后的形状
-        aResShape = reader.Shape(1)
-    else:
+    with options.applied():
+        # 加载一个文件并且返回一个状态枚举值
+        status = reader.ReadFile(dir_path)
+
+        # 如果正常执行且有模型
+        if status == IFSelect_RetDone:  # check status
+            if options.check_mode == "print":
+                fails_only = False
+                # 如果存在无效或者不完整步骤实体，会显示错误信息
+                reader.PrintCheckLoad(fails_only, IFSelect_ItemsByEntity)
+                reader.PrintCheckTransfer(fails_only, IFSelect_ItemsByEntity)
+            elif options.check_mode == "collect":
+                report.collect("load", reader.WS().ModelCheckList())
+
+            if reader.NbRootsForTransfer() > 1:
+                logger.warning(f"文件包含 {reader.NbRootsForTransfer()} 个根实体，只转换第 1 个 (全部转换请使用 iter_step_roots)")
+            # 执行步骤文件转换
+            ok = reader.TransferRoot(1)
+            if options.check_mode == "collect":
+                report.collect("transfer", reader.WS().TransferReader().LastCheckList())
+            # 返回转换后的形状
+            aResShape = reader.Shape(1)
+            if cache is not None and not aResShape.IsNull():
+                # 缓存写入失败 (磁盘已满、权限等) 不影响转换结果
+                try:
+                    cache.put(cache_key, aResShape)
+                except (OSError, RuntimeError) as error:
+                    logger.warning(f"写入 STEP 缓存失败：{error}")
+        else:
+            logger.error("模型加载失败")
+    # end with
+    return aResShape, report
+
+
+def iter_step_roots(
+    dir_path: str, solids=False, options: StepImportOptions | None = None
+) -> Iterator[TopoDS_Shape]:
+    """逐个转换并返回 STEP 文件的所有根实体
+
+    每个根实体转换完成后立即返回，调用方可以在其余根实体转换之前开始处理；
+    返回后即清除读取器中已转换的形状列表，不会把所有根实体合并为一个复合体。
+
+    Parameters
+    ----------
+    `dir_path` : str
+        STEP 文件路径
+    `solids` : bool, 可选
+        是否拆分为实体逐个返回 (不含实体的根实体按原样返回)，默认值：False
+    `options` : StepImportOptions | None, 可选
+        读取参数 (不进行检查)，默认值：None
+
+    Yields
+    ------
+    TopoDS_Shape
+    """
+    if options is None:
+        options = StepImportOptions()
+    reader = STEPControl_Reader()
+    with options.applied():
+        status = reader.ReadFile(dir_path)
+    if status != IFSelect_RetDone:
         logger.error("模型加载失败")
-    return aResShape
+        return
+    for root in range(1, reader.NbRootsForTransfer() + 1):
+        # 生成器在两次 yield 之间可能有其它读取，因此每个根实体转换时单独设置参数
+        with options.applied():
+            transferred = reader.TransferRoot(root)
+        if not transferred:
+            logger.warning(f"根实体 {root} 转换失败")
+            continue
+        shapes = [reader.Shape(index) for index in range(1, reader.NbShapes() + 1)]
+        reader.ClearShapes()
+        for shape in shapes:
+            if not solids:
+                yield shape
+                continue
+            explorer = TopExp_Explorer(shape, TopAbs_SOLID)
+            if not explorer.More():
+                yield shape
+            while explorer.More():
+                yield explorer.Current()
+                explorer.Next()
+            # end while
+    # end for
+
+
+class StepReadResult(NamedTuple):
+    """批量读取 STEP 文件时单个文件的结果"""
+
+    path: str
+    shape: TopoDS_Shape | None
+    """读取失败时为 None"""
+    seconds: float
+    """读取和转换的耗时 (不含进程间传递)"""
+    error: str | None
+    """失败原因，成功时为 None"""
+
+
+def _read_step_worker(
+    path: str, cache: StepCache | None, options: StepImportOptions | None
+) -> tuple[bytes | None, float, str | None]:
+    """工作进程：读取并转换 STEP 文件，以二进制 BRep 返回形状"""
+    start = time.perf_counter()
+    try:
+        shape = read_step(path, cache, options)
+        seconds = time.perf_counter() - start
+        if shape is None or shape.IsNull():
+            return None, seconds, "模型加载失败"
+        return shape_to_bytes(shape), seconds, None
+    except Exception as error:
+        return None, time.perf_counter() - start, f"{type(error).__name__}: {error}"
+
+
+def read_step_many(
+    paths: list[str],
+    workers: int | None = None,
+    cache: StepCache | None = None,
+    options: StepImportOptions | None = None,
+) -> list[StepReadResult]:
+    """使用进程池并行读取多个 STEP 文件
+
+    每个文件在独立的进程中读取和转换，形状以二进制 BRep 格式传回，
+    单个文件失败不会中断整批读取；工作进程崩溃 (例如 OCC 读取器段错误) 时只有该文件记为失败 (WorkerCrashed)，
+    其余未完成的文件在新的进程池中重新读取 (见 map_isolated)。
+
+    Parameters
+    ----------
+    `paths` : list[str]
+        STEP 文件路径
+    `workers` : int | None, 可选
+        工作进程数，默认值：None (CPU 核数)
+    `cache` : StepCache | None, 可选
+        磁盘缓存，默认值：None (不使用缓存)
+    `options` : StepImportOptions | None, 可选
+        读取参数，默认值：None (与 read_step 一致)
+
+    Returns
+    -------
+    list[StepReadResult]
+        与 `paths` 顺序一致的读取结果
+    """
+    paths = list(paths)
+    outcomes = map_isolated(_read_step_worker, [(path, cache, options) for path in paths], workers)
+    results = []
+    for path, outcome in zip(paths, outcomes):
+        if isinstance(outcome, BaseException):
+            data, seconds, error = None, 0.0, f"{type(outcome).__name__}: {outcome}"
+        else:
+            data, seconds, error = outcome
+        shape = None
+        if data is not None:
+            try:
+                shape = shape_from_bytes(data)
+            except RuntimeError as read_error:
+                error = str(read_error)
+        if error is not None:
+            logger.error(f"{path} 读取失败：{error}")
+        results.append(StepReadResult(path, shape, seconds, error))
+    return results
@@ -0,0 +1,188 @@
+"""
+保留装配结构的 STEP 读取 (XCAF)
+Author: ICO
+Date: 2026-10-18"""
+
+from collections.abc import Iterator
+
+# logger
+from loguru import logger
+
+# pyOCC
+from OCC.Core.IFSelect import IFSelect_RetDone
+from OCC.Core.Quantity import Quantity_Color
+from OCC.Core.STEPCAFControl import STEPCAFControl_Reader
+from OCC.Core.TCollection import TCollection_AsciiString
+from OCC.Core.TDF import TDF_Label, TDF_LabelSequence, TDF_Tool
+from OCC.Core.TDocStd import TDocStd_Document
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.TopoDS import TopoDS_Shape
+from OCC.Core.XCAFDoc import XCAFDoc_ColorGen, XCAFDoc_ColorSurf, XCAFDoc_DocumentTool
+
+# local
+from .toString import to_ExtendedString
+
+
+def _label_entry(label: TDF_Label) -> str:
+    """标签在文档中的唯一路径，例如 "0:1:1:3" """
+    entry = TCollection_AsciiString()
+    TDF_Tool.Entry(label, entry)
+    return entry.ToCString()
+
+
+# end def
+class AssemblyNode:
+    """
+    装配树中的一个节点 (装配体或零件的一个实例)
+
+    子节点、名称、颜色和实例形状在第一次访问时才从 XCAF 文档中取出 (几何本身已由 StepAssembly 全部转换)；
+    同一零件的所有实例共享同一个原型形状，实例形状只是带位置的引用。
+    """
+
+    def __init__(
+        self,
+        assembly: "StepAssembly",
+        label: TDF_Label,
+        location: TopLoc_Location,
+        instance_label: TDF_Label | None = None,
+        parent: "AssemblyNode | None" = None,
+    ):
+        self.assembly = assembly
+        self.label = label
+        """原型 (零件或子装配) 的标签"""
+        self.instance_label = instance_label
+        """实例 (装配组件) 的标签，根节点为 None"""
+        self.location = location
+        """相对于世界坐标系的位置"""
+        self.parent = parent
+        self._children: list[AssemblyNode] | None = None
+
+    # end alternate constructor
+
+    def __repr__(self):
+        return f"AssemblyNode({self.name!r}, children={len(self.children)})"
+
+    @property
+    def name(self) -> str:
+        """实例名称，实例没有名称时使用原型名称"""
+        if self.instance_label is not None:
+            name = self.instance_label.GetLabelName()
+            if name:
+                return name
+        return self.label.GetLabelName()
+
+    @property
+    def color(self) -> Quantity_Color | None:
+        """实例或原型的表面颜色，没有设置颜色时为 None"""
+        return self.assembly.label_color(self.instance_label) or self.assembly.label_color(self.label)
+
+    @property
+    def is_assembly(self) -> bool:
+        return self.assembly.shape_tool.IsAssembly(self.label)
+
+    @property
+    def children(self) -> list["AssemblyNode"]:
+        """子节点 (第一次访问时生成)"""
+        if self._children is None:
+            self._children = []
+            if self.is_assembly:
+                components = TDF_LabelSequence()
+                self.assembly.shape_tool.GetComponents(self.label, components, False)
+                for i in range(1, components.Length() + 1):
+                    component = components.Value(i)
+                    referred = TDF_Label()
+                    if not self.assembly.shape_tool.GetReferredShape(component, referred):
+                        continue
+                    location = self.location.Multiplied(self.assembly.shape_tool.GetLocation(component))
+                    self._children.append(AssemblyNode(self.assembly, referred, location, component, self))
+        return self._children
+
+    @property
+    def prototype(self) -> TopoDS_Shape:
+        """原型形状 (所有实例共享)"""
+        return self.assembly.prototype(self.label)
+
+    @property
+    def shape(self) -> TopoDS_Shape:
+        """实例形状：原型形状加上实例位置 (不复制几何)"""
+        return self.prototype.Moved(self.location)
+
+    def iter_parts(self) -> Iterator["AssemblyNode"]:
+        """深度优先遍历所有零件 (叶子) 节点"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.is_assembly:
+                stack.extend(reversed(node.children))
+            else:
+                yield node
+        # end while
+
+
+# end class
+class StepAssembly:
+    """
+    通过 XCAF 读取 STEP 文件，保留装配树、名称和颜色
+
+    注意：STEPCAFControl_Reader.Transfer 在构造时就会转换文件中的全部几何，
+    延迟的只是装配树的遍历、名称和颜色的查询以及实例形状的生成，
+    因此只访问部分节点并不能减少转换时间和几何占用的内存。
+
+    Examples
+    --------
+    >>> assembly = StepAssembly("cell.step")
+    >>> for part in assembly.iter_parts():
+    ...     ais = AIS_Shape(part.shape)
+    """
+
+    def __init__(self, dir_path: str):
+        """
+        Parameters
+        ----------
+        `dir_path` : str
+            STEP 文件路径
+        """
+        self.document = TDocStd_Document(to_ExtendedString("pythonocc-doc-step-assembly"))
+        self.shape_tool = XCAFDoc_DocumentTool.ShapeTool(self.document.Main())
+        self.color_tool = XCAFDoc_DocumentTool.ColorTool(self.document.Main())
+        self._prototypes: dict[str, TopoDS_Shape] = {}
+        reader = STEPCAFControl_Reader()
+        reader.SetColorMode(True)
+        reader.SetNameMode(True)
+        reader.SetLayerMode(True)
+        status = reader.ReadFile(dir_path)
+        if status != IFSelect_RetDone or not reader.Transfer(self.document):
+            logger.error("模型加载失败")
+        labels = TDF_LabelSequence()
+        self.shape_tool.GetFreeShapes(labels)
+        self.roots = [AssemblyNode(self, labels.Value(i), TopLoc_Location()) for i in range(1, labels.Length() + 1)]
+        """装配树的根节点"""
+
+    # end alternate constructor
+
+    def prototype(self, label: TDF_Label) -> TopoDS_Shape:
+        """标签对应的原型形状 (按标签缓存，同一零件只取一次)"""
+        entry = _label_entry(label)
+        shape = self._prototypes.get(entry)
+        if shape is None:
+            shape = self.shape_tool.GetShape(label)
+            self._prototypes[entry] = shape
+        return shape
+
+    def label_color(self, label: TDF_Label | None) -> Quantity_Color | None:
+        """标签上设置的表面颜色 (优先 ColorSurf，其次 ColorGen)"""
+        if label is None:
+            return None
+        color = Quantity_Color()
+        for color_type in (XCAFDoc_ColorSurf, XCAFDoc_ColorGen):
+            if self.color_tool.GetColor(label, color_type, color):
+                return color
+        return None
+
+    def iter_parts(self) -> Iterator[AssemblyNode]:
+        """深度优先遍历所有零件实例"""
+        for root in self.roots:
+            yield from root.iter_parts()
+
+
+# end class
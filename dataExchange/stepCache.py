@@ -0,0 +1,119 @@
+"""
+STEP 读取结果的磁盘缓存 (二进制 BRep)
+Author: ICO
+Date: 2026-10-18"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+# logger
+from loguru import logger
+
+# pyOCC
+from OCC.Core.TopoDS import TopoDS_Shape
+
+# local
+from .brepBinary import read_brep_binary, write_brep_binary
+
+
+class StepCache:
+    """
+    把 STEP 文件转换得到的形状以二进制 BRep 格式缓存在磁盘上
+
+    键由文件内容的 SHA-256 和读取参数共同决定，文件内容或读取参数变化后自动失效；
+    缓存目录超过容量上限时按最近使用时间淘汰。
+    """
+
+    SUFFIX = ".brep"
+    TEMP_SUFFIX = ".tmp"
+    """写入中的临时文件的后缀 (不参与淘汰和清空)"""
+
+    def __init__(self, cache_dir: str, max_bytes=2 * 1024**3):
+        """
+        Parameters
+        ----------
+        `cache_dir` : str
+            缓存目录 (不存在时自动创建)
+        `max_bytes` : int, 可选
+            缓存目录的容量上限，默认值：2 GB
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # end alternate constructor
+
+    def key(self, step_path: str, options: dict | None = None) -> str:
+        """计算缓存键
+
+        Parameters
+        ----------
+        `step_path` : str
+            STEP 文件路径
+        `options` : dict | None, 可选
+            影响转换结果的读取参数 (需要可以 JSON 序列化)，默认值：None
+
+        Returns
+        -------
+        str
+        """
+        with open(step_path, "rb") as file:
+            digest = hashlib.file_digest(file, "sha256")
+        digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+
+    def get(self, key: str) -> TopoDS_Shape | None:
+        """读取缓存的形状，未命中时返回 None"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            shape = read_brep_binary(path)
+        except RuntimeError as error:
+            logger.warning(f"缓存文件损坏，已删除：{error}")
+            os.remove(path)
+            return None
+        # 更新修改时间，作为 LRU 淘汰的依据
+        os.utime(path)
+        return shape
+
+    def put(self, key: str, shape: TopoDS_Shape):
+        """写入缓存 (先写临时文件再替换，避免并发读到不完整的文件)"""
+        file_descriptor, temp_path = tempfile.mkstemp(suffix=self.TEMP_SUFFIX, dir=self.cache_dir)
+        os.close(file_descriptor)
+        try:
+            write_brep_binary(shape, temp_path)
+            os.replace(temp_path, self._path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self._evict()
+
+    def clear(self):
+        """清空缓存目录中的缓存文件"""
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(self.SUFFIX):
+                os.remove(entry.path)
+
+    def _evict(self):
+        """按最近使用时间淘汰，直到总大小不超过上限 (至少保留最新的一个文件)"""
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(self.SUFFIX)]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        # end for
+
+
+# end class
@@ -0,0 +1,196 @@
+"""
+STEP 读取参数和检查报告
+Author: ICO
+Date: 2026-10-18"""
+
+from contextlib import contextmanager
+from typing import Literal, NamedTuple
+
+# pyOCC
+from OCC.Core.Interface import Interface_CheckIterator, Interface_Static
+
+# 操作列表为空的 Shape Processing 序列，ShapeProcess 执行空序列后返回原形状 (即跳过修复)。
+# 序列必须有定义：XSAlgo_AlgoContainer::ProcessShape 找不到 "<序列>.exec.op" 时，
+# 对 "read." 参数会改为执行默认的 ShapeFix_Shape，仍然会修复形状。
+# read.step.resource.name 为空时 ShapeProcess 的资源取自 Interface_Static 参数表，因此把序列定义为静态参数；
+# 值为只含分隔符的 ","，没有任何操作名 (空字符串的静态参数不会进入资源表)。
+_NO_SHAPE_FIX_SEQUENCE = "NoShapeFix"
+_NO_SHAPE_FIX_OPERATORS = ","
+
+
+def _define_no_shape_fix_sequence():
+    name = f"{_NO_SHAPE_FIX_SEQUENCE}.exec.op"
+    if not Interface_Static.IsPresent(name):
+        Interface_Static.Init("XSTEP", name, "t", _NO_SHAPE_FIX_OPERATORS)
+
+
+# end def
+
+
+class StepCheckMessage(NamedTuple):
+    """一条 STEP 检查信息"""
+
+    stage: Literal["load", "transfer"]
+    """检查阶段：加载 (load) 或转换 (transfer)"""
+    entity: int
+    """实体在模型中的序号，0 表示全局信息"""
+    severity: Literal["fail", "warning"]
+    message: str
+
+
+class StepCheckReport:
+    """STEP 读取过程中收集的检查结果"""
+
+    def __init__(self):
+        self.messages: list[StepCheckMessage] = []
+
+    # end alternate constructor
+
+    def __repr__(self):
+        return f"StepCheckReport(fails={len(self.fails)}, warnings={len(self.warnings)})"
+
+    @property
+    def fails(self) -> list[StepCheckMessage]:
+        return [message for message in self.messages if message.severity == "fail"]
+
+    @property
+    def warnings(self) -> list[StepCheckMessage]:
+        return [message for message in self.messages if message.severity == "warning"]
+
+    @property
+    def is_ok(self) -> bool:
+        """没有失败信息"""
+        return not self.fails
+
+    def collect(self, stage: Literal["load", "transfer"], check_list: Interface_CheckIterator):
+        """从 Interface_CheckIterator 中收集检查信息"""
+        check_list.Start()
+        while check_list.More():
+            check = check_list.Value()
+            entity = check_list.Number()
+            for i in range(1, check.NbFails() + 1):
+                self.messages.append(StepCheckMessage(stage, entity, "fail", check.CFail(i, True)))
+            for i in range(1, check.NbWarnings() + 1):
+                self.messages.append(StepCheckMessage(stage, entity, "warning", check.CWarning(i, True)))
+            check_list.Next()
+        # end while
+
+
+# end class
+class StepImportOptions:
+    """
+    STEP 读取参数
+
+    为 None 的参数保持 OCC 当前的设置不变；参数只在读取期间生效，读取结束后恢复原值。
+    """
+
+    def __init__(
+        self,
+        check_mode: Literal["print", "none", "collect"] = "print",
+        precision: float | None = None,
+        max_precision: float | None = None,
+        max_precision_forced: bool | None = None,
+        same_parameter: bool | None = None,
+        shape_fix=True,
+    ):
+        """
+        Parameters
+        ----------
+        `check_mode` : Literal["print", "none", "collect"], 可选
+            检查方式："print" 打印到标准输出 (原有行为)，"none" 不检查，
+            "collect" 收集到 StepCheckReport，默认值："print"
+        `precision` : float | None, 可选
+            读取精度 (read.precision.val，同时使用用户精度模式)，默认值：None (使用文件中的精度)
+        `max_precision` : float | None, 可选
+            修复时允许的最大容差 (read.maxprecision.val)，默认值：None
+        `max_precision_forced` : bool | None, 可选
+            是否强制容差不超过 max_precision (read.maxprecision.mode)，默认值：None
+        `same_parameter` : bool | None, 可选
+            是否执行标准的 SameParameter 处理 (read.stdsameparameter.mode)，默认值：None
+        `shape_fix` : bool, 可选
+            是否执行转换后的形状修复 (Shape Processing)，为 False 时使用空的处理序列，
+            转换结果不做任何修复，默认值：True
+        """
+        self.check_mode = check_mode
+        self.precision = precision
+        self.max_precision = max_precision
+        self.max_precision_forced = max_precision_forced
+        self.same_parameter = same_parameter
+        self.shape_fix = shape_fix
+
+    # end alternate constructor
+
+    def __repr__(self):
+        return f"StepImportOptions({self.as_dict()})"
+
+    @classmethod
+    def fast(cls, shape_fix=True) -> "StepImportOptions":
+        """快速模式：不做检查，限制修复容差，跳过标准 SameParameter，可选关闭形状修复"""
+        return cls(
+            check_mode="none",
+            max_precision=1.0,
+            max_precision_forced=True,
+            same_parameter=False,
+            shape_fix=shape_fix,
+        )
+
+    @classmethod
+    def strict(cls) -> "StepImportOptions":
+        """严格模式：收集检查结果，执行标准 SameParameter 和形状修复"""
+        return cls(check_mode="collect", same_parameter=True, shape_fix=True)
+
+    def as_dict(self) -> dict:
+        """影响转换结果的参数 (用于缓存键)"""
+        return {
+            "precision": self.precision,
+            "max_precision": self.max_precision,
+            "max_precision_forced": self.max_precision_forced,
+            "same_parameter": self.same_parameter,
+            "shape_fix": self.shape_fix,
+        }
+
+    def _static_values(self) -> dict[str, int | float | str]:
+        values: dict[str, int | float | str] = {}
+        if self.precision is not None:
+            values["read.precision.mode"] = 1
+            values["read.precision.val"] = float(self.precision)
+        if self.max_precision is not None:
+            values["read.maxprecision.val"] = float(self.max_precision)
+        if self.max_precision_forced is not None:
+            values["read.maxprecision.mode"] = int(self.max_precision_forced)
+        if self.same_parameter is not None:
+            values["read.stdsameparameter.mode"] = int(self.same_parameter)
+        if not self.shape_fix:
+            values["read.step.resource.name"] = ""
+            values["read.step.sequence"] = _NO_SHAPE_FIX_SEQUENCE
+        return values
+
+    @contextmanager
+    def applied(self):
+        """在 with 语句内设置 Interface_Static 参数，结束后恢复原值 (需要在创建 STEPControl_Reader 之后调用)"""
+        if not self.shape_fix:
+            _define_no_shape_fix_sequence()
+        previous = {}
+        for name, value in self._static_values().items():
+            if isinstance(value, str):
+                previous[name] = Interface_Static.CVal(name)
+                Interface_Static.SetCVal(name, value)
+            elif isinstance(value, float):
+                previous[name] = Interface_Static.RVal(name)
+                Interface_Static.SetRVal(name, value)
+            else:
+                previous[name] = Interface_Static.IVal(name)
+                Interface_Static.SetIVal(name, value)
+        try:
+            yield self
+        finally:
+            for name, value in previous.items():
+                if isinstance(value, str):
+                    Interface_Static.SetCVal(name, value)
+                elif isinstance(value, float):
+                    Interface_Static.SetRVal(name, value)
+                else:
+                    Interface_Static.SetIVal(name, value)
+
+
+# end class
@@ -3,7 +3,7 @@
 Author: ICO
 Date: 2024-01-21"""
 
-from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
+from OCC.Core.Quantity import Quantity_Color, Quantity_ColorRGBA, Quantity_TOC_RGB
 
 color_map = {
     "red": (255, 0, 0),
@@ -15,11 +15,78 @@ color_map = {
     "cyan": (0, 255, 255),
 }
 
+# 按 RGB (0~255) 缓存的颜色对象，相同的颜色只创建一次
+_color_cache: dict[tuple[int, int, int], Quantity_Color] = {}
+_color_rgba_cache: dict[tuple[int, int, int, int], Quantity_ColorRGBA] = {}
 
+
+def interned_Quantity_Color(r: int, g: int, b: int) -> Quantity_Color:
+    """取得缓存的 Quantity_Color (不存在时创建)
+
+    返回的对象被所有调用者共享，不要修改它 (AIS 设置颜色时会复制颜色值，可以直接使用)；
+    分量不是整数时不缓存，按原值 (r/255.0) 新建颜色
+
+    Parameters
+    ----------
+    `r`, `g`, `b` : int
+        0~255 的颜色分量
+
+    Returns
+    -------
+    Quantity_Color
+    """
+    if not all(float(value).is_integer() for value in (r, g, b)):
+        return Quantity_Color(r / 255.0, g / 255.0, b / 255.0, Quantity_TOC_RGB)
+    key = (int(r), int(g), int(b))
+    color = _color_cache.get(key)
+    if color is None:
+        color = Quantity_Color(key[0] / 255.0, key[1] / 255.0, key[2] / 255.0, Quantity_TOC_RGB)
+        _color_cache[key] = color
+    return color
+
+
+# end def
+def interned_Quantity_ColorRGBA(r: int, g: int, b: int, alpha=1.0) -> Quantity_ColorRGBA:
+    """取得缓存的 Quantity_ColorRGBA (不存在时创建)，透明度按 1/255 量化；分量不是整数时不缓存
+
+    Parameters
+    ----------
+    `r`, `g`, `b` : int
+        0~255 的颜色分量
+    `alpha` : float, 可选
+        不透明度 (0~1)，默认值：1.0
+
+    Returns
+    -------
+    Quantity_ColorRGBA
+    """
+    if not all(float(value).is_integer() for value in (r, g, b)):
+        return Quantity_ColorRGBA(interned_Quantity_Color(r, g, b), alpha)
+    key = (int(r), int(g), int(b), round(alpha * 255))
+    color = _color_rgba_cache.get(key)
+    if color is None:
+        color = Quantity_ColorRGBA(interned_Quantity_Color(*key[:3]), key[3] / 255.0)
+        _color_rgba_cache[key] = color
+    return color
+
+
+# end def
+def clear_color_cache():
+    """清空颜色缓存"""
+    _color_cache.clear()
+    _color_rgba_cache.clear()
+
+
+# end def
 def to_Quantity_Color(r: int | tuple[int, int, int] | list[int] = 0, g=0, b=0, hex_color=None, rgb_color=None, color_name=None):
+    """由 RGB 值、十六进制字符串 ("RRGGBB" 或 "#RRGGBB") 或 color_map 中的名称得到 Quantity_Color
+
+    结果来自 interned_Quantity_Color 的缓存，不要修改返回的对象
+    """
     if rgb_color:
         r, g, b = rgb_color
     elif hex_color:
+        hex_color = hex_color.lstrip("#")
         r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
     elif color_name:
         r, g, b = color_map[color_name]
@@ -28,4 +95,4 @@ def to_Quantity_Color(r: int | tuple[int, int, int] | list[int] = 0, g=0, b=0, h
     elif isinstance(r, int):
         r, g, b = r, g, b
 
-    return Quantity_Color(r / 255.0, g / 255.0, b / 255.0, Quantity_TOC_RGB)
+    return interned_Quantity_Color(r, g, b)
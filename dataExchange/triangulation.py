@@ -0,0 +1,94 @@
+"""
+TopoDS_Shape 的三角网格到 numpy 数组的数据交换
+Author: ICO
+Date: 2026-10-18"""
+
+from itertools import chain
+
+import numpy as np
+from numpy.typing import NDArray
+
+# pyOCC
+from OCC.Core.BRep import BRep_Tool
+from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCC.Core.TopExp import TopExp_Explorer
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.TopoDS import TopoDS_Shape, topods
+
+
+def shape_to_mesh_arrays(
+    shape: TopoDS_Shape,
+    linear_deflection: float | None = None,
+    angular_deflection=0.5,
+) -> tuple[NDArray[np.float64], NDArray[np.int32], NDArray[np.int64], NDArray[np.int64]]:
+    """一次取出整个形状的三角网格
+
+    先统计所有面的节点数和三角形数并一次性分配数组，再逐面把节点、三角形直接写入数组；
+    面的位置变换和反向面的三角形翻转以整块的矩阵运算完成。
+
+    Parameters
+    ----------
+    `shape` : TopoDS_Shape
+    `linear_deflection` : float | None, 可选
+        给定时先生成网格 (已有足够精细的网格时不会重新生成)，默认值：None (使用已有的网格)
+    `angular_deflection` : float, 可选
+        网格的角度偏差，默认值：0.5
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.int32], NDArray[np.int64], NDArray[np.int64]]
+        vertices (N,3)：世界坐标下的节点；
+        triangles (M,3)：节点序号 (从 0 开始，已按面的方向调整顺序)；
+        vertex_offsets (F+1,)：第 i 个面的节点为 vertices[vertex_offsets[i]:vertex_offsets[i+1]]；
+        triangle_offsets (F+1,)：第 i 个面的三角形为 triangles[triangle_offsets[i]:triangle_offsets[i+1]]
+        (面的顺序与 TopExp_Explorer(shape, TopAbs_FACE) 一致，没有网格的面节点数和三角形数为 0)
+    """
+    if linear_deflection is not None:
+        BRepMesh_IncrementalMesh(shape, linear_deflection, False, angular_deflection, True)
+    # 第一遍：统计数量
+    faces = []
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        face = topods.Face(explorer.Current())
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation(face, location)
+        faces.append((face, location, triangulation))
+        explorer.Next()
+    # end while
+    node_counts = np.array([0 if tri is None else tri.NbNodes() for _, _, tri in faces], dtype=np.int64)
+    triangle_counts = np.array([0 if tri is None else tri.NbTriangles() for _, _, tri in faces], dtype=np.int64)
+    vertex_offsets = np.concatenate(([0], np.cumsum(node_counts)))
+    triangle_offsets = np.concatenate(([0], np.cumsum(triangle_counts)))
+    vertices = np.empty((vertex_offsets[-1], 3), dtype=np.float64)
+    triangles = np.empty((triangle_offsets[-1], 3), dtype=np.int32)
+    # 第二遍：直接写入预分配的数组
+    for i, (face, location, triangulation) in enumerate(faces):
+        if triangulation is None:
+            continue
+        nb_nodes, nb_triangles = node_counts[i], triangle_counts[i]
+        face_vertices = vertices[vertex_offsets[i] : vertex_offsets[i + 1]]
+        face_vertices.reshape(-1)[:] = np.fromiter(
+            chain.from_iterable(triangulation.Node(n).Coord() for n in range(1, nb_nodes + 1)),
+            dtype=np.float64,
+            count=3 * nb_nodes,
+        )
+        if not location.IsIdentity():
+            trsf = location.Transformation()
+            matrix = np.array([[trsf.Value(row, col) for col in (1, 2, 3, 4)] for row in (1, 2, 3)])
+            face_vertices[:] = face_vertices @ matrix[:, :3].T + matrix[:, 3]
+        face_triangles = triangles[triangle_offsets[i] : triangle_offsets[i + 1]]
+        face_triangles.reshape(-1)[:] = np.fromiter(
+            chain.from_iterable(triangulation.Triangle(t).Get() for t in range(1, nb_triangles + 1)),
+            dtype=np.int32,
+            count=3 * nb_triangles,
+        )
+        # OCC 的节点序号从 1 开始，转为全局序号
+        face_triangles += int(vertex_offsets[i]) - 1
+        if face.Orientation() == TopAbs_REVERSED:
+            face_triangles[:, [1, 2]] = face_triangles[:, [2, 1]]
+    # end for
+    return vertices, triangles, vertex_offsets, triangle_offsets
+
+
+# end def
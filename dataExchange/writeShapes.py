@@ -0,0 +1,196 @@
+"""
+批量导出 TopoDS_Shape (STEP / 二进制 BRep / STL / glTF)
+Author: ICO
+Date: 2026-10-18"""
+
+import os
+import time
+from typing import Literal, NamedTuple
+
+# logger
+from loguru import logger
+
+# pyOCC
+from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.IFSelect import IFSelect_RetDone
+from OCC.Core.Message import Message_ProgressRange
+from OCC.Core.RWGltf import RWGltf_CafWriter
+from OCC.Core.StlAPI import StlAPI_Writer
+from OCC.Core.STEPControl import STEPControl_AsIs, STEPControl_Writer
+from OCC.Core.TColStd import TColStd_IndexedDataMapOfStringString
+from OCC.Core.TDocStd import TDocStd_Document
+from OCC.Core.TopoDS import TopoDS_Shape
+from OCC.Core.XCAFDoc import XCAFDoc_DocumentTool
+
+# local
+from .brepBinary import shape_from_bytes, shape_to_bytes, write_brep_binary
+from .processPool import map_isolated
+from .toString import to_AsciiString, to_ExtendedString
+
+ShapeFormat = Literal["step", "brep", "stl", "gltf"]
+
+_EXTENSIONS = {"step": ".step", "brep": ".brep", "stl": ".stl", "gltf": ".glb"}
+
+
+class ShapeWriteResult(NamedTuple):
+    """批量导出时单个文件的结果"""
+
+    path: str
+    seconds: float
+    """网格生成和写文件的耗时"""
+    error: str | None
+    """失败原因，成功时为 None"""
+
+
+def _write_step(shape: TopoDS_Shape, path: str):
+    writer = STEPControl_Writer()
+    if writer.Transfer(shape, STEPControl_AsIs) != IFSelect_RetDone or writer.Write(path) != IFSelect_RetDone:
+        raise RuntimeError(f"STEP 写入失败：{path}")
+
+
+# end def
+def _write_stl(shape: TopoDS_Shape, path: str, ascii_mode: bool):
+    writer = StlAPI_Writer()
+    writer.SetASCIIMode(ascii_mode)
+    if not writer.Write(shape, path):
+        raise RuntimeError(f"STL 写入失败：{path}")
+
+
+# end def
+def _write_gltf(shape: TopoDS_Shape, path: str):
+    document = TDocStd_Document(to_ExtendedString("pythonocc-doc-gltf-export"))
+    shape_tool = XCAFDoc_DocumentTool.ShapeTool(document.Main())
+    shape_tool.AddShape(shape, False)
+    writer = RWGltf_CafWriter(to_AsciiString(path), path.lower().endswith(".glb"))
+    if not writer.Perform(document, TColStd_IndexedDataMapOfStringString(), Message_ProgressRange()):
+        raise RuntimeError(f"glTF 写入失败：{path}")
+
+
+# end def
+def write_shape(
+    shape: TopoDS_Shape,
+    fmt: ShapeFormat,
+    path: str,
+    linear_deflection=0.1,
+    angular_deflection=0.5,
+    ascii_stl=False,
+):
+    """导出单个形状
+
+    STL 和 glTF 会先生成三角网格 (面之间并行，isInParallel=True)
+
+    Parameters
+    ----------
+    `shape` : TopoDS_Shape
+    `fmt` : ShapeFormat
+        "step"、"brep" (二进制)、"stl" 或 "gltf" (扩展名为 .glb 时写二进制 glTF)
+    `path` : str
+        文件路径
+    `linear_deflection` : float, 可选
+        网格的线性偏差，默认值：0.1
+    `angular_deflection` : float, 可选
+        网格的角度偏差，默认值：0.5
+    `ascii_stl` : bool, 可选
+        STL 是否使用 ASCII 格式，默认值：False
+    """
+    if fmt in ("stl", "gltf"):
+        BRepMesh_IncrementalMesh(shape, linear_deflection, False, angular_deflection, True)
+    match fmt:
+        case "step":
+            _write_step(shape, path)
+        case "brep":
+            write_brep_binary(shape, path)
+        case "stl":
+            _write_stl(shape, path, ascii_stl)
+        case "gltf":
+            _write_gltf(shape, path)
+        case _:
+            raise ValueError(f"不支持的格式：{fmt}")
+    # end match
+
+
+# end def
+def _write_shape_worker(data: bytes, fmt: ShapeFormat, path: str, options: dict) -> tuple[float, str | None]:
+    """工作进程：反序列化形状并导出"""
+    start = time.perf_counter()
+    try:
+        write_shape(shape_from_bytes(data), fmt, path, **options)
+        return time.perf_counter() - start, None
+    except Exception as error:
+        return time.perf_counter() - start, f"{type(error).__name__}: {error}"
+
+
+# end def
+def write_shapes(
+    shapes: list[TopoDS_Shape],
+    fmt: ShapeFormat,
+    output_dir: str,
+    names: list[str] | None = None,
+    workers: int | None = 1,
+    linear_deflection=0.1,
+    angular_deflection=0.5,
+    ascii_stl=False,
+) -> list[ShapeWriteResult]:
+    """批量导出形状，每个形状一个文件
+
+    `workers` 大于 1 (或为 None) 时，形状以二进制 BRep 发送到进程池，网格生成和写文件在多个进程中同时进行；
+    单个文件失败不会中断整批导出；写入器使工作进程崩溃时只有该文件记为失败 (WorkerCrashed)，
+    其余未完成的文件在新的进程池中重新导出 (见 map_isolated)。
+
+    Parameters
+    ----------
+    `shapes` : list[TopoDS_Shape]
+    `fmt` : ShapeFormat
+        "step"、"brep" (二进制)、"stl" 或 "gltf" (二进制 .glb)
+    `output_dir` : str
+        输出目录 (不存在时自动创建)
+    `names` : list[str] | None, 可选
+        文件名 (不含扩展名)，默认值：None (shape_0, shape_1, ...)
+    `workers` : int | None, 可选
+        工作进程数，1 表示在当前进程中依次导出，None 表示 CPU 核数，默认值：1
+    `linear_deflection` : float, 可选
+        网格的线性偏差，默认值：0.1
+    `angular_deflection` : float, 可选
+        网格的角度偏差，默认值：0.5
+    `ascii_stl` : bool, 可选
+        STL 是否使用 ASCII 格式，默认值：False
+
+    Returns
+    -------
+    list[ShapeWriteResult]
+        与 `shapes` 顺序一致的导出结果
+    """
+    if fmt not in _EXTENSIONS:
+        raise ValueError(f"不支持的格式：{fmt}")
+    shapes = list(shapes)
+    if names is None:
+        names = [f"shape_{i}" for i in range(len(shapes))]
+    if len(names) != len(shapes):
+        raise ValueError("names 与 shapes 的数量不一致")
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [os.path.join(output_dir, name + _EXTENSIONS[fmt]) for name in names]
+    options = {"linear_deflection": linear_deflection, "angular_deflection": angular_deflection, "ascii_stl": ascii_stl}
+    outcomes = []
+    if workers == 1:
+        for shape, path in zip(shapes, paths):
+            start = time.perf_counter()
+            try:
+                write_shape(shape, fmt, path, **options)
+                outcomes.append((time.perf_counter() - start, None))
+            except Exception as error:
+                outcomes.append((time.perf_counter() - start, f"{type(error).__name__}: {error}"))
+    else:
+        jobs = [(shape_to_bytes(shape), fmt, path, options) for shape, path in zip(shapes, paths)]
+        for outcome in map_isolated(_write_shape_worker, jobs, workers):
+            if isinstance(outcome, BaseException):
+                outcome = (0.0, f"{type(outcome).__name__}: {outcome}")
+            outcomes.append(outcome)
+    results = []
+    for path, (seconds, error) in zip(paths, outcomes):
+        if error is not None:
+            logger.error(f"{path} 导出失败：{error}")
+        results.append(ShapeWriteResult(path, seconds, error))
+    return results
+
+
+# end def
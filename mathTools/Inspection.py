@@ -4,10 +4,15 @@ Author: ICO
 Date: 2024-02-05
 """
 
+import math
+
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 from basicGeometricTyping import Point
 
+from .pointCloudIndex import PointCloudIndex
+
 
 def collinear_check(point_1: Point, point_2: Point, point_3: Point, linear_tolerance=1e-6) -> bool:
     """检查三点是否共线
@@ -32,3 +37,101 @@ def collinear_check(point_1: Point, point_2: Point, point_3: Point, linear_toler
     cross_product = np.cross(vector_AB, vector_AC)
     # 使用阈值来容忍小的数值误差
     return np.linalg.norm(cross_product) < LINEAR_TOLERANCE
+
+
+# end def
+def _collinear_mask(vector_AB: NDArray, vector_AC: NDArray, linear_tolerance: float) -> NDArray[np.bool_]:
+    """与 collinear_check 的判断相同：|AB x AC| < 阈值 (比较平方，避免开方)"""
+    cross_product = np.cross(vector_AB, vector_AC)
+    return np.einsum("...i,...i->...", cross_product, cross_product) < linear_tolerance * linear_tolerance
+
+
+# end def
+def collinear_check_array(
+    points_1: ArrayLike,
+    points_2: ArrayLike | None = None,
+    points_3: ArrayLike | None = None,
+    linear_tolerance=1e-6,
+) -> NDArray[np.bool_]:
+    """批量检查三点是否共线 (判断方法与 collinear_check 相同)
+
+    Parameters
+    ----------
+    `points_1` : ArrayLike
+        (N,3) 的第一个点；`points_2`、`points_3` 为 None 时为 (N,3,3) 的三点组
+    `points_2` : ArrayLike | None, 可选
+        (N,3) 的第二个点，默认值：None
+    `points_3` : ArrayLike | None, 可选
+        (N,3) 的第三个点，默认值：None
+    `linear_tolerance` : float, 可选
+        阈值，默认值：1e-6
+
+    Returns
+    -------
+    NDArray[np.bool_]
+        (N,) 的掩码，共线则为 True
+    """
+    if points_2 is None or points_3 is None:
+        triples = np.asarray(points_1, dtype=np.float64)
+        points_1, points_2, points_3 = triples[:, 0], triples[:, 1], triples[:, 2]
+    else:
+        points_1 = np.asarray(points_1, dtype=np.float64)
+        points_2 = np.asarray(points_2, dtype=np.float64)
+        points_3 = np.asarray(points_3, dtype=np.float64)
+    return _collinear_mask(points_1 - points_3, points_2 - points_3, linear_tolerance)
+
+
+# end def
+def collinear_check_polyline(points: ArrayLike, linear_tolerance=1e-6) -> NDArray[np.bool_]:
+    """沿折线滑动检查相邻三点是否共线
+
+    Parameters
+    ----------
+    `points` : ArrayLike
+        (M,3) 的折线顶点
+    `linear_tolerance` : float, 可选
+        阈值，默认值：1e-6
+
+    Returns
+    -------
+    NDArray[np.bool_]
+        (M-2,) 的掩码，第 i 项为 points[i]、points[i+1]、points[i+2] 是否共线
+        (即顶点 i+1 是否可以在折线简化时删除)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 3:
+        return np.zeros(0, dtype=np.bool_)
+    middle = points[1:-1]
+    return _collinear_mask(points[:-2] - middle, points[2:] - middle, linear_tolerance)
+
+
+# end def
+def point_cloud_deviation(
+    scan_points: ArrayLike,
+    reference: ArrayLike | PointCloudIndex,
+    max_distance=math.inf,
+    voxel_size: float | None = None,
+) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """扫描点到参考点 (例如 CAD 表面的采样点) 的偏差：每个扫描点到最近参考点的距离
+
+    Parameters
+    ----------
+    `scan_points` : ArrayLike
+        (N,3) 的扫描点
+    `reference` : ArrayLike | PointCloudIndex
+        (M,3) 的参考点，或已建好的 PointCloudIndex (多次检测同一模型时复用)
+    `max_distance` : float, 可选
+        最大搜索距离，更远的扫描点偏差为 inf，默认值：math.inf
+    `voxel_size` : float | None, 可选
+        新建索引的体素边长，默认值：None (自动估计)
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.int64]]
+        (N,) 的偏差和最近参考点的序号 (找不到时为 -1)
+    """
+    index = reference if isinstance(reference, PointCloudIndex) else PointCloudIndex(reference, voxel_size)
+    return index.query_nearest(scan_points, max_distance)
+
+
+# end def
@@ -1,2 +1,14 @@
-from ..todo.threePointFixedCircle import three_point_fixed_circle
-from .pointClouds import center_point_of_points
+from todo.threePointFixedCircle import three_point_fixed_circle
+from .aabbTree import AABBTree
+from .pointCloudIndex import PointCloudIndex, estimate_voxel_size
+from .pointCloudStatistics import PointCloudStatistics, iter_point_chunks, point_cloud_statistics
+from .pointClouds import center_point_of_points, estimate_normals, voxel_downsample
+from .rotation import (
+    EULER_SEQUENCES,
+    euler_to_quaternions,
+    euler_to_rotation_matrices,
+    quaternions_to_euler,
+    quaternions_to_rotation_matrices,
+    rotation_matrices_to_euler,
+    rotation_matrices_to_quaternions,
+)
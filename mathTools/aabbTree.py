@@ -0,0 +1,157 @@
+"""
+轴对齐包围盒树 (AABB Tree)
+Author: ICO
+Date: 2026-10-18"""
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+def _overlap(bounds_a: NDArray, bounds_b: NDArray) -> NDArray:
+    """判断包围盒是否重叠 (支持广播)，包围盒格式为 [xmin, ymin, zmin, xmax, ymax, zmax]"""
+    return np.all((bounds_a[..., :3] <= bounds_b[..., 3:]) & (bounds_b[..., :3] <= bounds_a[..., 3:]), axis=-1)
+
+
+# end def
+class AABBTree:
+    """
+    由 numpy 数组存储的静态 AABB 树，用于碰撞检测的粗检测 (broad phase)
+
+    每个叶子节点最多包含 `leaf_size` 个对象，节点按包围盒中心最长轴的中位数划分
+    """
+
+    def __init__(self, bounds: ArrayLike, leaf_size=4):
+        """
+        Parameters
+        ----------
+        `bounds` : ArrayLike
+            (N,6) 的包围盒数组，每行为 [xmin, ymin, zmin, xmax, ymax, zmax]
+        `leaf_size` : int, 可选
+            叶子节点包含的最大对象数量，默认值：4
+        """
+        self.bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 6)
+        self.leaf_size = max(int(leaf_size), 1)
+        self.order = np.arange(len(self.bounds))
+        self._node_bounds: list[NDArray] = []
+        self._node_children: list[tuple[int, int]] = []
+        self._node_range: list[tuple[int, int]] = []
+        if len(self.bounds):
+            self._build()
+
+    # end alternate constructor
+
+    def _build(self):
+        """自顶向下构建树 (非递归)"""
+        centers = (self.bounds[:, :3] + self.bounds[:, 3:]) / 2.0
+        root = self._new_node(0, len(self.order))
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            start, end = self._node_range[node]
+            if end - start <= self.leaf_size:
+                continue
+            items = self.order[start:end]
+            item_centers = centers[items]
+            # 沿中心点分布最长的轴进行中位数划分
+            axis = int(np.argmax(item_centers.max(axis=0) - item_centers.min(axis=0)))
+            half = (end - start) // 2
+            partition = np.argpartition(item_centers[:, axis], half)
+            self.order[start:end] = items[partition]
+            left = self._new_node(start, start + half)
+            right = self._new_node(start + half, end)
+            self._node_children[node] = (left, right)
+            stack.extend((left, right))
+        # end while
+        self._node_bounds_array = np.array(self._node_bounds)
+
+    def _new_node(self, start: int, end: int) -> int:
+        items = self.bounds[self.order[start:end]]
+        self._node_bounds.append(np.concatenate((items[:, :3].min(axis=0), items[:, 3:].max(axis=0))))
+        self._node_children.append((-1, -1))
+        self._node_range.append((start, end))
+        return len(self._node_range) - 1
+
+    def _is_leaf(self, node: int) -> bool:
+        return self._node_children[node][0] < 0
+
+    def _items(self, node: int) -> NDArray:
+        start, end = self._node_range[node]
+        return self.order[start:end]
+
+    def query(self, box: ArrayLike) -> NDArray:
+        """查找与给定包围盒重叠的对象
+
+        Parameters
+        ----------
+        `box` : ArrayLike
+            [xmin, ymin, zmin, xmax, ymax, zmax]
+
+        Returns
+        -------
+        NDArray
+            重叠对象的索引
+        """
+        box = np.asarray(box, dtype=np.float64)
+        if not len(self.bounds):
+            return np.empty(0, dtype=np.intp)
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not _overlap(self._node_bounds_array[node], box):
+                continue
+            if self._is_leaf(node):
+                items = self._items(node)
+                found.append(items[_overlap(self.bounds[items], box)])
+            else:
+                stack.extend(self._node_children[node])
+        # end while
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(found))
+
+    def query_pairs(self) -> NDArray:
+        """查找树中所有包围盒重叠的对象对 (不含自身)
+
+        Returns
+        -------
+        NDArray
+            (K,2) 的索引数组，每行 i < j，按字典序排列
+        """
+        if len(self.bounds) < 2:
+            return np.empty((0, 2), dtype=np.intp)
+        found = []
+        stack = [(0, 0)]
+        while stack:
+            node_a, node_b = stack.pop()
+            if node_a == node_b:
+                if self._is_leaf(node_a):
+                    items = self._items(node_a)
+                    mask = np.triu(_overlap(self.bounds[items][:, None], self.bounds[items][None, :]), k=1)
+                    i, j = np.nonzero(mask)
+                    found.append(np.stack((items[i], items[j]), axis=1))
+                else:
+                    left, right = self._node_children[node_a]
+                    stack.extend(((left, left), (right, right), (left, right)))
+                continue
+            if not _overlap(self._node_bounds_array[node_a], self._node_bounds_array[node_b]):
+                continue
+            leaf_a, leaf_b = self._is_leaf(node_a), self._is_leaf(node_b)
+            if leaf_a and leaf_b:
+                items_a, items_b = self._items(node_a), self._items(node_b)
+                i, j = np.nonzero(_overlap(self.bounds[items_a][:, None], self.bounds[items_b][None, :]))
+                found.append(np.stack((items_a[i], items_b[j]), axis=1))
+            elif leaf_a or (not leaf_b and len(self._items(node_b)) > len(self._items(node_a))):
+                left, right = self._node_children[node_b]
+                stack.extend(((node_a, left), (node_a, right)))
+            else:
+                left, right = self._node_children[node_a]
+                stack.extend(((left, node_b), (right, node_b)))
+        # end while
+        if not found:
+            return np.empty((0, 2), dtype=np.intp)
+        pairs = np.sort(np.concatenate(found), axis=1)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+# end class
@@ -0,0 +1,374 @@
+"""
+点云的体素哈希空间索引
+点按所在体素的整数坐标编码为 int64 键，按键排序后以 CSR 形式 (体素键、每个体素的起始位置) 保存；
+查询时把待查体素的键用二分查找定位，全部以 numpy 批量运算完成。
+Author: ICO
+Date: 2026-10-18"""
+
+import math
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# 每个轴占用 21 位，体素坐标加上偏置后打包为一个 int64
+_AXIS_BITS = 21
+_BIAS = 1 << (_AXIS_BITS - 1)
+
+
+def _pack_keys(ijk: NDArray[np.int64]) -> NDArray[np.int64]:
+    biased = ijk + _BIAS
+    return (biased[..., 0] << (2 * _AXIS_BITS)) | (biased[..., 1] << _AXIS_BITS) | biased[..., 2]
+
+
+# end def
+def estimate_voxel_size(points: ArrayLike, points_per_voxel=8.0) -> float:
+    """按点云的包围盒估计体素边长
+
+    扫描点和 CAD 采样点通常分布在曲面上，因此按 "最大两个方向的面积 / 点数" 估计，
+    使每个被占用的体素平均约有 `points_per_voxel` 个点。
+
+    Parameters
+    ----------
+    `points` : ArrayLike
+        (N,3) 的点
+    `points_per_voxel` : float, 可选
+        每个体素期望的点数，默认值：8.0
+
+    Returns
+    -------
+    float
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return 1.0
+    extents = np.sort(points.max(axis=0) - points.min(axis=0))[::-1]
+    if extents[1] > 0.0:
+        return float(math.sqrt(extents[0] * extents[1] * points_per_voxel / len(points)))
+    if extents[0] > 0.0:
+        return float(extents[0] * points_per_voxel / len(points))
+    return 1.0
+
+
+# end def
+class PointCloudIndex:
+    """
+    点云的体素哈希索引，可以逐批加入点，支持批量的最近邻、k 近邻和半径查询
+
+    与 scipy.spatial.cKDTree 相比，优点是加入新点时不需要重建整个索引 (只合并新点)、不依赖 scipy；
+    代价是查询较慢：均匀点云上 k 近邻查询约慢 15~50 倍 (k 越大越慢)。
+    点云固定且查询量大时，应优先使用 cKDTree。
+
+    Examples
+    --------
+    >>> index = PointCloudIndex(cad_points)
+    >>> distances, nearest = index.query_nearest(scan_points)
+    >>> offsets, neighbours, _ = index.query_radius(scan_points, 0.5)
+    >>> neighbours[offsets[i] : offsets[i + 1]]  # 第 i 个查询点 0.5 以内的点
+    """
+
+    def __init__(self, points: ArrayLike | None = None, voxel_size: float | None = None):
+        """
+        Parameters
+        ----------
+        `points` : ArrayLike | None, 可选
+            (N,3) 的初始点，默认值：None
+        `voxel_size` : float | None, 可选
+            体素边长，默认值：None (第一次加入点时用 estimate_voxel_size 估计)
+        """
+        self.voxel_size = voxel_size
+        self.origin: NDArray[np.float64] | None = None
+        """体素坐标 (0,0,0) 的起点，第一次加入点时确定"""
+        self._points = np.empty((0, 3), dtype=np.float64)
+        self._size = 0
+        self._indexed = 0
+        """已经进入排序结构的点数，之后的点在下一次查询前合并"""
+        self._sorted_keys = np.empty(0, dtype=np.int64)
+        self._order = np.empty(0, dtype=np.int64)
+        self._cells = np.empty(0, dtype=np.int64)
+        self._cell_starts = np.zeros(1, dtype=np.int64)
+        self._ijk_min = np.zeros(3, dtype=np.int64)
+        self._ijk_max = np.full(3, -1, dtype=np.int64)
+        if points is not None:
+            self.add(points)
+
+    # end alternate constructor
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return f"PointCloudIndex(points={self._size}, voxel_size={self.voxel_size})"
+
+    @property
+    def points(self) -> NDArray[np.float64]:
+        """已加入的点 (N,3)，序号即查询结果中的点序号"""
+        return self._points[: self._size]
+
+    def _voxel_coordinates(self, points: NDArray[np.float64]) -> NDArray[np.int64]:
+        return np.floor((points - self.origin) / self.voxel_size).astype(np.int64)
+
+    def add(self, points: ArrayLike) -> NDArray[np.int64]:
+        """加入一批点 (下一次查询时与已有的点合并，已有点按键有序，合并为线性时间)
+
+        Parameters
+        ----------
+        `points` : ArrayLike
+            (M,3) 的点
+
+        Returns
+        -------
+        NDArray[np.int64]
+            新加入的点的序号
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if self.origin is None and len(points):
+            if self.voxel_size is None:
+                self.voxel_size = estimate_voxel_size(points)
+            self.origin = points.min(axis=0)
+        if len(points):
+            ijk = self._voxel_coordinates(points)
+            if np.abs(ijk).max() >= _BIAS - 1:
+                raise ValueError(f"点超出体素索引的范围，请增大 voxel_size (当前为 {self.voxel_size})")
+        start = self._size
+        end = start + len(points)
+        if end > len(self._points):
+            grown = np.empty((max(end, 2 * len(self._points)), 3), dtype=np.float64)
+            grown[:start] = self._points[:start]
+            self._points = grown
+        self._points[start:end] = points
+        self._size = end
+        return np.arange(start, end, dtype=np.int64)
+
+    def _build(self):
+        """把新加入的点合并到按体素键排序的结构中"""
+        if self._indexed == self._size:
+            return
+        new_points = self._points[self._indexed : self._size]
+        ijk = self._voxel_coordinates(new_points)
+        new_keys = _pack_keys(ijk)
+        new_order = np.argsort(new_keys, kind="stable")
+        # 两段各自有序，稳定排序 (timsort) 只需线性时间合并
+        keys = np.concatenate((self._sorted_keys, new_keys[new_order]))
+        merge = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[merge]
+        self._order = np.concatenate((self._order, new_order + self._indexed))[merge]
+        boundaries = np.flatnonzero(np.diff(self._sorted_keys)) + 1
+        self._cells = self._sorted_keys[np.concatenate(([0], boundaries))]
+        self._cell_starts = np.concatenate(([0], boundaries, [len(self._sorted_keys)])).astype(np.int64)
+        if self._indexed == 0:
+            self._ijk_min, self._ijk_max = ijk.min(axis=0), ijk.max(axis=0)
+        else:
+            self._ijk_min = np.minimum(self._ijk_min, ijk.min(axis=0))
+            self._ijk_max = np.maximum(self._ijk_max, ijk.max(axis=0))
+        self._indexed = self._size
+
+    def _gather(
+        self, query_ids: NDArray[np.int64], cell_ijk: NDArray[np.int64]
+    ) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """取出若干 (查询点, 体素) 对中的所有点，返回 (查询点序号, 点序号)"""
+        inside = np.all((cell_ijk >= self._ijk_min) & (cell_ijk <= self._ijk_max), axis=1)
+        query_ids, keys = query_ids[inside], _pack_keys(cell_ijk[inside])
+        positions = np.searchsorted(self._cells, keys)
+        positions[positions == len(self._cells)] = 0
+        found = self._cells[positions] == keys
+        query_ids, positions = query_ids[found], positions[found]
+        starts = self._cell_starts[positions]
+        counts = self._cell_starts[positions + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        # 把每个体素的 [start, start+count) 展开为连续的序号
+        shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return np.repeat(query_ids, counts), self._order[np.arange(total) + shifts]
+
+    def _shell_cells(self, query_ijk: NDArray[np.int64], ring: int) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """与查询点所在体素切比雪夫距离恰好为 `ring`、且在点云体素范围内的体素
+
+        壳层按 6 个面分别枚举 (靠前的轴取开区间以免重复)，每个面先裁剪到点云的体素范围，
+        因此远离点云的查询点也只枚举与点云范围相交的部分。
+
+        Returns
+        -------
+        tuple[NDArray[np.int64], NDArray[np.int64]]
+            (查询点在 `query_ijk` 中的序号, (K,3) 的体素坐标)
+        """
+        lower, upper = self._ijk_min, self._ijk_max
+        if ring == 0:
+            inside = np.flatnonzero(np.all((query_ijk >= lower) & (query_ijk <= upper), axis=1))
+            return inside, query_ijk[inside]
+        query_ids, cells = [], []
+        for axis in range(3):
+            first, second = [other for other in range(3) if other != axis]
+            # 比 axis 靠前的轴已经在之前的面中取到 ±ring，这里只取开区间
+            spans = []
+            for other in (first, second):
+                reach = ring - 1 if other < axis else ring
+                low = np.maximum(query_ijk[:, other] - reach, lower[other])
+                high = np.minimum(query_ijk[:, other] + reach, upper[other])
+                spans.append((low, np.maximum(high - low + 1, 0)))
+            (first_low, first_count), (second_low, second_count) = spans
+            for sign in (-1, 1):
+                fixed = query_ijk[:, axis] + sign * ring
+                counts = first_count * second_count * ((fixed >= lower[axis]) & (fixed <= upper[axis]))
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                rows = np.repeat(np.arange(len(query_ijk)), counts)
+                local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                face = np.empty((total, 3), dtype=np.int64)
+                face[:, axis] = fixed[rows]
+                face[:, first] = first_low[rows] + local // second_count[rows]
+                face[:, second] = second_low[rows] + local % second_count[rows]
+                query_ids.append(rows)
+                cells.append(face)
+        # end for
+        if not cells:
+            return np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.int64)
+        return np.concatenate(query_ids), np.concatenate(cells)
+
+    def _distances(self, queries: NDArray[np.float64], query_ids, point_ids) -> NDArray[np.float64]:
+        difference = self._points[point_ids] - queries[query_ids]
+        return np.sqrt(np.einsum("ij,ij->i", difference, difference))
+
+    def query_knn(
+        self, queries: ArrayLike, k=1, max_distance=math.inf, batch_size=65536
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """批量 k 近邻查询
+
+        以查询点所在体素为中心逐圈 (切比雪夫距离) 向外搜索，当第 k 近的距离不超过已搜索的半径时停止；
+        远离点云的查询点从与点云体素范围相交的第一圈开始，每圈只枚举范围内的体素，
+        但需要搜索的圈数仍随距离增加，可以用 `max_distance` 限制搜索范围。
+
+        Parameters
+        ----------
+        `queries` : ArrayLike
+            (Q,3) 的查询点
+        `k` : int, 可选
+            近邻数量，默认值：1
+        `max_distance` : float, 可选
+            最大搜索距离，超过的近邻视为不存在，默认值：math.inf
+        `batch_size` : int, 可选
+            每圈每批处理的查询点数 (限制中间数组的大小)，默认值：65536
+
+        Returns
+        -------
+        tuple[NDArray[np.float64], NDArray[np.int64]]
+            (Q,k) 的距离 (从近到远) 和点序号；不存在的近邻距离为 inf，序号为 -1
+        """
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+        best_distances = np.full((len(queries), k), np.inf)
+        best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        self._build()
+        if self._size == 0 or len(queries) == 0:
+            return best_distances, best_ids
+        query_ijk = self._voxel_coordinates(queries)
+        # 点云体素范围外的圈不含点：从查询体素到该范围的切比雪夫距离开始，到覆盖整个范围为止
+        rings = np.maximum(np.maximum(self._ijk_min - query_ijk, query_ijk - self._ijk_max), 0).max(axis=1)
+        last_rings = np.maximum(np.abs(query_ijk - self._ijk_min), np.abs(query_ijk - self._ijk_max)).max(axis=1)
+        # 第 r 圈体素中的点到查询点的距离至少为 (r-1) 个体素边长 (查询点可以在所在体素的任意位置)
+        active = np.flatnonzero(np.maximum(rings - 1, 0) * self.voxel_size <= max_distance)
+        while len(active):
+            for ring in np.unique(rings[active]).tolist():
+                ring_group = active[rings[active] == ring]
+                for start in range(0, len(ring_group), batch_size):
+                    group = ring_group[start : start + batch_size]
+                    rows, cell_ijk = self._shell_cells(query_ijk[group], ring)
+                    query_ids, point_ids = self._gather(group[rows], cell_ijk)
+                    if len(point_ids) == 0:
+                        continue
+                    distances = self._distances(queries, query_ids, point_ids)
+                    # 与已有结果合并，每个查询点保留最近的 k 个
+                    kept = np.isfinite(best_distances[group])
+                    kept_ids = np.broadcast_to(group[:, None], kept.shape)[kept]
+                    query_ids = np.concatenate((kept_ids, query_ids))
+                    point_ids = np.concatenate((best_ids[group][kept], point_ids))
+                    distances = np.concatenate((best_distances[group][kept], distances))
+                    sort = np.lexsort((distances, query_ids))
+                    query_ids, point_ids, distances = query_ids[sort], point_ids[sort], distances[sort]
+                    first = np.flatnonzero(np.r_[True, query_ids[1:] != query_ids[:-1]])
+                    ranks = np.arange(len(query_ids)) - np.repeat(first, np.diff(np.r_[first, len(query_ids)]))
+                    selected = ranks < k
+                    best_distances[group] = np.inf
+                    best_ids[group] = -1
+                    best_distances[query_ids[selected], ranks[selected]] = distances[selected]
+                    best_ids[query_ids[selected], ranks[selected]] = point_ids[selected]
+                # end for
+            # end for
+            searched = rings[active] * self.voxel_size
+            done = (
+                (best_distances[active, -1] <= searched)
+                | (rings[active] >= last_rings[active])
+                | (searched >= max_distance)
+            )
+            rings[active] += 1
+            active = active[~done]
+        # end while
+        beyond = best_distances > max_distance
+        best_distances[beyond] = np.inf
+        best_ids[beyond] = -1
+        return best_distances, best_ids
+
+    def query_nearest(
+        self, queries: ArrayLike, max_distance=math.inf, batch_size=65536
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """批量最近邻查询 (query_knn 的 k=1 形式)
+
+        Returns
+        -------
+        tuple[NDArray[np.float64], NDArray[np.int64]]
+            (Q,) 的距离和点序号；不存在时距离为 inf，序号为 -1
+        """
+        distances, ids = self.query_knn(queries, 1, max_distance, batch_size)
+        return distances[:, 0], ids[:, 0]
+
+    def query_radius(
+        self, queries: ArrayLike, radius: float, batch_size=65536
+    ) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]]:
+        """批量半径查询
+
+        Parameters
+        ----------
+        `queries` : ArrayLike
+            (Q,3) 的查询点
+        `radius` : float
+            查询半径 (包含边界)
+        `batch_size` : int, 可选
+            半径不超过一个体素时每批处理的查询点数；每个查询点要检查 (2*ceil(radius/voxel_size)+1)^3 个体素，
+            半径更大时每批的查询点数按体素数成比例减少，使中间数组的大小与半径无关，默认值：65536
+
+        Returns
+        -------
+        tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]]
+            CSR 形式的结果 offsets (Q+1,)、点序号、距离：
+            第 i 个查询点的近邻为 indices[offsets[i]:offsets[i+1]]，按距离从近到远排列
+        """
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+        self._build()
+        counts = np.zeros(len(queries), dtype=np.int64)
+        found_ids, found_distances = [], []
+        if self._size and len(queries):
+            reach = math.ceil(radius / self.voxel_size)
+            axis = np.arange(-reach, reach + 1)
+            offsets = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+            # 中间数组的大小为 查询点数 * 体素数，按半径为一个体素 (27 个体素) 时的大小限制
+            query_batch = max(batch_size * 27 // len(offsets), 1)
+            for start in range(0, len(queries), query_batch):
+                group = np.arange(start, min(start + query_batch, len(queries)))
+                query_ids = np.repeat(group, len(offsets))
+                cell_ijk = (self._voxel_coordinates(queries[group])[:, None, :] + offsets[None, :, :]).reshape(-1, 3)
+                query_ids, point_ids = self._gather(query_ids, cell_ijk)
+                distances = self._distances(queries, query_ids, point_ids)
+                within = distances <= radius
+                query_ids, point_ids, distances = query_ids[within], point_ids[within], distances[within]
+                sort = np.lexsort((distances, query_ids))
+                counts += np.bincount(query_ids, minlength=len(queries))
+                found_ids.append(point_ids[sort])
+                found_distances.append(distances[sort])
+            # end for
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        if not found_ids:
+            return offsets, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return offsets, np.concatenate(found_ids), np.concatenate(found_distances)
+
+
+# end class
@@ -0,0 +1,182 @@
+"""
+点云的流式统计 (中心、协方差、包围盒、点数)
+按块读取点云，每块单独统计后用 Chan 等人的并行算法合并，数值稳定且只需遍历一次数据；
+支持 ndarray、.npy 文件 (内存映射读取) 和逐块产生点的迭代器。
+Author: ICO
+Date: 2026-10-18"""
+
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
+
+import numpy as np
+from numpy.typing import NDArray
+
+PointSource = NDArray | str | os.PathLike | Iterable
+"""点云数据来源：(N,D) 数组、.npy 文件路径、点的列表、逐个产生点的迭代器或逐块产生 (k,D) 数组的迭代器"""
+
+
+class PointCloudStatistics:
+    """点云的统计量，可以逐块更新，也可以与其他块的统计量合并"""
+
+    def __init__(self, dimension=3):
+        """
+        Parameters
+        ----------
+        `dimension` : int, 可选
+            点的维数，默认值：3
+        """
+        self.count = 0
+        """点数"""
+        self.mean = np.zeros(dimension)
+        """中心 (坐标平均值)"""
+        self.m2 = np.zeros((dimension, dimension))
+        """相对中心的偏差外积之和 (协方差 = m2 / count)"""
+        self.minimum = np.full(dimension, np.inf)
+        self.maximum = np.full(dimension, -np.inf)
+
+    # end alternate constructor
+
+    def __repr__(self):
+        return f"PointCloudStatistics(count={self.count}, mean={self.mean})"
+
+    @classmethod
+    def from_points(cls, points: NDArray) -> "PointCloudStatistics":
+        """统计一块点 (N,D)"""
+        points = np.asarray(points, dtype=np.float64)
+        statistics = cls(points.shape[1])
+        if len(points):
+            statistics.count = len(points)
+            statistics.mean = points.mean(axis=0)
+            centered = points - statistics.mean
+            statistics.m2 = centered.T @ centered
+            statistics.minimum = points.min(axis=0)
+            statistics.maximum = points.max(axis=0)
+        return statistics
+
+    def merge(self, other: "PointCloudStatistics") -> "PointCloudStatistics":
+        """把另一块的统计量合并到当前对象 (Chan 合并公式)，返回自身"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean.copy(), other.m2.copy()
+            self.minimum, self.maximum = other.minimum.copy(), other.maximum.copy()
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + np.outer(delta, delta) * (self.count * other.count / count)
+        self.count = count
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        return self
+
+    def update(self, points: NDArray) -> "PointCloudStatistics":
+        """加入一块点 (N,D)，返回自身"""
+        return self.merge(PointCloudStatistics.from_points(points))
+
+    def covariance(self, ddof=0) -> NDArray[np.float64]:
+        """协方差矩阵 (D,D)
+
+        Parameters
+        ----------
+        `ddof` : int, 可选
+            自由度修正，0 为总体协方差，1 为样本协方差，默认值：0
+        """
+        if self.count <= ddof:
+            return np.full_like(self.m2, np.nan)
+        return self.m2 / (self.count - ddof)
+
+    @property
+    def bounds(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """轴对齐包围盒 (最小坐标，最大坐标)"""
+        return self.minimum, self.maximum
+
+
+# end class
+def iter_point_chunks(source: PointSource, chunk_size=1_000_000) -> Iterator[NDArray]:
+    """把点云数据来源统一为逐块的 (k,D) 数组
+
+    Parameters
+    ----------
+    `source` : PointSource
+        (N,D) 数组、.npy 文件路径 (内存映射读取)、点的列表或迭代器；
+        迭代器的第一个元素是一维的点时视为逐个产生点，否则视为逐块产生 (k,D) 数组
+    `chunk_size` : int, 可选
+        数组、文件和逐点迭代器每块的点数 (逐块迭代器按其自身的分块)，默认值：1_000_000
+
+    Yields
+    ------
+    NDArray
+        (k,D) 的点
+    """
+    if isinstance(source, str | os.PathLike):
+        source = np.load(source, mmap_mode="r")
+    elif isinstance(source, list | tuple):
+        source = np.asarray(source, dtype=np.float64)
+    if isinstance(source, np.ndarray):
+        for start in range(0, len(source), chunk_size):
+            yield source[start : start + chunk_size]
+    else:
+        iterator = iter(source)
+        first = next(iterator, None)
+        if first is None:
+            return
+        if np.ndim(first) == 1:
+            # 逐个产生点：每 chunk_size 个点组成一块
+            points = chain([first], iterator)
+            while chunk := list(islice(points, chunk_size)):
+                yield np.asarray(chunk, dtype=np.float64)
+        else:
+            for chunk in chain([first], iterator):
+                yield np.asarray(chunk)
+
+
+# end def
+def point_cloud_statistics(source: PointSource, chunk_size=1_000_000, workers=1) -> PointCloudStatistics:
+    """一次遍历计算点云的中心、协方差、包围盒和点数
+
+    Parameters
+    ----------
+    `source` : PointSource
+        (N,D) 数组、.npy 文件路径 (内存映射读取)、点的列表、逐个产生点或逐块产生 (k,D) 数组的迭代器
+    `chunk_size` : int, 可选
+        数组、文件和逐点迭代器每块的点数，默认值：1_000_000
+    `workers` : int, 可选
+        并行统计的线程数 (numpy 的矩阵运算会释放 GIL)，同时在内存中的块最多为 2*workers，默认值：1
+
+    Returns
+    -------
+    PointCloudStatistics
+
+    Examples
+    --------
+    >>> statistics = point_cloud_statistics("scan.npy", workers=4)
+    >>> statistics.mean, statistics.covariance(), statistics.bounds
+    """
+    total: PointCloudStatistics | None = None
+
+    def merge(statistics: PointCloudStatistics):
+        nonlocal total
+        total = statistics if total is None else total.merge(statistics)
+
+    # end def
+    chunks = iter_point_chunks(source, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            merge(PointCloudStatistics.from_points(chunk))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: list[Future] = []
+            for chunk in chunks:
+                pending.append(executor.submit(PointCloudStatistics.from_points, chunk))
+                if len(pending) >= 2 * workers:
+                    merge(pending.pop(0).result())
+            for future in pending:
+                merge(future.result())
+        # end with
+    return total if total is not None else PointCloudStatistics()
+
+
+# end def
@@ -3,30 +3,146 @@
 Author: ICO
 Date: 2023-09-11"""
 import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
 from basicGeometricTyping import Point
 
+from .pointCloudIndex import PointCloudIndex
+from .pointCloudStatistics import PointSource, point_cloud_statistics
 
-def center_point_of_points(points_list: list[Point]) -> Point:
-    """计算点的中心坐标
+
+def center_point_of_points(points_list: list[Point] | PointSource) -> Point:
+    """计算点的中心坐标 (没有任何点时抛出 ValueError)
 
     Parameters
     ----------
-    `points_list` : list[Point]
-        包含点坐标的列表，每个点表示为一个元组 (x, y, z)
+    `points_list` : list[Point] | PointSource
+        包含点坐标的列表 (每个点表示为一个元组 (x, y, z))，或 (N,3) 数组、.npy 文件路径、
+        逐个产生点或逐块产生点的迭代器；数组和文件按块流式计算，不会复制整个点云
 
     Returns
     -------
     Point
         中心点的坐标，格式为 (center_x, center_y, center_z)
     """
-    # 将点的坐标拆分成单独的列表
-    x_coords, y_coords, z_coords = zip(*points_list)
+    statistics = point_cloud_statistics(points_list)
+    if statistics.count == 0:
+        raise ValueError("点列表为空，无法计算中心点")
+    center_x, center_y, center_z = statistics.mean
+    return (center_x, center_y, center_z)
 
-    # 计算坐标的平均值，这将给出中心点
-    center_x = np.mean(x_coords)
-    center_y = np.mean(y_coords)
-    center_z = np.mean(z_coords)
 
-    # 返回中心点的坐标
-    return (center_x, center_y, center_z)
+# end def
+def voxel_downsample(
+    points: ArrayLike, voxel_size: float, chunk_size=1_000_000, return_inverse=False
+) -> NDArray[np.float64] | tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """体素网格降采样：每个被占用的体素用其中点的重心代替
+
+    点按体素坐标编码为整数键，每块点先用 np.unique + np.bincount 归约为 (键, 坐标和, 点数)，
+    再合并各块的归约结果；除 `return_inverse` 外，内存只与块大小和被占用的体素数有关 (可直接传入 np.memmap)。
+
+    Parameters
+    ----------
+    `points` : ArrayLike
+        (N,3) 的点
+    `voxel_size` : float
+        体素边长
+    `chunk_size` : int, 可选
+        每块的点数，默认值：1_000_000
+    `return_inverse` : bool, 可选
+        是否同时返回每个点所属的降采样点序号，默认值：False
+
+    Returns
+    -------
+    NDArray[np.float64] | tuple[NDArray[np.float64], NDArray[np.int64]]
+        (M,3) 的降采样点 (按体素键排序)；`return_inverse` 为 True 时同时返回 (N,) 的序号
+    """
+    if not isinstance(points, np.ndarray):
+        points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        empty = np.empty((0, 3), dtype=np.float64)
+        return (empty, np.empty(0, dtype=np.int64)) if return_inverse else empty
+    origin = points.min(axis=0).astype(np.float64)
+    dims = tuple((np.floor((points.max(axis=0) - origin) / voxel_size) + 1).astype(np.int64).tolist())
+
+    def chunk_keys(chunk: NDArray) -> NDArray[np.int64]:
+        ijk = np.floor((np.asarray(chunk, dtype=np.float64) - origin) / voxel_size).astype(np.int64)
+        # 浮点误差可能使最大坐标落在范围外一格
+        np.minimum(ijk, np.array(dims) - 1, out=ijk)
+        return np.ravel_multi_index(ijk.T, dims)
+
+    # end def
+    partial_keys, partial_sums, partial_counts = [], [], []
+    for start in range(0, len(points), chunk_size):
+        chunk = np.asarray(points[start : start + chunk_size], dtype=np.float64)
+        keys, inverse = np.unique(chunk_keys(chunk), return_inverse=True)
+        partial_keys.append(keys)
+        partial_sums.append(np.stack([np.bincount(inverse, chunk[:, axis], len(keys)) for axis in range(3)], axis=1))
+        partial_counts.append(np.bincount(inverse, minlength=len(keys)))
+    # end for
+    keys, inverse = np.unique(np.concatenate(partial_keys), return_inverse=True)
+    sums = np.concatenate(partial_sums)
+    centroids = np.stack([np.bincount(inverse, sums[:, axis], len(keys)) for axis in range(3)], axis=1)
+    centroids /= np.bincount(inverse, np.concatenate(partial_counts), len(keys))[:, None]
+    if not return_inverse:
+        return centroids
+    point_inverse = np.concatenate(
+        [
+            np.searchsorted(keys, chunk_keys(points[start : start + chunk_size]))
+            for start in range(0, len(points), chunk_size)
+        ]
+    )
+    return centroids, point_inverse
+
+
+# end def
+def estimate_normals(
+    points: ArrayLike,
+    k=16,
+    index: PointCloudIndex | None = None,
+    viewpoint: Point | None = None,
+    batch_size=65536,
+) -> NDArray[np.float64]:
+    """用 k 近邻的主成分分析估计每个点的法向 (邻域协方差矩阵最小特征值对应的特征向量)
+
+    Parameters
+    ----------
+    `points` : ArrayLike
+        (N,3) 的点
+    `k` : int, 可选
+        邻域点数 (包括点本身)，默认值：16
+    `index` : PointCloudIndex | None, 可选
+        `points` 的索引 (已建好时复用)，默认值：None (新建)
+    `viewpoint` : Point | None, 可选
+        视点 (例如扫描仪位置)，给定时法向统一朝向视点，默认值：None (方向不确定)
+    `batch_size` : int, 可选
+        每批处理的点数，中间数组约为 batch_size*k*3，默认值：65536
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3) 的单位法向
+    """
+    points = np.asarray(points, dtype=np.float64)
+    normals = np.zeros((len(points), 3))
+    if len(points) == 0:
+        return normals
+    if index is None:
+        index = PointCloudIndex(points)
+    k = min(k, len(index))
+    for start in range(0, len(points), batch_size):
+        batch = points[start : start + batch_size]
+        _, neighbour_ids = index.query_knn(batch, k, batch_size=batch_size)
+        neighbours = index.points[neighbour_ids]
+        centered = neighbours - neighbours.mean(axis=1, keepdims=True)
+        covariances = np.einsum("bki,bkj->bij", centered, centered) / k
+        # eigh 的特征值按升序排列，第一列即最小特征值的特征向量
+        normals[start : start + len(batch)] = np.linalg.eigh(covariances)[1][:, :, 0]
+    # end for
+    if viewpoint is not None:
+        flip = np.einsum("ij,ij->i", normals, np.asarray(viewpoint, dtype=np.float64) - points) < 0
+        normals[flip] *= -1
+    return normals
+
+
+# end def
@@ -0,0 +1,305 @@
+"""
+旋转的批量计算 (四元数、旋转矩阵、欧拉角)
+四元数的格式与 basicGeometricTyping.Quaternion 一致，为 [x,y,z,w]；欧拉角的约定与 OCCT gp_Quaternion 一致
+Author: ICO
+Date: 2026-10-18"""
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+def rotation_matrices_to_quaternions(
+    matrices: ArrayLike, out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """旋转矩阵转为单位四元数
+
+    分支选择与 gp_Quaternion::SetMatrix 相同 (迹为正时 w 为正，否则对角线最大的分量为正)，
+    因此结果与 gp_Trsf.GetRotation() 的符号一致
+
+    Parameters
+    ----------
+    `matrices` : ArrayLike
+        (N,3,3) 或 (3,3) 的旋转矩阵
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,4) 数组，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,4) 或 (4,) 的四元数 [x,y,z,w]
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    single = matrices.ndim == 2
+    m = matrices.reshape(-1, 3, 3)
+    m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+    m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+    m20, m21, m22 = m[:, 2, 0], m[:, 2, 1], m[:, 2, 2]
+    trace = m00 + m11 + m22
+    # 四种分支下未归一化的四元数，最大分量为 "范数的平方 * 4"
+    candidates = np.stack(
+        (
+            np.stack((m21 - m12, m02 - m20, m10 - m01, trace + 1.0), axis=-1),
+            np.stack((1.0 + m00 - m11 - m22, m01 + m10, m02 + m20, m21 - m12), axis=-1),
+            np.stack((m01 + m10, 1.0 + m11 - m00 - m22, m12 + m21, m02 - m20), axis=-1),
+            np.stack((m02 + m20, m12 + m21, 1.0 + m22 - m00 - m11, m10 - m01), axis=-1),
+        ),
+        axis=1,
+    )
+    branch = np.where(trace > 0.0, 0, np.where((m00 > m11) & (m00 > m22), 1, np.where(m11 > m22, 2, 3)))
+    rows = np.arange(len(m))
+    quaternions = candidates[rows, branch]
+    # 最大分量在各分支中的位置：w, x, y, z
+    biggest = quaternions[rows, np.array([3, 0, 1, 2])[branch]]
+    if out is None:
+        out = np.empty((len(m), 4), dtype=np.float64)
+    np.multiply(quaternions, (0.5 / np.sqrt(biggest))[:, None], out=out)
+    return out[0] if single else out
+
+
+# end def
+def quaternions_to_rotation_matrices(
+    quaternions: ArrayLike, out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """四元数转为旋转矩阵 (输入会先归一化)
+
+    Parameters
+    ----------
+    `quaternions` : ArrayLike
+        (N,4) 或 (4,) 的四元数 [x,y,z,w]
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,3,3) 数组，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3,3) 或 (3,3) 的旋转矩阵
+    """
+    quaternions = np.asarray(quaternions, dtype=np.float64)
+    single = quaternions.ndim == 1
+    q = quaternions.reshape(-1, 4)
+    q = q / np.linalg.norm(q, axis=1, keepdims=True)
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    if out is None:
+        out = np.empty((len(q), 3, 3), dtype=np.float64)
+    out[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    out[:, 0, 1] = 2 * (x * y - z * w)
+    out[:, 0, 2] = 2 * (x * z + y * w)
+    out[:, 1, 0] = 2 * (x * y + z * w)
+    out[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    out[:, 1, 2] = 2 * (y * z - x * w)
+    out[:, 2, 0] = 2 * (x * z - y * w)
+    out[:, 2, 1] = 2 * (y * z + x * w)
+    out[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return out[0] if single else out
+
+
+# end def
+class EulerSequence(NamedTuple):
+    """欧拉角序列的参数 (与 OCCT gp_Quaternion 中的 gp_EulerSequence_Parameters 相同，序号从 0 开始)"""
+
+    i: int
+    """第一个旋转轴"""
+    j: int
+    k: int
+    is_odd: bool
+    """轴的顺序是否为奇置换 (例如 x-z-y)"""
+    is_two_axes: bool
+    """是否为只涉及两个轴的经典欧拉角 (例如 z-x-z)"""
+    is_extrinsic: bool
+    """是否为绕固定轴旋转 (外旋)"""
+
+
+# end class
+def _euler_sequence(axis: int, is_odd: bool, is_two_axes: bool, is_extrinsic: bool) -> EulerSequence:
+    return EulerSequence(
+        axis, (axis + 1 + is_odd) % 3, (axis + 2 - is_odd) % 3, is_odd, is_two_axes, is_extrinsic
+    )
+
+
+# end def
+# 名称与 dataExchange.gp.gp_Quaternion_as_euler 一致："s" 为外旋 (gp_Extrinsic_*)，"r" 为内旋 (gp_Intrinsic_*)；
+# 内旋按 "相同角度、相反轴顺序的外旋" 计算，因此参数中的轴顺序是反过来的
+EULER_SEQUENCES: dict[str, EulerSequence] = {
+    "sxyz": _euler_sequence(0, False, False, True),
+    "sxzy": _euler_sequence(0, True, False, True),
+    "syzx": _euler_sequence(1, False, False, True),
+    "syxz": _euler_sequence(1, True, False, True),
+    "szxy": _euler_sequence(2, False, False, True),
+    "szyx": _euler_sequence(2, True, False, True),
+    "rxyz": _euler_sequence(2, True, False, False),
+    "rxzy": _euler_sequence(1, False, False, False),
+    "ryzx": _euler_sequence(0, True, False, False),
+    "ryxz": _euler_sequence(2, False, False, False),
+    "rzxy": _euler_sequence(1, True, False, False),
+    "rzyx": _euler_sequence(0, False, False, False),
+    "sxyx": _euler_sequence(0, False, True, True),
+    "sxzx": _euler_sequence(0, True, True, True),
+    "syzy": _euler_sequence(1, False, True, True),
+    "syxy": _euler_sequence(1, True, True, True),
+    "szxz": _euler_sequence(2, False, True, True),
+    "szyz": _euler_sequence(2, True, True, True),
+    "rxyx": _euler_sequence(0, False, True, False),
+    "rxzx": _euler_sequence(0, True, True, False),
+    "ryzy": _euler_sequence(1, False, True, False),
+    "ryxy": _euler_sequence(1, True, True, False),
+    "rzxz": _euler_sequence(2, False, True, False),
+    "rzyz": _euler_sequence(2, True, True, False),
+}
+"""欧拉角序列表 (预先计算，按名称查找)"""
+EULER_SEQUENCES["euler"] = EULER_SEQUENCES["rzxz"]
+EULER_SEQUENCES["ypr"] = EULER_SEQUENCES["rzyx"]
+
+# 万向节锁的判断阈值 (与 OCCT 相同)
+_GIMBAL_LOCK_EPSILON = 16 * np.finfo(np.float64).eps
+
+
+def _get_euler_sequence(sequence: str) -> EulerSequence:
+    try:
+        return EULER_SEQUENCES[sequence]
+    except KeyError:
+        raise ValueError(f"不支持的欧拉角序列：{sequence}") from None
+
+
+# end def
+def rotation_matrices_to_euler(
+    matrices: ArrayLike, sequence="euler", out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """旋转矩阵转为欧拉角，结果与 gp_Quaternion.GetEulerAngles 相同 (包括万向节锁时的处理)
+
+    Parameters
+    ----------
+    `matrices` : ArrayLike
+        (N,3,3) 或 (3,3) 的旋转矩阵
+    `sequence` : str, 可选
+        欧拉角序列，EULER_SEQUENCES 中的名称，默认值："euler" (内旋 z-x-z)
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,3) 数组，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3) 或 (3,) 的欧拉角 [alpha, beta, gamma] (弧度)
+    """
+    i, j, k, is_odd, is_two_axes, is_extrinsic = _get_euler_sequence(sequence)
+    matrices = np.asarray(matrices, dtype=np.float64)
+    single = matrices.ndim == 2
+    m = matrices.reshape(-1, 3, 3)
+    if is_two_axes:
+        radius = np.hypot(m[:, i, j], m[:, i, k])
+        alpha = np.arctan2(m[:, i, j], m[:, i, k])
+        gamma = np.arctan2(m[:, j, i], -m[:, k, i])
+        beta = np.arctan2(radius, m[:, i, i])
+    else:
+        radius = np.hypot(m[:, i, i], m[:, j, i])
+        alpha = np.arctan2(m[:, k, j], m[:, k, k])
+        gamma = np.arctan2(m[:, j, i], m[:, i, i])
+        beta = np.arctan2(-m[:, k, i], radius)
+    # 万向节锁：第三个角取 0
+    locked = radius <= _GIMBAL_LOCK_EPSILON
+    alpha = np.where(locked, np.arctan2(-m[:, j, k], m[:, j, j]), alpha)
+    gamma = np.where(locked, 0.0, gamma)
+    if out is None:
+        out = np.empty((len(m), 3), dtype=np.float64)
+    out[:, 0], out[:, 1], out[:, 2] = (alpha, beta, gamma) if is_extrinsic else (gamma, beta, alpha)
+    if is_odd:
+        np.negative(out, out=out)
+    return out[0] if single else out
+
+
+# end def
+def quaternions_to_euler(
+    quaternions: ArrayLike, sequence="euler", out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """四元数转为欧拉角，结果与 gp_Quaternion.GetEulerAngles 相同
+
+    Parameters
+    ----------
+    `quaternions` : ArrayLike
+        (N,4) 或 (4,) 的四元数 [x,y,z,w]
+    `sequence` : str, 可选
+        欧拉角序列，EULER_SEQUENCES 中的名称，默认值："euler" (内旋 z-x-z)
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,3) 数组，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3) 或 (3,) 的欧拉角 [alpha, beta, gamma] (弧度)
+    """
+    return rotation_matrices_to_euler(quaternions_to_rotation_matrices(quaternions), sequence, out)
+
+
+# end def
+def euler_to_quaternions(
+    angles: ArrayLike, sequence="euler", out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """欧拉角转为单位四元数，结果与 gp_Quaternion.SetEulerAngles 相同
+
+    Parameters
+    ----------
+    `angles` : ArrayLike
+        (N,3) 或 (3,) 的欧拉角 [alpha, beta, gamma] (弧度)
+    `sequence` : str, 可选
+        欧拉角序列，EULER_SEQUENCES 中的名称，默认值："euler" (内旋 z-x-z)
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,4) 数组，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,4) 或 (4,) 的四元数 [x,y,z,w]
+    """
+    i, j, k, is_odd, is_two_axes, is_extrinsic = _get_euler_sequence(sequence)
+    angles = np.asarray(angles, dtype=np.float64)
+    single = angles.ndim == 1
+    a = angles.reshape(-1, 3)
+    first, second, third = (a[:, 0], a[:, 1], a[:, 2]) if is_extrinsic else (a[:, 2], a[:, 1], a[:, 0])
+    if is_odd:
+        second = -second
+    ci, si = np.cos(0.5 * first), np.sin(0.5 * first)
+    cj, sj = np.cos(0.5 * second), np.sin(0.5 * second)
+    ch, sh = np.cos(0.5 * third), np.sin(0.5 * third)
+    cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+    if out is None:
+        out = np.empty((len(a), 4), dtype=np.float64)
+    if is_two_axes:
+        out[:, i] = cj * (cs + sc)
+        out[:, j] = sj * (cc + ss)
+        out[:, k] = sj * (cs - sc)
+        out[:, 3] = cj * (cc - ss)
+    else:
+        out[:, i] = cj * sc - sj * cs
+        out[:, j] = cj * ss + sj * cc
+        out[:, k] = cj * cs - sj * sc
+        out[:, 3] = cj * cc + sj * ss
+    if is_odd:
+        np.negative(out[:, j], out=out[:, j])
+    return out[0] if single else out
+
+
+# end def
+def euler_to_rotation_matrices(
+    angles: ArrayLike, sequence="euler", out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """欧拉角转为旋转矩阵
+
+    Parameters
+    ----------
+    `angles` : ArrayLike
+        (N,3) 或 (3,) 的欧拉角 [alpha, beta, gamma] (弧度)
+    `sequence` : str, 可选
+        欧拉角序列，EULER_SEQUENCES 中的名称，默认值："euler" (内旋 z-x-z)
+    `out` : NDArray[np.float64] | None, 可选
+        写入结果的 (N,3,3) 数组，默认值：None (新建数组)
+
+    Returns
+    -------
+    NDArray[np.float64]
+        (N,3,3) 或 (3,3) 的旋转矩阵
+    """
+    return quaternions_to_rotation_matrices(euler_to_quaternions(angles, sequence), out)
+
+
+# end def
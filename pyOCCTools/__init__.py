@@ -1,5 +1,16 @@
-from ..dataExchange.readStep import read_step
+from dataExchange.readStep import read_step
+from .collision import (
+    ClearanceResult,
+    CollisionScene,
+    CollisionSession,
+    ais_clearance_calculator,
+    ais_collision_calculator,
+    batch_collision,
+    first_collision_on_trajectory,
+    get_ais_bounding_box,
+)
 from .coordinateTransformation import change_ref_coord
 from .geometric.information.edge import get_two_points
 from .geometric.information.face import get_face_center, get_face_normal
 from .geometric.makeFace import make_face_from_points
+from .meshCache import MeshCache, default_mesh_cache
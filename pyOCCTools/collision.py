@@ -2,14 +2,42 @@
 干涉检测
 Author: ICO
 Date: 2024-01-21"""
+import math
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+import numpy as np
+
 # logger
 from loguru import logger
 
 # pyOCC
 from OCC.Core.AIS import AIS_Shape
-from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
-from OCC.Core.BRepExtrema import BRepExtrema_ShapeProximity
-from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.Bnd import Bnd_Box
+from OCC.Core.BRep import BRep_Builder, BRep_Tool
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakeVertex, BRepBuilderAPI_Transform
+from OCC.Core.BRepClass3d import BRepClass3d_SolidClassifier
+from OCC.Core.BRepBndLib import brepbndlib
+from OCC.Core.BRepExtrema import (
+    BRepExtrema_DistShapeShape,
+    BRepExtrema_OverlapTool,
+    BRepExtrema_ShapeList,
+    BRepExtrema_ShapeProximity,
+    BRepExtrema_TriangleSet,
+)
+from OCC.Core.gp import gp_Pnt, gp_Quaternion, gp_QuaternionSLerp, gp_Trsf, gp_Vec
+from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_FORWARD, TopAbs_IN
+from OCC.Core.TopExp import TopExp_Explorer
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.TopoDS import TopoDS_Compound, TopoDS_Shape, topods
+
+# local
+from dataExchange.brepBinary import shape_from_bytes, shape_to_bytes
+from dataExchange.gp.Trsf import transform_matrices_as_gp_Trsfs
+from mathTools.aabbTree import AABBTree
+
+from .meshCache import MeshCache, default_mesh_cache
 
 """
 BRepMesh_IncrementalMesh
@@ -46,7 +74,121 @@ None
 """
 
 
-def ais_collision_calculator(ais_a: AIS_Shape, ais_b: AIS_Shape, get_collision_a=True, get_collision_b=True):
+def _placed_shape(shape: TopoDS_Shape, trsf: gp_Trsf) -> TopoDS_Shape:
+    """把形状放到位姿 `trsf` 下
+
+    刚体变换 (旋转 + 平移) 用 TopLoc_Location 移动，与原形状共享 TShape，可以复用缓存的网格；
+    带缩放或镜像的变换不能作为 TopLoc_Location，改用 BRepBuilderAPI_Transform 生成变换后的副本 (网格一并变换)
+    """
+    # 与 TopoDS_Shape::Location 的检查相同 (超出 TopLoc_Location::ScalePrec 时 Moved 会抛出异常)
+    if trsf.IsNegative() or abs(abs(trsf.ScaleFactor()) - 1.0) > TopLoc_Location.ScalePrec():
+        return BRepBuilderAPI_Transform(shape, trsf, True, True).Shape()
+    return shape.Moved(TopLoc_Location(trsf))
+
+
+# end def
+def _collect_overlap_faces(checker: BRepExtrema_ShapeProximity, get_collision_a=True, get_collision_b=True):
+    """从已完成计算的 BRepExtrema_ShapeProximity 中取出 A、B 干涉碰撞的面"""
+    collision_face_a = []
+    collision_face_b = []
+    # 获取 shape_a 的碰撞部分
+    if get_collision_a:
+        for ind in checker.OverlapSubShapes1().Keys():
+            collision_face_a.append(checker.GetSubShape1(ind))
+    # 获取 shape_b 的碰撞部分
+    if get_collision_b:
+        for ind in checker.OverlapSubShapes2().Keys():
+            collision_face_b.append(checker.GetSubShape2(ind))
+    return collision_face_a, collision_face_b
+
+
+# end def
+def _face_list(shape: TopoDS_Shape) -> list[TopoDS_Shape]:
+    """按 TopExp_Explorer 的顺序列出面 (与 BRepExtrema_ShapeProximity 的面序号一致)"""
+    faces = []
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        faces.append(explorer.Current())
+        explorer.Next()
+    # end while
+    return faces
+
+
+# end def
+def _make_compound(shapes: list[TopoDS_Shape]) -> TopoDS_Compound:
+    compound = TopoDS_Compound()
+    builder = BRep_Builder()
+    builder.MakeCompound(compound)
+    for shape in shapes:
+        builder.Add(compound, shape)
+    return compound
+
+
+# end def
+def _lod_collision(
+    shape_a: TopoDS_Shape,
+    shape_b: TopoDS_Shape,
+    get_collision_a: bool,
+    get_collision_b: bool,
+    mesh_cache: MeshCache,
+    tolerance: float,
+    linear_deflection: float,
+    angular_deflection: float,
+    coarse_deflection: tuple[float, float],
+):
+    """分级干涉判断：包围盒 -> 粗网格 -> 只对粗网格标记的面生成精细网格"""
+    # 包围盒快速排除
+    box_a, box_b = Bnd_Box(), Bnd_Box()
+    brepbndlib.Add(shape_a, box_a, False)
+    brepbndlib.Add(shape_b, box_b, False)
+    box_a.Enlarge(tolerance)
+    if box_a.IsOut(box_b):
+        return None
+    # 粗网格：网格与曲面的偏差不超过线性偏差，因此放宽接近阈值以保证不漏检
+    coarse_linear, coarse_angular = coarse_deflection
+    coarse_a = mesh_cache.mesh(shape_a, coarse_linear, coarse_angular)
+    coarse_b = mesh_cache.mesh(shape_b, coarse_linear, coarse_angular)
+    checker = BRepExtrema_ShapeProximity(coarse_a, coarse_b, tolerance + 2 * coarse_linear)
+    checker.Perform()
+    if not checker.IsDone():
+        logger.warning(f"干涉判断失败")
+        return []
+    indices_a = sorted(checker.OverlapSubShapes1().Keys())
+    indices_b = sorted(checker.OverlapSubShapes2().Keys())
+    if not indices_a or not indices_b:
+        return None
+    # 只对标记的面生成精细网格 (在副本上生成，不覆盖整体形状上的粗网格)
+    faces_a, faces_b = _face_list(shape_a), _face_list(shape_b)
+    fine_a = [mesh_cache.mesh(faces_a[ind], linear_deflection, angular_deflection, copy=True) for ind in indices_a]
+    fine_b = [mesh_cache.mesh(faces_b[ind], linear_deflection, angular_deflection, copy=True) for ind in indices_b]
+    checker = BRepExtrema_ShapeProximity(_make_compound(fine_a), _make_compound(fine_b), tolerance)
+    checker.Perform()
+    if not checker.IsDone():
+        logger.warning(f"干涉判断失败")
+        return []
+    # 精细网格的面序号对应到原形状的面
+    collision_face_a = []
+    collision_face_b = []
+    if get_collision_a:
+        collision_face_a = [faces_a[indices_a[ind]] for ind in checker.OverlapSubShapes1().Keys()]
+    if get_collision_b:
+        collision_face_b = [faces_b[indices_b[ind]] for ind in checker.OverlapSubShapes2().Keys()]
+    if collision_face_a or collision_face_b:
+        return [*collision_face_a, *collision_face_b]
+
+
+# end def
+def ais_collision_calculator(
+    ais_a: AIS_Shape,
+    ais_b: AIS_Shape,
+    get_collision_a=True,
+    get_collision_b=True,
+    mesh_cache: MeshCache | None = None,
+    tolerance=0.1,
+    linear_deflection=1.0,
+    angular_deflection=0.5,
+    coarse_deflection: tuple[float, float] | None = None,
+):
     """利用 AIS 对象进行干涉判断
 
     Parameters
@@ -59,47 +201,48 @@ def ais_collision_calculator(ais_a: AIS_Shape, ais_b: AIS_Shape, get_collision_a
         是否返回 A 中干涉碰撞的面，默认值：True
     `get_collision_b` : bool, 可选
         是否返回 B 中干涉碰撞的面，默认值：True
+    `mesh_cache` : MeshCache | None, 可选
+        网格缓存，默认值：None (使用 default_mesh_cache)
+    `tolerance` : float, 可选
+        接近阈值，默认值：0.1
+    `linear_deflection` : float, 可选
+        网格的线性偏差，默认值：1.0
+    `angular_deflection` : float, 可选
+        网格的角度偏差，默认值：0.5
+    `coarse_deflection` : tuple[float, float] | None, 可选
+        粗网格的 (线性偏差, 角度偏差)，给定时启用分级检测：
+        先用包围盒和粗网格排除，只对粗网格标记的面按精细偏差重新生成网格，默认值：None
 
     Returns
     -------
     _type_
         发生了干涉碰撞的面（包含 A 和 B 的结果）
     """
-    # 获取 AIS 对象的 TopoDS
-    shape_a = ais_a.Shape()
-    shape_b = ais_b.Shape()
-    # 获取 AIS 对象的 Trsf
-    trsf_a = ais_a.Transformation()
-    trsf_b = ais_b.Transformation()
-    # 移动原有的 shape
-    shape_a = BRepBuilderAPI_Transform(shape_a, trsf_a).Shape()
-    shape_b = BRepBuilderAPI_Transform(shape_b, trsf_b).Shape()
-    # 生成网格
-    mesh_a = BRepMesh_IncrementalMesh(shape_a, 1, False, 0.5, False)
-    # mesh_a.Perform() #会自动调用 Perform()
-    mesh_b = BRepMesh_IncrementalMesh(shape_b, 1, False, 0.5, False)
-    # mesh_b.Perform() #会自动调用 Perform()
+    if mesh_cache is None:
+        mesh_cache = default_mesh_cache
+    # 刚体变换用 TopLoc_Location 移动原有的 shape (与原 shape 共享 TShape，可以复用缓存的网格)
+    shape_a = _placed_shape(ais_a.Shape(), ais_a.Transformation())
+    shape_b = _placed_shape(ais_b.Shape(), ais_b.Transformation())
+    if coarse_deflection is not None:
+        return _lod_collision(
+            shape_a,
+            shape_b,
+            get_collision_a,
+            get_collision_b,
+            mesh_cache,
+            tolerance,
+            linear_deflection,
+            angular_deflection,
+            coarse_deflection,
+        )
+    # 生成网格 (命中缓存时不再重新生成)
+    shape_a = mesh_cache.mesh(shape_a, linear_deflection, angular_deflection)
+    shape_b = mesh_cache.mesh(shape_b, linear_deflection, angular_deflection)
     # 碰撞检查
-    checker = BRepExtrema_ShapeProximity(shape_a, shape_b, 0.1)
+    checker = BRepExtrema_ShapeProximity(shape_a, shape_b, tolerance)
     checker.Perform()  # 需要手动调用 Perform()
     if checker.IsDone():
-        # 获取 shape_a 的碰撞部分
-        if get_collision_a:
-            overlaps1 = checker.OverlapSubShapes1()
-            face_indices1 = overlaps1.Keys()
-            collision_face_a = []
-            for ind in face_indices1:
-                face = checker.GetSubShape1(ind)
-                collision_face_a.append(face)
-
-        # 获取 shape_b 的碰撞部分
-        if get_collision_b:
-            overlaps2 = checker.OverlapSubShapes2()
-            face_indices2 = overlaps2.Keys()
-            collision_face_b = []
-            for ind in face_indices2:
-                face = checker.GetSubShape2(ind)
-                collision_face_b.append(face)
+        collision_face_a, collision_face_b = _collect_overlap_faces(checker, get_collision_a, get_collision_b)
         # 返回发生干涉的面
         if collision_face_a or collision_face_b:
             return [*collision_face_a, *collision_face_b]
@@ -108,6 +251,713 @@ def ais_collision_calculator(ais_a: AIS_Shape, ais_b: AIS_Shape, get_collision_a
         return []
 
 
+# end def
+class ClearanceResult(NamedTuple):
+    """间隙查询结果"""
+
+    distance: float
+    """最小距离；启用穿透深度估计且发生穿透时为负值 (其绝对值为穿透深度的估计)"""
+    point_a: gp_Pnt | None
+    """A 上的见证点"""
+    point_b: gp_Pnt | None
+    """B 上的见证点"""
+    collision_faces: list[TopoDS_Shape]
+    """发生了干涉碰撞的面 (包含 A 和 B 的结果)"""
+    exact: bool
+    """为 False 时表示距离超过阈值而提前结束，distance 只是包围盒给出的距离下界"""
+
+
+def _mesh_nodes(shape: TopoDS_Shape, max_samples: int) -> list[gp_Pnt]:
+    """形状三角网格的节点 (世界坐标)，节点过多时等间隔抽样"""
+    nodes = []
+    for face in _face_list(shape):
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation(topods.Face(face), location)
+        if triangulation is None:
+            continue
+        trsf = location.Transformation()
+        for i in range(1, triangulation.NbNodes() + 1):
+            nodes.append(triangulation.Node(i).Transformed(trsf))
+    # end for
+    step = max(len(nodes) // max_samples, 1)
+    return nodes[::step]
+
+
+# end def
+def _deepest_point(shape_in: TopoDS_Shape, shape_out: TopoDS_Shape, max_samples: int):
+    """在 shape_in 的网格节点中找到位于 shape_out 内部且离其边界最远的点
+
+    Returns
+    -------
+    tuple[float, gp_Pnt | None, gp_Pnt | None]
+        穿透深度，shape_in 上的点，shape_out 边界上的对应点
+    """
+    boundary_tool = BRepExtrema_DistShapeShape()
+    boundary_tool.LoadS1(_make_compound(_face_list(shape_out)))
+    classifier = BRepClass3d_SolidClassifier(shape_out)
+    depth, point_in, point_out = 0.0, None, None
+    for node in _mesh_nodes(shape_in, max_samples):
+        classifier.Perform(node, 1e-7)
+        if classifier.State() != TopAbs_IN:
+            continue
+        boundary_tool.LoadS2(BRepBuilderAPI_MakeVertex(node).Vertex())
+        boundary_tool.Perform()
+        if boundary_tool.IsDone() and boundary_tool.Value() > depth:
+            depth, point_in, point_out = boundary_tool.Value(), node, boundary_tool.PointOnShape1(1)
+    # end for
+    return depth, point_in, point_out
+
+
+# end def
+def ais_clearance_calculator(
+    ais_a: AIS_Shape,
+    ais_b: AIS_Shape,
+    threshold=math.inf,
+    tolerance=0.1,
+    linear_deflection=1.0,
+    angular_deflection=0.5,
+    penetration=False,
+    max_samples=2000,
+    mesh_cache: MeshCache | None = None,
+) -> ClearanceResult:
+    """利用 AIS 对象查询最小距离、见证点和干涉面 (一次查询同时回答“是否干涉”和“相距多远”)
+
+    两物体 (精确几何) 包围盒的距离超过 `threshold` 时直接返回，不生成网格，也不进行精确的距离计算。
+
+    Parameters
+    ----------
+    `ais_a` : AIS_Shape
+        对象 A
+    `ais_b` : AIS_Shape
+        对象 B
+    `threshold` : float, 可选
+        关心的最大距离，默认值：math.inf
+    `tolerance` : float, 可选
+        干涉面的接近阈值，默认值：0.1
+    `linear_deflection` : float, 可选
+        网格的线性偏差，默认值：1.0
+    `angular_deflection` : float, 可选
+        网格的角度偏差，默认值：0.5
+    `penetration` : bool, 可选
+        两物体相交时是否估计穿透深度 (对抽样的网格节点逐个求精确距离，最多 2*`max_samples` 次，
+        耗时可达秒级，不适合高频的间隙监测)，默认值：False (相交时 distance 为 0)
+    `max_samples` : int, 可选
+        估计穿透深度时每个物体最多抽样的网格节点数，默认值：2000
+    `mesh_cache` : MeshCache | None, 可选
+        网格缓存，默认值：None (使用 default_mesh_cache)
+
+    Returns
+    -------
+    ClearanceResult
+    """
+    if mesh_cache is None:
+        mesh_cache = default_mesh_cache
+    shape_a = _placed_shape(ais_a.Shape(), ais_a.Transformation())
+    shape_b = _placed_shape(ais_b.Shape(), ais_b.Transformation())
+    # 精确几何的包围盒距离是最小距离的下界，超过阈值时在生成网格之前结束
+    box_a, box_b = Bnd_Box(), Bnd_Box()
+    brepbndlib.Add(shape_a, box_a, False)
+    brepbndlib.Add(shape_b, box_b, False)
+    box_distance = box_a.Distance(box_b)
+    if box_distance > threshold:
+        return ClearanceResult(box_distance, None, None, [], False)
+    shape_a = mesh_cache.mesh(shape_a, linear_deflection, angular_deflection)
+    shape_b = mesh_cache.mesh(shape_b, linear_deflection, angular_deflection)
+    # 干涉面
+    collision_faces = []
+    checker = BRepExtrema_ShapeProximity(shape_a, shape_b, tolerance)
+    checker.Perform()
+    if checker.IsDone():
+        collision_face_a, collision_face_b = _collect_overlap_faces(checker)
+        collision_faces = [*collision_face_a, *collision_face_b]
+    else:
+        logger.warning(f"干涉判断失败")
+    # 最小距离和见证点
+    distance_tool = BRepExtrema_DistShapeShape(shape_a, shape_b)
+    if not distance_tool.IsDone():
+        logger.warning(f"距离计算失败")
+        return ClearanceResult(box_distance, None, None, collision_faces, False)
+    distance = distance_tool.Value()
+    point_a, point_b = distance_tool.PointOnShape1(1), distance_tool.PointOnShape2(1)
+    if penetration and distance <= 1e-7:
+        depth_a, point_in_a, point_on_b = _deepest_point(shape_a, shape_b, max_samples)
+        depth_b, point_in_b, point_on_a = _deepest_point(shape_b, shape_a, max_samples)
+        if depth_a >= depth_b and point_in_a is not None:
+            distance, point_a, point_b = -depth_a, point_in_a, point_on_b
+        elif point_in_b is not None:
+            distance, point_a, point_b = -depth_b, point_on_a, point_in_b
+    return ClearanceResult(distance, point_a, point_b, collision_faces, True)
+
+
+# end def
+def get_ais_bounding_box(ais: AIS_Shape, gap=0.0) -> Bnd_Box:
+    """获取 AIS 对象在其 Transformation() 下的包围盒
+
+    Parameters
+    ----------
+    `ais` : AIS_Shape
+    `gap` : float, 可选
+        包围盒的外扩距离，默认值：0.0
+
+    Returns
+    -------
+    Bnd_Box
+        世界坐标系下的轴对齐包围盒
+    """
+    box = Bnd_Box()
+    brepbndlib.Add(ais.Shape(), box, True)
+    box = box.Transformed(ais.Transformation())
+    if gap > 0:
+        box.Enlarge(gap)
+    return box
+
+
+# end def
+class CollisionScene:
+    """
+    场景级干涉检测
+    先用包围盒树 (AABB Tree) 筛选包围盒重叠的候选对，只对候选对调用 `ais_collision_calculator`
+    """
+
+    def __init__(self, ais_shapes: list[AIS_Shape], gap=0.1, leaf_size=4):
+        """
+        Parameters
+        ----------
+        `ais_shapes` : list[AIS_Shape]
+            场景中的 AIS 对象
+        `gap` : float, 可选
+            包围盒外扩距离，应不小于精检测的接近阈值，默认值：0.1
+        `leaf_size` : int, 可选
+            包围盒树叶子节点包含的最大对象数量，默认值：4
+        """
+        self.ais_shapes = list(ais_shapes)
+        self.gap = gap
+        self.leaf_size = leaf_size
+        # 局部包围盒只与形状有关，位姿变化时只需要重新变换
+        self._local_boxes: list[Bnd_Box] = []
+        for ais in self.ais_shapes:
+            box = Bnd_Box()
+            brepbndlib.Add(ais.Shape(), box, True)
+            self._local_boxes.append(box)
+        self.update()
+
+    # end alternate constructor
+
+    def update(self):
+        """根据各 AIS 对象当前的 Transformation() 重建包围盒树"""
+        bounds = np.empty((len(self.ais_shapes), 6))
+        for i, (ais, local_box) in enumerate(zip(self.ais_shapes, self._local_boxes)):
+            if local_box.IsVoid():
+                # 空形状不参与检测
+                bounds[i] = (np.inf, np.inf, np.inf, -np.inf, -np.inf, -np.inf)
+                continue
+            box = local_box.Transformed(ais.Transformation())
+            if self.gap > 0:
+                box.Enlarge(self.gap)
+            bounds[i] = box.Get()
+        self.tree = AABBTree(bounds, self.leaf_size)
+
+    def candidate_pairs(self) -> list[tuple[int, int]]:
+        """包围盒重叠的候选对象对
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            对象在 `ais_shapes` 中的索引对
+        """
+        return [(int(i), int(j)) for i, j in self.tree.query_pairs()]
+
+    def perform(
+        self,
+        update=True,
+        tolerance=0.1,
+        linear_deflection=1.0,
+        angular_deflection=0.5,
+        coarse_deflection: tuple[float, float] | None = None,
+        mesh_cache: MeshCache | None = None,
+    ) -> dict[tuple[int, int], list[TopoDS_Shape]]:
+        """对候选对象对进行干涉判断
+
+        Parameters
+        ----------
+        `update` : bool, 可选
+            是否先按当前位姿更新包围盒树，默认值：True
+        `tolerance` : float, 可选
+            接近阈值，应不大于包围盒外扩距离 `gap`，默认值：0.1
+        `linear_deflection` : float, 可选
+            网格的线性偏差，默认值：1.0
+        `angular_deflection` : float, 可选
+            网格的角度偏差，默认值：0.5
+        `coarse_deflection` : tuple[float, float] | None, 可选
+            粗网格的 (线性偏差, 角度偏差)，给定时启用分级检测，默认值：None
+        `mesh_cache` : MeshCache | None, 可选
+            网格缓存，默认值：None (使用 default_mesh_cache)
+
+        Returns
+        -------
+        dict[tuple[int, int], list[TopoDS_Shape]]
+            发生干涉的对象索引对及其干涉面
+        """
+        if tolerance > self.gap:
+            logger.warning(f"接近阈值 {tolerance} 大于包围盒外扩距离 {self.gap}，可能漏检")
+        if update:
+            self.update()
+        collisions = {}
+        for i, j in self.candidate_pairs():
+            faces = ais_collision_calculator(
+                self.ais_shapes[i],
+                self.ais_shapes[j],
+                mesh_cache=mesh_cache,
+                tolerance=tolerance,
+                linear_deflection=linear_deflection,
+                angular_deflection=angular_deflection,
+                coarse_deflection=coarse_deflection,
+            )
+            if faces:
+                collisions[(i, j)] = faces
+        return collisions
+
+
+# end class
+def _trsf_values(trsf: gp_Trsf) -> tuple[float, ...]:
+    """gp_Trsf 的 3*4 矩阵元素，用于判断位姿是否变化"""
+    return tuple(trsf.Value(row, col) for row in (1, 2, 3) for col in (1, 2, 3, 4))
+
+
+# end def
+class _SessionBody:
+    def __init__(self, shape: TopoDS_Shape, trsf: gp_Trsf, ais: AIS_Shape | None):
+        self.shape = shape
+        """带有三角网格的原始形状"""
+        self.ais = ais
+        self.local_box = Bnd_Box()
+        brepbndlib.Add(shape, self.local_box, True)
+        self.version = 0
+        self.set_pose(trsf)
+
+    def set_pose(self, trsf: gp_Trsf):
+        self.trsf = gp_Trsf(trsf)
+        self.trsf_values = _trsf_values(trsf)
+        self.placed = _placed_shape(self.shape, self.trsf)
+        self.box = self.local_box.Transformed(self.trsf)
+        self.faces = _face_list(self.placed)
+        self._triangle_set: BRepExtrema_TriangleSet | None = None
+        self.version += 1
+
+    def triangle_set(self) -> BRepExtrema_TriangleSet:
+        """当前位姿下的世界坐标三角形集合 (每个位姿只生成一次，由该物体参与的所有物体对共用)"""
+        if self._triangle_set is None:
+            shape_list = BRepExtrema_ShapeList()
+            for face in self.faces:
+                shape_list.Append(face)
+            self._triangle_set = BRepExtrema_TriangleSet(shape_list)
+        return self._triangle_set
+
+
+# end class
+class _SessionPair:
+    def __init__(self):
+        self.state = (-1, -1, None)
+        """上一次计算时两物体的位姿版本号和接近阈值"""
+        self.faces: list[TopoDS_Shape] = []
+
+
+# end class
+class CollisionSession:
+    """
+    增量干涉检测会话
+
+    每个物体的网格只生成一次；每个物体在每个位姿下只生成一个世界坐标的三角形集合 (BRepExtrema_TriangleSet，
+    包含三角形的复制和 BVH 的构建)，由该物体参与的所有物体对共用，物体对之间只运行 BRepExtrema_OverlapTool。
+    因此一帧的开销为 O(移动的物体数 * 三角形数) 的三角形集合重建加上候选对的重叠检测，
+    而不是每对物体各自复制一份三角形；OCCT 的三角形集合不支持只更新变换，移动的物体仍需重建其三角形集合。
+    未移动的物体对直接复用上一次的结果，包围盒分离的物体对不进入精检测，也不会为其生成三角形集合。
+    """
+
+    def __init__(
+        self,
+        tolerance=0.1,
+        linear_deflection=1.0,
+        angular_deflection=0.5,
+        mesh_cache: MeshCache | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        `tolerance` : float, 可选
+            接近阈值，默认值：0.1
+        `linear_deflection` : float, 可选
+            网格的线性偏差，默认值：1.0
+        `angular_deflection` : float, 可选
+            网格的角度偏差，默认值：0.5
+        `mesh_cache` : MeshCache | None, 可选
+            网格缓存，默认值：None (使用 default_mesh_cache)
+        """
+        self.tolerance = tolerance
+        self.linear_deflection = linear_deflection
+        self.angular_deflection = angular_deflection
+        self.mesh_cache = default_mesh_cache if mesh_cache is None else mesh_cache
+        self._bodies: dict = {}
+        self._pairs: dict[tuple, _SessionPair] = {}
+
+    # end alternate constructor
+
+    def add(self, body: AIS_Shape | TopoDS_Shape, key=None, trsf: gp_Trsf | None = None):
+        """添加物体
+
+        Parameters
+        ----------
+        `body` : AIS_Shape | TopoDS_Shape
+            AIS 对象 (位姿取自 Transformation()) 或形状
+        `key` : Hashable, 可选
+            物体的键，默认值：None (使用添加顺序的序号)
+        `trsf` : gp_Trsf | None, 可选
+            初始位姿，默认值：None (AIS 对象取 Transformation()，形状为单位变换)
+
+        Returns
+        -------
+        Hashable
+            物体的键
+        """
+        if key is None:
+            key = len(self._bodies)
+            while key in self._bodies:
+                key += 1
+        if key in self._bodies:
+            self.remove(key)
+        ais = body if isinstance(body, AIS_Shape) else None
+        shape = body.Shape() if ais is not None else body
+        if trsf is None:
+            trsf = ais.Transformation() if ais is not None else gp_Trsf()
+        shape = self.mesh_cache.mesh(shape, self.linear_deflection, self.angular_deflection)
+        self._bodies[key] = _SessionBody(shape, trsf, ais)
+        return key
+
+    def remove(self, key):
+        """移除物体及其相关的检测结果"""
+        del self._bodies[key]
+        for pair_key in [pair_key for pair_key in self._pairs if key in pair_key]:
+            del self._pairs[pair_key]
+
+    def set_pose(self, key, trsf: gp_Trsf):
+        """更新物体位姿 (位姿未变化时不会触发重新计算)"""
+        body = self._bodies[key]
+        if _trsf_values(trsf) != body.trsf_values:
+            body.set_pose(trsf)
+
+    def sync(self):
+        """从 AIS 对象的 Transformation() 同步所有物体的位姿"""
+        for key, body in self._bodies.items():
+            if body.ais is not None:
+                self.set_pose(key, body.ais.Transformation())
+
+    def check(self, sync=True) -> dict[tuple, list[TopoDS_Shape]]:
+        """干涉判断
+
+        Parameters
+        ----------
+        `sync` : bool, 可选
+            是否先从 AIS 对象同步位姿，默认值：True
+
+        Returns
+        -------
+        dict[tuple, list[TopoDS_Shape]]
+            发生干涉的物体键对及其干涉面 (包含 A 和 B 的结果)
+        """
+        if sync:
+            self.sync()
+        keys = list(self._bodies)
+        bounds = np.empty((len(keys), 6))
+        for i, key in enumerate(keys):
+            box = Bnd_Box()
+            box.Add(self._bodies[key].box)
+            box.Enlarge(self.tolerance)
+            bounds[i] = box.Get() if not box.IsVoid() else (np.inf, np.inf, np.inf, -np.inf, -np.inf, -np.inf)
+        collisions = {}
+        for i, j in AABBTree(bounds).query_pairs():
+            pair_key = (keys[i], keys[j])
+            faces = self._check_pair(pair_key)
+            if faces:
+                collisions[pair_key] = faces
+        return collisions
+
+    def _check_pair(self, pair_key: tuple) -> list[TopoDS_Shape]:
+        body_a, body_b = self._bodies[pair_key[0]], self._bodies[pair_key[1]]
+        pair = self._pairs.setdefault(pair_key, _SessionPair())
+        state = (body_a.version, body_b.version, self.tolerance)
+        if pair.state == state:
+            return pair.faces
+        # 三角形集合按物体缓存，这里只做重叠检测
+        checker = BRepExtrema_OverlapTool(body_a.triangle_set(), body_b.triangle_set())
+        checker.Perform(self.tolerance)
+        if checker.IsDone():
+            pair.faces = [
+                *(body_a.faces[ind] for ind in checker.OverlapSubShapes1().Keys()),
+                *(body_b.faces[ind] for ind in checker.OverlapSubShapes2().Keys()),
+            ]
+        else:
+            logger.warning(f"干涉判断失败：{pair_key}")
+            pair.faces = []
+        pair.state = state
+        return pair.faces
+
+
+# end class
+_worker_shapes: list[TopoDS_Shape] = []
+"""工作进程中常驻的 (已生成网格的) 形状"""
+
+
+def _init_collision_worker(shape_data: list[bytes], linear_deflection: float, angular_deflection: float):
+    """工作进程初始化：每个形状只反序列化并生成一次网格"""
+    global _worker_shapes
+    _worker_shapes = [
+        default_mesh_cache.mesh(shape_from_bytes(data), linear_deflection, angular_deflection) for data in shape_data
+    ]
+
+
+# end def
+def _trsf_from_values(values: tuple[float, ...]) -> gp_Trsf:
+    trsf = gp_Trsf()
+    trsf.SetValues(*values)
+    return trsf
+
+
+# end def
+def _collision_worker(jobs: list[tuple], tolerance: float) -> list[tuple[int, tuple[int, ...], tuple[int, ...]]]:
+    """工作进程：计算一批物体对的干涉面序号"""
+    results = []
+    for pair_index, shape_a_index, trsf_a, shape_b_index, trsf_b in jobs:
+        shape_a = _placed_shape(_worker_shapes[shape_a_index], _trsf_from_values(trsf_a))
+        shape_b = _placed_shape(_worker_shapes[shape_b_index], _trsf_from_values(trsf_b))
+        checker = BRepExtrema_ShapeProximity(shape_a, shape_b, tolerance)
+        checker.Perform()
+        if not checker.IsDone():
+            logger.warning(f"干涉判断失败：{pair_index}")
+            continue
+        face_indices_a = tuple(sorted(checker.OverlapSubShapes1().Keys()))
+        face_indices_b = tuple(sorted(checker.OverlapSubShapes2().Keys()))
+        if face_indices_a or face_indices_b:
+            results.append((pair_index, face_indices_a, face_indices_b))
+    return results
+
+
+# end def
+def batch_collision(
+    pairs: list[tuple[AIS_Shape, AIS_Shape]],
+    workers: int | None = None,
+    tolerance=0.1,
+    linear_deflection=1.0,
+    angular_deflection=0.5,
+    chunk_size=256,
+) -> Iterator[tuple[int, tuple[int, ...], tuple[int, ...]]]:
+    """使用进程池批量进行干涉判断
+
+    每个不同的形状只序列化一次 (二进制 BRep)，在工作进程初始化时反序列化并生成网格后常驻，
+    之后只向工作进程发送形状序号和位姿。结果在计算完成后逐批返回 (不保证顺序)。
+
+    Parameters
+    ----------
+    `pairs` : list[tuple[AIS_Shape, AIS_Shape]]
+        需要判断的 AIS 对象对
+    `workers` : int | None, 可选
+        工作进程数，默认值：None (CPU 核数)
+    `tolerance` : float, 可选
+        接近阈值，默认值：0.1
+    `linear_deflection` : float, 可选
+        网格的线性偏差，默认值：1.0
+    `angular_deflection` : float, 可选
+        网格的角度偏差，默认值：0.5
+    `chunk_size` : int, 可选
+        每次发送给工作进程的物体对数量，默认值：256
+
+    Yields
+    ------
+    tuple[int, tuple[int, ...], tuple[int, ...]]
+        发生干涉的物体对在 `pairs` 中的序号，A、B 干涉面的序号
+        (面在 TopExp_Explorer(shape, TopAbs_FACE) 遍历中的序号，从 0 开始)
+    """
+    # 按 TShape 去重，形状自身的位置合并到位姿中
+    buckets: dict[int, list[tuple[TopoDS_Shape, int]]] = {}
+    shape_data: list[bytes] = []
+
+    def _shape_job(ais: AIS_Shape) -> tuple[int, tuple[float, ...]]:
+        shape = ais.Shape()
+        base = shape.Located(TopLoc_Location()).Oriented(TopAbs_FORWARD)
+        bucket = buckets.setdefault(hash(base), [])
+        for known, index in bucket:
+            if known.IsPartner(base):
+                break
+        else:
+            index = len(shape_data)
+            shape_data.append(shape_to_bytes(base))
+            bucket.append((base, index))
+        trsf = ais.Transformation().Multiplied(shape.Location().Transformation())
+        return index, _trsf_values(trsf)
+
+    jobs = []
+    for pair_index, (ais_a, ais_b) in enumerate(pairs):
+        jobs.append((pair_index, *_shape_job(ais_a), *_shape_job(ais_b)))
+    if not jobs:
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_collision_worker,
+        initargs=(shape_data, linear_deflection, angular_deflection),
+    ) as executor:
+        pending = {
+            executor.submit(_collision_worker, jobs[start : start + chunk_size], tolerance)
+            for start in range(0, len(jobs), chunk_size)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        # end while
+
+
+# end def
+def _placed_body(body: AIS_Shape | TopoDS_Shape) -> TopoDS_Shape:
+    """物体的形状，AIS 对象会带上其 Transformation()"""
+    if isinstance(body, AIS_Shape):
+        return _placed_shape(body.Shape(), body.Transformation())
+    return body
+
+
+# end def
+class _TrajectoryMotion:
+    """
+    轨迹的连续插值：相邻位姿之间物体包围球球心线性移动、姿态球面线性插值 (slerp)，
+    并给出每段运动中物体上任意一点位移的上界
+    """
+
+    def __init__(self, trsfs: list[gp_Trsf], center: gp_Pnt, radius: float):
+        self.trsfs = trsfs
+        self.center = center
+        self.quaternions = [trsf.GetRotation() for trsf in trsfs]
+        self.centers = [center.Transformed(trsf) for trsf in trsfs]
+        # 第 k 段的位移上界：球心位移 + 半径 * 相对转角 (2r*sin(θ/2) <= rθ)
+        self.segment_bounds = []
+        for k in range(len(trsfs) - 1):
+            relative = self.quaternions[k].Inverted().Multiplied(self.quaternions[k + 1])
+            angle = abs(relative.GetRotationAngle())
+            angle = min(angle, 2 * math.pi - angle)
+            self.segment_bounds.append(self.centers[k].Distance(self.centers[k + 1]) + radius * angle)
+
+    def trsf(self, parameter: float) -> gp_Trsf:
+        """参数 `parameter` 处的位姿 (整数部分为段序号，小数部分为段内比例)"""
+        k = min(int(parameter), len(self.trsfs) - 1)
+        u = parameter - k
+        if u <= 0 or k == len(self.trsfs) - 1:
+            return self.trsfs[k]
+        quaternion = gp_Quaternion()
+        gp_QuaternionSLerp(self.quaternions[k], self.quaternions[k + 1]).Interpolate(u, quaternion)
+        trsf = gp_Trsf()
+        trsf.SetRotation(quaternion)
+        rotated_center = self.center.Transformed(trsf)
+        start, end = self.centers[k].XYZ(), self.centers[k + 1].XYZ()
+        moved_center = start.Added(end.Subtracted(start).Multiplied(u))
+        trsf.SetTranslationPart(gp_Vec(moved_center.Subtracted(rotated_center.XYZ())))
+        return trsf
+
+    def advance(self, parameter: float, clearance: float) -> float:
+        """从 `parameter` 出发，物体位移不超过 `clearance` 的最大参数 (保守推进)"""
+        k = int(parameter)
+        u = parameter - k
+        while k < len(self.segment_bounds):
+            bound = self.segment_bounds[k]
+            remaining = bound * (1 - u)
+            if remaining > clearance:
+                return k + u + clearance / bound
+            clearance -= remaining
+            k, u = k + 1, 0.0
+        # end while
+        return float(len(self.trsfs) - 1)
+
+
+# end class
+def first_collision_on_trajectory(
+    moving: AIS_Shape | TopoDS_Shape,
+    static: AIS_Shape | TopoDS_Shape,
+    trajectory: Sequence[gp_Trsf] | np.ndarray,
+    tolerance=0.1,
+    parameter_tolerance=1e-3,
+) -> float | None:
+    """沿采样轨迹的连续干涉检测，返回第一次发生干涉的轨迹参数
+
+    从当前参数处的最小距离出发做保守推进 (位移上界小于间隙的区间一定不会干涉)，
+    推进步长至少为 `parameter_tolerance` (即检测的参数分辨率)，
+    发现干涉后在最后一个无干涉参数和干涉参数之间二分细化。
+    距离在精确几何上计算 (不需要网格)，静止物体只加载一次。
+
+    Parameters
+    ----------
+    `moving` : AIS_Shape | TopoDS_Shape
+        运动物体 (AIS 对象的 Transformation() 会被轨迹位姿替代)
+    `static` : AIS_Shape | TopoDS_Shape
+        静止物体
+    `trajectory` : Sequence[gp_Trsf] | np.ndarray
+        运动物体的位姿序列，或 (N,4,4) 的齐次变换矩阵
+    `tolerance` : float, 可选
+        最小距离不大于该值即视为干涉，默认值：0.1
+    `parameter_tolerance` : float, 可选
+        参数分辨率 (以轨迹段为单位)：保守推进的最小步长和二分细化的精度，默认值：1e-3
+
+    Returns
+    -------
+    float | None
+        第一次干涉的参数 (整数部分为轨迹段序号，小数部分为段内比例)，全程无干涉则为 None
+    """
+    if isinstance(trajectory, np.ndarray):
+        trajectory = transform_matrices_as_gp_Trsfs(trajectory)
+    trsfs = list(trajectory)
+    if not trsfs:
+        return None
+    moving_shape = moving.Shape() if isinstance(moving, AIS_Shape) else moving
+    static_shape = _placed_body(static)
+    # 运动物体的包围球 (按精确几何计算包围盒)
+    box = Bnd_Box()
+    brepbndlib.Add(moving_shape, box, False)
+    x_min, y_min, z_min, x_max, y_max, z_max = box.Get()
+    center = gp_Pnt((x_min + x_max) / 2, (y_min + y_max) / 2, (z_min + z_max) / 2)
+    radius = center.Distance(gp_Pnt(x_max, y_max, z_max))
+    motion = _TrajectoryMotion(trsfs, center, radius)
+    # 静止物体只加载一次
+    distance_tool = BRepExtrema_DistShapeShape()
+    distance_tool.LoadS1(static_shape)
+
+    def _distance(parameter: float) -> float:
+        distance_tool.LoadS2(_placed_shape(moving_shape, motion.trsf(parameter)))
+        distance_tool.Perform()
+        if not distance_tool.IsDone():
+            logger.warning(f"距离计算失败：{parameter}")
+            return 0.0
+        return distance_tool.Value()
+
+    end = float(len(trsfs) - 1)
+    clear_parameter = None
+    parameter = 0.0
+    while True:
+        distance = _distance(parameter)
+        if distance <= tolerance:
+            break
+        if parameter >= end:
+            return None
+        clear_parameter = parameter
+        parameter = min(max(motion.advance(parameter, distance - tolerance), parameter + parameter_tolerance), end)
+    # end while
+    if clear_parameter is None:
+        return parameter
+    # 二分细化
+    while parameter - clear_parameter > parameter_tolerance:
+        middle = (clear_parameter + parameter) / 2
+        if _distance(middle) <= tolerance:
+            parameter = middle
+        else:
+            clear_parameter = middle
+    # end while
+    return parameter
+
+
 # end def
 if __name__ == "__main__":
     pass
@@ -0,0 +1,183 @@
+"""
+三角网格缓存
+Author: ICO
+Date: 2026-10-18"""
+
+from collections import OrderedDict
+
+# logger
+from loguru import logger
+
+# pyOCC
+from OCC.Core.BRep import BRep_Tool
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Copy
+from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_FORWARD
+from OCC.Core.TopExp import TopExp_Explorer
+from OCC.Core.TopLoc import TopLoc_Location
+from OCC.Core.TopoDS import TopoDS_Shape, topods
+
+
+def estimate_mesh_bytes(shape: TopoDS_Shape) -> int:
+    """估算形状上三角网格占用的内存
+
+    Parameters
+    ----------
+    `shape` : TopoDS_Shape
+
+    Returns
+    -------
+    int
+        字节数 (节点 24 字节，UV 节点 16 字节，三角形 12 字节)
+    """
+    total = 0
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        triangulation = BRep_Tool.Triangulation(topods.Face(explorer.Current()), TopLoc_Location())
+        if triangulation is not None:
+            nb_nodes = triangulation.NbNodes()
+            total += nb_nodes * 24 + triangulation.NbTriangles() * 12
+            if triangulation.HasUVNodes():
+                total += nb_nodes * 16
+        explorer.Next()
+    # end while
+    return total
+
+
+# end def
+class _MeshEntry:
+    def __init__(self, base: TopoDS_Shape, meshed: TopoDS_Shape, in_place: bool):
+        self.base = base
+        """原始形状 (单位位置)，用于确认 TShape 一致"""
+        self.meshed = meshed
+        """带有三角网格的形状 (单位位置)"""
+        self.in_place = in_place
+        """网格是否直接生成在原始 TShape 上"""
+        self.nbytes = estimate_mesh_bytes(meshed)
+
+
+# end class
+class MeshCache:
+    """
+    三角网格缓存，以 TopoDS_TShape 和网格参数为键，按 LRU 顺序淘汰
+
+    同一个 TShape 的第一种网格参数直接在原形状上生成网格，其余参数在形状副本上生成，
+    避免不同精度的三角网格互相覆盖。
+    在原形状上生成的网格属于调用者的 TShape，淘汰条目不会释放这部分内存，
+    因此累计在原形状上生成的网格 (in_place_nbytes) 达到 `max_bytes` 后，新的网格一律在副本上生成，
+    副本的网格在淘汰后即可释放。
+    返回的形状与输入共享位置 (TopLoc_Location)，因此同一刚体的不同位姿可以复用同一份网格。
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, max_entries: int | None = None):
+        """
+        Parameters
+        ----------
+        `max_bytes` : int, 可选
+            缓存网格的内存上限 (估算值)，默认值：512 MB
+        `max_entries` : int | None, 可选
+            缓存的最大条目数，默认值：None (不限制)
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.in_place_nbytes = 0
+        """累计在原形状上生成的网格大小 (估算值)，这部分内存随调用者的形状释放，不受淘汰影响"""
+        self._entries: OrderedDict[tuple, _MeshEntry] = OrderedDict()
+        self._in_place_keys: dict[int, tuple] = {}
+
+    # end alternate constructor
+
+    def __len__(self):
+        return len(self._entries)
+
+    def mesh(
+        self,
+        shape: TopoDS_Shape,
+        linear_deflection=1.0,
+        angular_deflection=0.5,
+        is_relative=False,
+        in_parallel=False,
+        copy=False,
+    ) -> TopoDS_Shape:
+        """获取带有三角网格的形状 (命中缓存时不再重新生成网格)
+
+        Parameters
+        ----------
+        `shape` : TopoDS_Shape
+            需要网格化的形状，可以带有位置 (例如 shape.Moved(TopLoc_Location(trsf)))
+        `linear_deflection` : float, 可选
+            线性偏差，默认值：1.0
+        `angular_deflection` : float, 可选
+            角度偏差，默认值：0.5
+        `is_relative` : bool, 可选
+            线性偏差是否为相对值，默认值：False
+        `in_parallel` : bool, 可选
+            是否并行生成网格，默认值：False
+        `copy` : bool, 可选
+            是否总是在副本上生成网格，对子形状 (例如面) 生成网格时使用，
+            避免覆盖父形状上已缓存的网格，默认值：False
+
+        Returns
+        -------
+        TopoDS_Shape
+            与输入位置、方向相同且带有三角网格的形状
+        """
+        base = shape.Located(TopLoc_Location()).Oriented(TopAbs_FORWARD)
+        tshape_key = hash(base)
+        key = (tshape_key, float(linear_deflection), float(angular_deflection), bool(is_relative))
+        entry = self._entries.get(key)
+        if entry is not None and entry.base.IsPartner(base):
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            if entry is not None:
+                # 哈希冲突，丢弃旧的条目
+                self._remove(key)
+            owner_key = self._in_place_keys.get(tshape_key)
+            in_place = (
+                not copy
+                and self.in_place_nbytes < self.max_bytes
+                and (owner_key is None or not self._entries[owner_key].base.IsPartner(base))
+            )
+            meshed = base if in_place else BRepBuilderAPI_Copy(base, True, False).Shape()
+            BRepMesh_IncrementalMesh(meshed, linear_deflection, is_relative, angular_deflection, in_parallel)
+            entry = _MeshEntry(base, meshed, in_place)
+            self._entries[key] = entry
+            if in_place:
+                self._in_place_keys[tshape_key] = key
+                self.in_place_nbytes += entry.nbytes
+            self.nbytes += entry.nbytes
+            self._evict()
+        return entry.meshed.Located(shape.Location()).Oriented(shape.Orientation())
+
+    def clear(self):
+        """清空缓存"""
+        self._entries.clear()
+        self._in_place_keys.clear()
+        self.nbytes = 0
+        self.in_place_nbytes = 0
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.nbytes
+        if entry.in_place and self._in_place_keys.get(key[0]) == key:
+            del self._in_place_keys[key[0]]
+
+    def _evict(self):
+        """按 LRU 顺序淘汰，至少保留最近使用的一个条目"""
+        while len(self._entries) > 1 and (
+            self.nbytes > self.max_bytes or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            key = next(iter(self._entries))
+            logger.debug(f"网格缓存淘汰：{key}")
+            self._remove(key)
+        # end while
+
+
+# end class
+default_mesh_cache = MeshCache()
+"""干涉检测默认使用的网格缓存"""
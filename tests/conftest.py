@@ -0,0 +1,9 @@
+"""
+测试配置：把仓库根目录加入 sys.path，使 dataExchange、mathTools、pyOCCTools 可以直接导入
+Author: ICO
+Date: 2026-10-18"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
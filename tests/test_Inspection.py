@@ -0,0 +1,38 @@
+"""
+几何检查工具的测试
+Author: ICO
+Date: 2026-10-18"""
+
+import numpy as np
+
+from mathTools.Inspection import collinear_check, collinear_check_array, collinear_check_polyline
+
+
+def _triples():
+    rng = np.random.default_rng(0)
+    triples = rng.normal(size=(200, 3, 3))
+    # 一半的三点组改为共线 (第三个点在前两点的直线上，加上阈值附近的扰动)
+    t = rng.uniform(-2.0, 2.0, size=(100, 1))
+    noise = rng.normal(size=(100, 3)) * rng.choice([0.0, 1e-8, 1e-5], size=(100, 1))
+    triples[:100, 2] = triples[:100, 0] + t * (triples[:100, 1] - triples[:100, 0]) + noise
+    return triples
+
+
+# end def
+def test_collinear_check_array_matches_scalar():
+    triples = _triples()
+    expected = [collinear_check(*(tuple(point) for point in triple)) for triple in triples]
+    np.testing.assert_array_equal(collinear_check_array(triples), expected)
+    np.testing.assert_array_equal(collinear_check_array(triples[:, 0], triples[:, 1], triples[:, 2]), expected)
+    assert any(expected) and not all(expected)
+
+
+# end def
+def test_collinear_check_polyline():
+    points = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0], [2, 1, 0], [2, 2, 0], [3, 3, 0]], dtype=np.float64)
+    np.testing.assert_array_equal(collinear_check_polyline(points), [True, False, True, False])
+    expected = [collinear_check(*(tuple(point) for point in points[i : i + 3])) for i in range(len(points) - 2)]
+    np.testing.assert_array_equal(collinear_check_polyline(points), expected)
+
+
+# end def
@@ -0,0 +1,23 @@
+"""
+包的导入检查：包之间使用绝对导入，每个包都应当可以单独导入
+Author: ICO
+Date: 2026-10-18"""
+
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("name", ["mathTools", "mathTools.rotation"])
+def test_import_math_packages(name):
+    importlib.import_module(name)
+
+
+# end def
+@pytest.mark.parametrize("name", ["dataExchange", "dataExchange.gp", "pyOCCTools", "pyOCCTools.collision"])
+def test_import_occ_packages(name):
+    pytest.importorskip("OCC.Core")
+    importlib.import_module(name)
+
+
+# end def
@@ -0,0 +1,106 @@
+"""
+PointCloudIndex 与 scipy cKDTree 的对比测试
+Author: ICO
+Date: 2026-10-18"""
+
+import numpy as np
+import pytest
+
+from mathTools.Inspection import point_cloud_deviation
+from mathTools.pointCloudIndex import PointCloudIndex, estimate_voxel_size
+
+spatial = pytest.importorskip("scipy.spatial")
+
+
+@pytest.fixture
+def cloud():
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(3000, 3)) * [10.0, 4.0, 1.0]
+    # 查询点既有点云内部的，也有远离点云的
+    queries = np.concatenate((rng.normal(size=(400, 3)) * 5.0, rng.uniform(-80.0, 80.0, size=(100, 3))))
+    return points, queries
+
+
+# end def
+@pytest.mark.parametrize("k", [1, 5, 16])
+def test_query_knn(cloud, k):
+    points, queries = cloud
+    distances, ids = PointCloudIndex(points).query_knn(queries, k, batch_size=64)
+    expected_distances, expected_ids = spatial.cKDTree(points).query(queries, k)
+    np.testing.assert_allclose(distances, expected_distances.reshape(-1, k))
+    np.testing.assert_array_equal(ids, expected_ids.reshape(-1, k))
+
+
+# end def
+def test_query_knn_more_than_points():
+    points = np.random.default_rng(1).uniform(size=(3, 3))
+    distances, ids = PointCloudIndex(points).query_knn(np.zeros((2, 3)), k=5)
+    assert np.isfinite(distances[:, :3]).all() and np.isinf(distances[:, 3:]).all()
+    assert (ids[:, 3:] == -1).all()
+    assert sorted(ids[0, :3].tolist()) == [0, 1, 2]
+
+
+# end def
+def test_query_nearest_with_cutoff(cloud):
+    points, queries = cloud
+    max_distance = 1.5
+    distances, ids = PointCloudIndex(points).query_nearest(queries, max_distance)
+    expected_distances, expected_ids = spatial.cKDTree(points).query(queries, distance_upper_bound=max_distance)
+    missing = np.isinf(expected_distances)
+    assert missing.any() and not missing.all()
+    np.testing.assert_array_equal(np.isinf(distances), missing)
+    assert (ids[missing] == -1).all()
+    np.testing.assert_allclose(distances[~missing], expected_distances[~missing])
+    np.testing.assert_array_equal(ids[~missing], expected_ids[~missing])
+
+
+# end def
+def test_query_radius(cloud):
+    points, queries = cloud
+    radius = 2.0
+    offsets, ids, distances = PointCloudIndex(points).query_radius(queries, radius, batch_size=64)
+    expected = spatial.cKDTree(points).query_ball_point(queries, radius)
+    assert len(offsets) == len(queries) + 1
+    for i, expected_ids in enumerate(expected):
+        found = slice(offsets[i], offsets[i + 1])
+        assert sorted(ids[found].tolist()) == sorted(expected_ids)
+        assert np.all(np.diff(distances[found]) >= 0)
+        np.testing.assert_allclose(distances[found], np.linalg.norm(points[ids[found]] - queries[i], axis=1))
+
+
+# end def
+def test_incremental_add(cloud):
+    points, queries = cloud
+    index = PointCloudIndex(voxel_size=estimate_voxel_size(points))
+    first_ids = index.add(points[:1000])
+    second_ids = index.add(points[1000:])
+    np.testing.assert_array_equal(np.concatenate((first_ids, second_ids)), np.arange(len(points)))
+    assert len(index) == len(points)
+    np.testing.assert_array_equal(index.points, points)
+    distances, ids = index.query_knn(queries, 4)
+    expected_distances, expected_ids = spatial.cKDTree(points).query(queries, 4)
+    np.testing.assert_allclose(distances, expected_distances)
+    np.testing.assert_array_equal(ids, expected_ids)
+
+
+# end def
+def test_empty_index():
+    distances, ids = PointCloudIndex().query_knn(np.zeros((2, 3)), 3)
+    assert np.isinf(distances).all() and (ids == -1).all()
+    offsets, ids, distances = PointCloudIndex().query_radius(np.zeros((2, 3)), 1.0)
+    assert offsets.tolist() == [0, 0, 0] and len(ids) == 0 and len(distances) == 0
+
+
+# end def
+def test_point_cloud_deviation(cloud):
+    reference, scan_points = cloud
+    index = PointCloudIndex(reference)
+    deviations, ids = point_cloud_deviation(scan_points, index, max_distance=3.0)
+    expected_distances, expected_ids = spatial.cKDTree(reference).query(scan_points, distance_upper_bound=3.0)
+    np.testing.assert_allclose(deviations, expected_distances)
+    found = np.isfinite(expected_distances)
+    np.testing.assert_array_equal(ids[found], expected_ids[found])
+    np.testing.assert_array_equal(point_cloud_deviation(scan_points, reference, 3.0)[0], deviations)
+
+
+# end def
@@ -0,0 +1,87 @@
+"""
+点云计算的测试
+Author: ICO
+Date: 2026-10-18"""
+
+import numpy as np
+import pytest
+
+from mathTools.pointClouds import center_point_of_points, estimate_normals, voxel_downsample
+from mathTools.pointCloudStatistics import iter_point_chunks, point_cloud_statistics
+
+
+def test_center_point_of_points_sources():
+    points = [(0.0, 0.0, 0.0), (2.0, 4.0, 6.0), (4.0, 2.0, 0.0)]
+    expected = (2.0, 2.0, 2.0)
+    np.testing.assert_allclose(center_point_of_points(points), expected)
+    np.testing.assert_allclose(center_point_of_points(np.array(points)), expected)
+    np.testing.assert_allclose(center_point_of_points(point for point in points), expected)
+    np.testing.assert_allclose(center_point_of_points(iter([np.array(points[:2]), np.array(points[2:])])), expected)
+
+
+# end def
+@pytest.mark.parametrize("points", [[], np.empty((0, 3)), (point for point in [])])
+def test_center_point_of_points_empty(points):
+    with pytest.raises(ValueError):
+        center_point_of_points(points)
+
+
+# end def
+def test_iter_point_chunks_from_point_generator():
+    points = np.random.default_rng(0).normal(size=(10, 3))
+    chunks = list(iter_point_chunks((tuple(point) for point in points), chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(np.concatenate(chunks), points)
+
+
+# end def
+def test_point_cloud_statistics_matches_numpy():
+    points = np.random.default_rng(1).normal(size=(1000, 3)) + 1e6
+    statistics = point_cloud_statistics(points, chunk_size=128, workers=2)
+    assert statistics.count == len(points)
+    np.testing.assert_allclose(statistics.mean, points.mean(axis=0))
+    np.testing.assert_allclose(statistics.covariance(), np.cov(points, rowvar=False, ddof=0), rtol=1e-6)
+    np.testing.assert_array_equal(statistics.bounds[0], points.min(axis=0))
+
+
+# end def
+def test_voxel_downsample_centroids():
+    rng = np.random.default_rng(2)
+    points = rng.uniform(0.0, 10.0, size=(5000, 3))
+    voxel_size = 2.5
+    centroids, inverse = voxel_downsample(points, voxel_size, chunk_size=700, return_inverse=True)
+    # 与直接按体素分组求重心的结果相同
+    ijk = np.floor((points - points.min(axis=0)) / voxel_size).astype(np.int64)
+    _, expected_inverse = np.unique(ijk, axis=0, return_inverse=True)
+    expected_inverse = expected_inverse.ravel()
+    assert len(centroids) == expected_inverse.max() + 1
+    for group in range(len(centroids)):
+        members = inverse == group
+        np.testing.assert_allclose(centroids[group], points[members].mean(axis=0))
+        assert len(np.unique(expected_inverse[members])) == 1
+    np.testing.assert_allclose(voxel_downsample(points, voxel_size), centroids)
+
+
+# end def
+def test_voxel_downsample_empty():
+    assert voxel_downsample(np.empty((0, 3)), 1.0).shape == (0, 3)
+
+
+# end def
+def test_estimate_normals_of_plane():
+    rng = np.random.default_rng(3)
+    uv = rng.uniform(-5.0, 5.0, size=(2000, 2))
+    normal = np.array([1.0, 2.0, 2.0]) / 3.0
+    u = np.cross(normal, [0.0, 0.0, 1.0])
+    u /= np.linalg.norm(u)
+    v = np.cross(normal, u)
+    points = uv[:, :1] * u + uv[:, 1:] * v + np.array([1.0, -2.0, 3.0])
+    normals = estimate_normals(points, k=12, batch_size=300)
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0)
+    np.testing.assert_allclose(np.abs(normals @ normal), 1.0, atol=1e-9)
+    # 给定视点时法向统一朝向视点
+    oriented = estimate_normals(points, k=12, viewpoint=tuple(normal * 100.0))
+    np.testing.assert_allclose(oriented @ normal, 1.0, atol=1e-9)
+
+
+# end def
@@ -0,0 +1,80 @@
+"""
+进程池批处理在工作进程崩溃时的行为
+Author: ICO
+Date: 2026-10-18"""
+
+import os
+
+import pytest
+
+pytest.importorskip("OCC.Core")
+
+from dataExchange import readStep, writeShapes
+from dataExchange.processPool import WorkerCrashed, map_isolated
+
+
+def _square_or_crash(value: int) -> int:
+    """value 为负数时模拟 OCC 读写器的段错误：工作进程直接退出"""
+    if value < 0:
+        os._exit(1)
+    if value == 13:
+        raise ValueError("unlucky")
+    return value * value
+
+
+# end def
+def _read_step_stub(path: str, cache, options) -> tuple[bytes | None, float, str | None]:
+    if path == "crash.step":
+        os._exit(1)
+    return None, 0.0, None
+
+
+# end def
+def _write_shape_stub(data: bytes, fmt: str, path: str, options: dict) -> tuple[float, str | None]:
+    if path.endswith("crash.step"):
+        os._exit(1)
+    return 0.0, None
+
+
+# end def
+@pytest.mark.parametrize("workers", [1, 3])
+def test_map_isolated_only_fails_crashed_task(workers):
+    values = [1, 2, -1, 3, 13, 4, 5, -2, 6]
+    results = map_isolated(_square_or_crash, [(value,) for value in values], workers)
+    for value, result in zip(values, results):
+        if value < 0:
+            assert isinstance(result, WorkerCrashed)
+        elif value == 13:
+            assert isinstance(result, ValueError)
+        else:
+            assert result == value * value
+
+
+# end def
+def test_read_step_many_survives_worker_crash(monkeypatch):
+    monkeypatch.setattr(readStep, "_read_step_worker", _read_step_stub)
+    paths = [f"part_{i}.step" for i in range(4)] + ["crash.step"] + [f"part_{i}.step" for i in range(4, 8)]
+    results = readStep.read_step_many(paths, workers=2)
+    assert [result.path for result in results] == paths
+    for result in results:
+        if result.path == "crash.step":
+            assert result.error.startswith("WorkerCrashed")
+        else:
+            assert result.error is None
+
+
+# end def
+def test_write_shapes_survives_worker_crash(monkeypatch, tmp_path):
+    monkeypatch.setattr(writeShapes, "_write_shape_worker", _write_shape_stub)
+    monkeypatch.setattr(writeShapes, "shape_to_bytes", lambda shape: b"")
+    names = [f"part_{i}" for i in range(3)] + ["crash"] + [f"part_{i}" for i in range(3, 6)]
+    results = writeShapes.write_shapes([None] * len(names), "step", str(tmp_path), names, workers=2)
+    assert len(results) == len(names)
+    for name, result in zip(names, results):
+        if name == "crash":
+            assert result.error.startswith("WorkerCrashed")
+        else:
+            assert result.error is None
+
+
+# end def
@@ -0,0 +1,108 @@
+"""
+欧拉角序列表的往返测试
+Author: ICO
+Date: 2026-10-18"""
+
+import numpy as np
+import pytest
+
+from mathTools.rotation import (
+    EULER_SEQUENCES,
+    euler_to_quaternions,
+    euler_to_rotation_matrices,
+    quaternions_to_euler,
+    quaternions_to_rotation_matrices,
+    rotation_matrices_to_euler,
+)
+
+SEQUENCES = sorted(EULER_SEQUENCES)
+
+
+def _random_angles(count=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-np.pi, np.pi, size=(count, 3))
+
+
+# end def
+def _gimbal_lock_angles(sequence: str):
+    """第二个角处于万向节锁位置的欧拉角 (经典欧拉角为 0 和 π，其余为 ±π/2)"""
+    angles = _random_angles(4, seed=1)
+    locked = [0.0, np.pi] if EULER_SEQUENCES[sequence].is_two_axes else [np.pi / 2, -np.pi / 2]
+    angles[:, 1] = np.resize(locked, len(angles))
+    return angles
+
+
+# end def
+@pytest.mark.parametrize("sequence", SEQUENCES)
+def test_matrix_round_trip(sequence):
+    for angles in (_random_angles(), _gimbal_lock_angles(sequence)):
+        matrices = euler_to_rotation_matrices(angles, sequence)
+        identities = np.broadcast_to(np.eye(3), matrices.shape)
+        np.testing.assert_allclose(matrices @ matrices.transpose(0, 2, 1), identities, atol=1e-12)
+        recovered = euler_to_rotation_matrices(rotation_matrices_to_euler(matrices, sequence), sequence)
+        np.testing.assert_allclose(recovered, matrices, atol=1e-9)
+
+
+# end def
+@pytest.mark.parametrize("sequence", SEQUENCES)
+def test_quaternion_round_trip(sequence):
+    for angles in (_random_angles(), _gimbal_lock_angles(sequence)):
+        quaternions = euler_to_quaternions(angles, sequence)
+        np.testing.assert_allclose(np.linalg.norm(quaternions, axis=1), 1.0)
+        recovered = euler_to_quaternions(quaternions_to_euler(quaternions, sequence), sequence)
+        # q 与 -q 表示同一旋转
+        np.testing.assert_allclose(np.abs(np.sum(recovered * quaternions, axis=1)), 1.0, atol=1e-9)
+        np.testing.assert_allclose(
+            quaternions_to_rotation_matrices(quaternions), euler_to_rotation_matrices(angles, sequence), atol=1e-12
+        )
+
+
+# end def
+@pytest.mark.parametrize("sequence", [name for name in SEQUENCES if name[0] in "rs"])
+def test_matches_scipy(sequence):
+    transform = pytest.importorskip("scipy.spatial.transform")
+    # "s" 外旋对应 scipy 的小写轴名，"r" 内旋对应大写轴名
+    axes = sequence[1:] if sequence[0] == "s" else sequence[1:].upper()
+    angles = _random_angles()
+    expected = transform.Rotation.from_euler(axes, angles).as_matrix()
+    np.testing.assert_allclose(euler_to_rotation_matrices(angles, sequence), expected, atol=1e-12)
+
+
+# end def
+def test_single_angles_and_out():
+    angles = np.array([0.1, 0.2, 0.3])
+    matrix = euler_to_rotation_matrices(angles, "ypr")
+    assert matrix.shape == (3, 3)
+    np.testing.assert_allclose(rotation_matrices_to_euler(matrix, "ypr"), angles)
+    out = np.empty((2, 3))
+    assert rotation_matrices_to_euler(np.stack((matrix, matrix)), "ypr", out=out) is out
+    np.testing.assert_allclose(out, [angles, angles])
+
+
+# end def
+def test_unknown_sequence():
+    with pytest.raises(ValueError):
+        euler_to_quaternions(np.zeros(3), "xyz")
+
+
+# end def
+@pytest.mark.parametrize("sequence", SEQUENCES)
+def test_matches_occt(sequence):
+    gp = pytest.importorskip("OCC.Core.gp")
+    from dataExchange.gp.Quaternion import _GP_EULER_SEQUENCES
+
+    gp_sequence = _GP_EULER_SEQUENCES[sequence]
+    for angles in (_random_angles(50), _gimbal_lock_angles(sequence)):
+        quaternions = euler_to_quaternions(angles, sequence)
+        expected_quaternions, expected_angles = [], []
+        for alpha, beta, gamma in angles.tolist():
+            quat = gp.gp_Quaternion()
+            quat.SetEulerAngles(gp_sequence, alpha, beta, gamma)
+            expected_quaternions.append((quat.X(), quat.Y(), quat.Z(), quat.W()))
+            expected_angles.append(quat.GetEulerAngles(gp_sequence))
+        np.testing.assert_allclose(quaternions, expected_quaternions, atol=1e-12)
+        # 万向节锁时 OCCT 固定第三个角为 0，分支必须与 GetEulerAngles 一致
+        np.testing.assert_allclose(quaternions_to_euler(quaternions, sequence), expected_angles, atol=1e-9)
+
+
+# end def
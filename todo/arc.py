@@ -5,9 +5,9 @@ Date: 2023-09-11"""
 import numpy as np
 import numpy.typing as npt
 
-from basicGeometricTyping import Arc, Vector
+from basicGeometricTyping import Vector
 
-from ..mathTools.vector import angle_between_vectors
+from mathTools.vector import angle_between_vectors
 
 
 # todo 方法不完善
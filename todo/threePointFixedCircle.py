@@ -14,8 +14,8 @@ from .arc import angle_of_arcs
 
 def three_point_fixed_circle(
     point_1: Point | list[Point],
-    point_2: Point = np.array[0, 0, 0],
-    point_3: Point = np.array[0, 0, 0],
+    point_2: Point = np.array([0, 0, 0]),
+    point_3: Point = np.array([0, 0, 0]),
     linear_tolerance=1e-6,
 ) -> tuple[Point, float, float]:
     """